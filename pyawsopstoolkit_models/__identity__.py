@@ -0,0 +1,131 @@
+import weakref
+from contextvars import ContextVar
+from typing import Any, Callable, Mapping, Optional
+
+from pyawsopstoolkit_models.__tracking__ import _check
+
+# Weak references to the instances of the identity map active in the current context, keyed by resource identity
+_ACTIVE: ContextVar[Optional[weakref.WeakValueDictionary]] = ContextVar('identity_map', default=None)
+# Function returning the identity of an instance of each model class from its field values
+_KEYS: dict[type, Callable[[Mapping], Any]] = {}
+
+
+def _identity(cls: type, key: Callable[[Mapping], Any]) -> None:
+    """
+    Registers the function returning the identity of the instances of a model class, so that its constructor and
+    loaders consult the active identity map.
+
+    :param cls: The model class.
+    :type cls: type
+    :param key: The function returning the identity from the field values, or None if they do not identify an
+        instance.
+    :type key: Callable
+    """
+    _KEYS[cls] = key
+
+
+def _key(cls: type, values: Mapping) -> Optional[tuple]:
+    """
+    Returns the identity of an instance of a model class with the given field values.
+
+    :param cls: The model class.
+    :type cls: type
+    :param values: The field values, which may be incomplete.
+    :type values: Mapping
+    :return: The identity, or None if the class has no identity or the values do not identify an instance.
+    :rtype: tuple
+    """
+    key = _KEYS.get(cls)
+    if key is None:
+        return None
+    try:
+        value = key(values)
+    except (KeyError, AttributeError):
+        return None
+    return (cls, value) if value is not None else None
+
+
+def _resource_key(obj) -> Optional[tuple]:
+    """
+    Returns the identity of a model instance, shared by the identity map and the registries and diffs matching
+    resources: the account number, region and ID of a security group, or the ARN of a role or user. The identifying
+    fields are never loaded lazily, so they are read without materializing pending fields.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :return: The identity, or None if the instance has none.
+    :rtype: tuple
+    """
+    return _key(type(obj), getattr(obj, '__dict__', {}))
+
+
+def _registered(cls: type, values: Mapping):
+    """
+    Returns the instance of the active identity map with the identity of the given field values.
+
+    :param cls: The model class.
+    :type cls: type
+    :param values: The field values.
+    :type values: Mapping
+    :return: The registered instance, or None if there is none or no identity map is active.
+    :rtype: Any
+    """
+    instances = _ACTIVE.get()
+    if instances is None:
+        return None
+    key = _key(cls, values)
+    return instances.get(key) if key is not None else None
+
+
+def _new(cls: type, args: tuple, kwargs: dict):
+    """
+    Returns the object initialized by a constructor call of a model class: while an identity map is active, the
+    registered instance with the identity of the arguments, which the constructor then updates in place, or a new
+    instance, registered by _register once it is initialized. The arguments are validated on a separate instance, and
+    checked by the guards of the fields of the registered instance, before it is returned, so that invalid values
+    never reach the instance shared by the holders of the resource. Calls without arguments, as made by copy and
+    pickle, always create a new instance.
+
+    :param cls: The model class.
+    :type cls: type
+    :param args: The positional arguments of the constructor call.
+    :type args: tuple
+    :param kwargs: The keyword arguments of the constructor call.
+    :type kwargs: dict
+    :return: The instance to initialize.
+    :rtype: Any
+    """
+    instances = _ACTIVE.get()
+    if instances is None or not (args or kwargs):
+        return object.__new__(cls)
+    values = dict(zip(cls.__dataclass_fields__, args))
+    values.update(kwargs)
+    key = _key(cls, values)
+    obj = instances.get(key) if key is not None else None
+    if obj is None:
+        return object.__new__(cls)
+    token = _ACTIVE.set(None)
+    try:
+        update = cls(*args, **kwargs)
+    finally:
+        _ACTIVE.reset(token)
+    for name in cls.__dataclass_fields__:
+        _check(obj, name, getattr(update, name))
+    # Raw data pending for lazily loaded fields would be stale after the update.
+    obj.__dict__.pop('_lazy', None)
+    return obj
+
+
+def _register(obj) -> None:
+    """
+    Registers an initialized and validated model instance in the active identity map, unless an instance with the
+    same identity is already registered.
+
+    :param obj: The model instance.
+    :type obj: Any
+    """
+    instances = _ACTIVE.get()
+    if instances is not None:
+        key = _resource_key(obj)
+        if key is not None and instances.get(key) is None:
+            instances[key] = obj
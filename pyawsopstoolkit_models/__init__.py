@@ -1,6 +1,18 @@
 __all__ = [
+    "arn",
+    "bulk",
+    "cloudtrail",
+    "diff",
+    "history",
     "ec2",
-    "iam"
+    "iam",
+    "identity",
+    "ingest",
+    "query",
+    "shards",
+    "snapshot",
+    "store",
+    "tags"
 ]
 __name__ = "pyawsopstoolkit_models"
 __version__ = "0.1.1"
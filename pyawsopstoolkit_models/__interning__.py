@@ -0,0 +1,104 @@
+import json
+import weakref
+
+# Shared read-only values keyed by their canonical JSON, kept as long as a model instance holds them
+_SHARED = weakref.WeakValueDictionary()
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} is shared between model instances and cannot be modified.')
+
+
+class _SharedDict(dict):
+    """
+    A read-only dictionary shared between the model instances holding an equal document, with the canonical JSON it is
+    stored under. Copies of a shared dictionary are plain, mutable dictionaries, while pickles are loaded as the shared
+    copy of the receiving process.
+    """
+
+    def __reduce__(self):
+        return _unpickle, (self._key, _thaw(self))
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+
+class _SharedList(list):
+    """
+    A read-only list shared between the model instances holding an equal list, with the canonical JSON it is stored
+    under. Copies of a shared list are plain, mutable lists, while pickles are loaded as the shared copy of the
+    receiving process.
+    """
+
+    def __reduce__(self):
+        return _unpickle, (self._key, _thaw(self))
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+
+for _name in ('__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem', 'setdefault', 'update'):
+    setattr(_SharedDict, _name, _read_only)
+for _name in (
+        'append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse', '__setitem__', '__delitem__',
+        '__iadd__', '__imul__'
+):
+    setattr(_SharedList, _name, _read_only)
+
+
+def _freeze(value, key=None):
+    # Nested values, and values whose JSON is stored with another value, have no key.
+    if isinstance(value, dict):
+        shared = _SharedDict((name, _freeze(item)) for name, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        shared = _SharedList(_freeze(item) for item in value)
+    else:
+        return value
+    shared._key = key
+    return shared
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _shared(value):
+    """
+    Returns the shared read-only copy of a document or list, stored once per distinct content so that the model
+    instances holding equal values reference the same object. Values that are not plain dictionaries or lists, which
+    includes the shared copies themselves, or that cannot be represented as JSON, are returned unchanged.
+
+    :param value: The value assigned to a model field.
+    :type value: Any
+    :return: The shared copy of the value, or the value itself.
+    :rtype: Any
+    """
+    if type(value) not in (dict, list):
+        return value
+    try:
+        key = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return value
+    shared = _SHARED.get(key)
+    if shared is None:
+        shared = _SHARED[key] = _freeze(value, key)
+    elif shared != value:
+        # JSON does not distinguish string and integer keys.
+        return _freeze(value)
+    return shared
+
+
+def _unpickle(key, value):
+    # The shared copy stored under the key of the pickled copy is found without encoding the value again.
+    shared = _SHARED.get(key) if key is not None else None
+    return shared if shared is not None and shared == value else _shared(value)
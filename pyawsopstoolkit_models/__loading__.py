@@ -0,0 +1,174 @@
+import json
+from dataclasses import is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional, Union, get_args, get_origin
+from urllib.parse import unquote
+
+from pyawsopstoolkit_models.__identity__ import _new, _register, _registered
+
+
+class _LazyField:
+    """
+    A descriptor replacing the class attribute of a model field whose value can be materialized lazily from raw
+    response data kept by the instance. Instances store their field values in __dict__, which takes precedence over
+    the descriptor, so only the first access to a field of a lazily loaded instance goes through it.
+    """
+
+    def __init__(self, name: str, default: Any, loader: Callable[[Any, bool], Any]):
+        self.name = name
+        self.default = default
+        self.loader = loader
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self.default
+        pending = obj.__dict__.get('_lazy')
+        if pending is None or self.name not in pending:
+            return self.default
+        setattr(obj, self.name, self.loader(pending[self.name], True))
+        # The raw data is only dropped once loaded, so that a failing loader raises again on the next access. It may be
+        # shared with copies of the instance, so it is replaced rather than modified.
+        obj.__dict__['_lazy'] = {name: raw for name, raw in pending.items() if name != self.name}
+        return obj.__dict__[self.name]
+
+
+def _lazy_fields(cls: type, **loaders: Callable[[Any, bool], Any]) -> None:
+    """
+    Installs lazy field descriptors on a model class.
+
+    :param cls: The model class.
+    :type cls: type
+    :param loaders: The functions converting the raw response data of each field into its value, called with a flag
+        to load nested model instances lazily as well.
+    :type loaders: Callable
+    """
+    for name, loader in loaders.items():
+        setattr(cls, name, _LazyField(name, cls.__dataclass_fields__[name].default, loader))
+
+
+def _load(cls: type, fields: dict, nested: dict, lazy: bool = False):
+    """
+    Creates a model instance from converted field values and the raw response data of its nested fields. In lazy
+    mode, the nested fields are validated and converted by their lazy field descriptor on first access; otherwise,
+    the instance is created through its constructor. While an identity map is active, an instance registered under the
+    same identity is updated in place and returned instead.
+
+    :param cls: The model class.
+    :type cls: type
+    :param fields: The values of the fields that are set immediately.
+    :type fields: dict
+    :param nested: The raw response data of the nested fields. Absent or empty data leaves the field to its default.
+    :type nested: dict
+    :param lazy: Flag to defer the conversion of the nested fields.
+    :type lazy: bool
+    :return: The model instance.
+    :rtype: Any
+    """
+    if not lazy or _registered(cls, fields) is not None:
+        converted = {
+            name: cls.__dict__[name].loader(raw, False) for name, raw in nested.items() if raw
+        }
+        return cls(**fields, **converted)
+    obj = _new(cls, (), fields)
+    obj.__dict__['_lazy'] = {name: raw for name, raw in nested.items() if raw}
+    for name, value in fields.items():
+        setattr(obj, name, value)
+    _register(obj)
+    return obj
+
+
+def _from_response(cls: type, data: dict, lazy: bool):
+    if any(isinstance(value, _LazyField) for value in vars(cls).values()):
+        return cls.from_response(data, lazy=lazy)
+    return cls.from_response(data)
+
+
+def _model_loader(cls: type) -> Callable[[dict, bool], Any]:
+    """
+    Returns a loader converting raw response data with the from_response method of a model class.
+
+    :param cls: The model class.
+    :type cls: type
+    :return: The loader.
+    :rtype: Callable
+    """
+    return lambda raw, lazy: _from_response(cls, raw, lazy)
+
+
+def _list_loader(cls: type) -> Callable[[list, bool], list]:
+    """
+    Returns a loader converting a list of raw response entries with the from_response method of a model class.
+
+    :param cls: The model class of the list items.
+    :type cls: type
+    :return: The loader.
+    :rtype: Callable
+    """
+    return lambda raw, lazy: [_from_response(cls, item, lazy) for item in raw]
+
+
+def _policy_document(value) -> Optional[dict]:
+    """
+    Returns a policy document as a dictionary. The IAM API returns URL-encoded JSON documents, which boto3 decodes.
+
+    :param value: The policy document of the response.
+    :type value: dict | str
+    :return: The policy document.
+    :rtype: dict
+    """
+    if isinstance(value, str):
+        return json.loads(unquote(value))
+    return value
+
+
+def _available(value: Optional[str]) -> Optional[str]:
+    """
+    Returns a service or region reported by IAM last-used information, or None if IAM reports it as not available.
+
+    :param value: The value reported by IAM.
+    :type value: str
+    :return: The value, or None.
+    :rtype: str
+    """
+    return None if value in (None, '', 'N/A') else value
+
+
+def _plain(value):
+    # Cached dictionary representations hold read-only dictionaries and tuples.
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _convert(annotation, value):
+    if value is None:
+        return None
+    if get_origin(annotation) is Union:
+        annotation = next(argument for argument in get_args(annotation) if argument is not type(None))
+    if get_origin(annotation) is list:
+        item_type = get_args(annotation)[0]
+        return [_convert(item_type, item) for item in value]
+    if annotation is datetime:
+        return datetime.fromisoformat(value)
+    if is_dataclass(annotation):
+        return _from_dict(annotation, value)
+    return _plain(value)
+
+
+def _from_dict(cls: type, data: Mapping):
+    """
+    Creates a model instance from its dictionary representation, as returned by to_dict(), converting nested models,
+    lists of models and ISO 8601 datetimes according to the field annotations of the model class.
+
+    :param cls: The model class.
+    :type cls: type
+    :param data: The dictionary representation, or its cached read-only version.
+    :type data: Mapping
+    :return: The model instance.
+    :rtype: Any
+    """
+    return cls(**{
+        name: _convert(field.type, data[name]) for name, field in cls.__dataclass_fields__.items() if name in data
+    })
@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+
+# Timestamp of unset dates in the columns of timestamps
+_NOT_SET = float('nan')
+_SECONDS_PER_DAY = 86400
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    """
+    Returns the POSIX timestamp of a datetime, treating naive datetimes as UTC, or NaN for None.
+
+    :param value: The datetime.
+    :type value: datetime
+    :return: The POSIX timestamp.
+    :rtype: float
+    """
+    if value is None:
+        return _NOT_SET
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _cutoff(days: int, now: Optional[datetime]) -> float:
+    """
+    Returns the POSIX timestamp of the given number of days before a reference time.
+
+    :param days: The number of days.
+    :type days: int
+    :param now: The reference time, the current time if not set.
+    :type now: datetime
+    :return: The POSIX timestamp.
+    :rtype: float
+    """
+    _validate_type(days, int, 'days should be an integer.')
+    _validate_type(now, Union[datetime, None], 'now should be a datetime.')
+    return _timestamp(now if now is not None else datetime.now(timezone.utc)) - days * _SECONDS_PER_DAY
@@ -0,0 +1,489 @@
+import hashlib
+import json
+import weakref
+from datetime import datetime
+from typing import Optional, get_args, get_origin
+
+from pyawsopstoolkit_models.__interning__ import _SharedList
+
+# Key order of to_dict() per model class, captured from the uncached implementation on first use
+_DICT_KEYS: dict[type, tuple] = {}
+# Whether a field of a model class holds a list of models, derived from its annotation
+_MODEL_LISTS: dict[tuple, bool] = {}
+# Weak references to the callbacks notified of the changes of a field of any instance of a model class
+_LISTENERS: dict[tuple, list] = {}
+# Weak references to the callbacks checking a new value of a field of any instance of a model class before it is stored
+_GUARDS: dict[tuple, list] = {}
+
+
+class _Tracker:
+    """
+    Holds the state cached for a model instance and weak references to the model instances containing it, so that
+    a change can be propagated to every cache derived from it. Trackers are never copied or pickled along with their
+    instance; a copy starts with an empty tracker.
+    """
+
+    __slots__ = (
+        'owner', 'parents', 'fingerprint', 'stamps', 'track_lists', 'cache_dict', 'dict_fields', 'dict_view',
+        'derived'
+    )
+
+    def __init__(self, owner=None):
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self.parents = {}
+        self.fingerprint = None
+        self.stamps = {}
+        self.track_lists = False
+        self.cache_dict = False
+        self.dict_fields = {}
+        self.dict_view = None
+        self.derived = {}
+
+    def __reduce__(self):
+        return _Tracker, ()
+
+
+class _TrackedList(list):
+    """
+    A list stored in a field of a model instance that reports in-place mutations to the instance and revalidates the
+    field, as if the field had been reassigned. A mutation rejected by a guard of the field leaves the list unchanged.
+    Copies and pickles of a tracked list are plain lists.
+    """
+
+    __slots__ = ('owner', 'field_name')
+
+    def __init__(self, iterable, owner, field_name: str):
+        super().__init__(iterable)
+        self.owner = weakref.ref(owner)
+        self.field_name = field_name
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __copy__(self):
+        return list(self)
+
+    def _check(self, method, args: tuple, kwargs: dict) -> None:
+        owner = self.owner()
+        if owner is not None and _GUARDS.get((type(owner), self.field_name)):
+            candidate = list(self)
+            method(candidate, *args, **kwargs)
+            _check(owner, self.field_name, candidate)
+
+    def _mutated(self) -> None:
+        owner = self.owner()
+        if owner is not None:
+            _changed(owner, self.field_name)
+            owner.__validate__(self.field_name)
+            _notify(owner, self.field_name)
+
+
+class _FrozenDict(dict):
+    """
+    A read-only dictionary built by the serialization cache of a model instance. It is a dict, so that it is serialized
+    by json like the uncached representation, while its copies and pickles are plain, mutable dictionaries.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __copy__(self):
+        return dict(self)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError('the cached dictionary representation of a model instance cannot be modified.')
+
+
+for _name in ('__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem', 'setdefault', 'update'):
+    setattr(_FrozenDict, _name, _read_only)
+
+
+def _mutator(name: str):
+    method = getattr(list, name)
+
+    def mutate(self, *args, **kwargs):
+        self._check(method, args, kwargs)
+        result = method(self, *args, **kwargs)
+        self._mutated()
+        return result
+
+    mutate.__name__ = name
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+for _name in (
+        'append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort', 'reverse', '__setitem__', '__delitem__',
+        '__iadd__', '__imul__'
+):
+    setattr(_TrackedList, _name, _mutator(_name))
+
+
+def _tracker(obj) -> _Tracker:
+    """
+    Returns the tracker of a model instance, creating it on first use.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :return: The tracker of the instance.
+    :rtype: _Tracker
+    """
+    tracker = obj.__dict__.get('_tracker')
+    if tracker is None or tracker.owner is None or tracker.owner() is not obj:
+        tracker = _Tracker(obj)
+        obj.__dict__['_tracker'] = tracker
+    return tracker
+
+
+def _track(obj, tracker: _Tracker, field_name: str) -> None:
+    value = obj.__dict__.get(field_name)
+    # Shared lists are read-only, so they cannot change in place.
+    if isinstance(value, list) and not isinstance(value, _SharedList) and not (
+            isinstance(value, _TrackedList) and value.owner() is obj and value.field_name == field_name
+    ):
+        obj.__dict__[field_name] = _TrackedList(value, obj, field_name)
+
+
+def _track_lists(obj) -> None:
+    """
+    Replaces the list fields of a model instance with tracked copies, so that in-place mutations such as append are
+    handled like a reassignment of the field. Lists assigned later are tracked as well; shared read-only lists are
+    kept as they are.
+
+    :param obj: The model instance.
+    :type obj: Any
+    """
+    tracker = _tracker(obj)
+    if not tracker.track_lists:
+        tracker.track_lists = True
+        for name in obj.__dataclass_fields__:
+            _track(obj, tracker, name)
+
+
+def _link(child, parent, field_name: str) -> None:
+    """
+    Registers a model instance as the value, or an item of the value, of a field of another model instance.
+
+    :param child: The contained model instance.
+    :type child: Any
+    :param parent: The containing model instance.
+    :type parent: Any
+    :param field_name: The field of the containing instance.
+    :type field_name: str
+    """
+    parents = _tracker(child).parents
+    key = (id(parent), field_name)
+    link = parents.get(key)
+    if link is None or link[0]() is not parent:
+        parents[key] = (weakref.ref(parent), field_name)
+
+
+def _register(registry: dict, cls: type, field_name: str, callback) -> None:
+    registry.setdefault((cls, field_name), []).append(weakref.WeakMethod(callback))
+
+
+def _call(registry: dict, obj, field_name: str, *args) -> None:
+    references = registry.get((type(obj), field_name))
+    if references:
+        for reference in list(references):
+            callback = reference()
+            if callback is None:
+                references.remove(reference)
+            else:
+                callback(obj, field_name, *args)
+
+
+def _listen(cls: type, field_name: str, callback) -> None:
+    """
+    Registers a bound method to be called with the instance and the field name whenever the field of an instance of a
+    model class changes to a valid value, including in-place changes of tracked lists. The method is referenced weakly,
+    so that the registration ends with the lifetime of its object.
+
+    :param cls: The model class.
+    :type cls: type
+    :param field_name: The observed field.
+    :type field_name: str
+    :param callback: The bound method to call.
+    :type callback: Callable
+    """
+    _register(_LISTENERS, cls, field_name, callback)
+
+
+def _guard(cls: type, field_name: str, callback) -> None:
+    """
+    Registers a bound method to be called with the instance, the field name and the new value before the field of an
+    instance of a model class is assigned or changed in place through a tracked list. An exception raised by the method
+    rejects the change, leaving the field unchanged. The method is referenced weakly, so that the registration ends
+    with the lifetime of its object.
+
+    :param cls: The model class.
+    :type cls: type
+    :param field_name: The guarded field.
+    :type field_name: str
+    :param callback: The bound method to call.
+    :type callback: Callable
+    """
+    _register(_GUARDS, cls, field_name, callback)
+
+
+def _check(obj, field_name: str, value) -> None:
+    """
+    Calls the guards of a field of a model instance with the value about to be stored.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :param field_name: The field.
+    :type field_name: str
+    :param value: The new value of the field.
+    :type value: Any
+    """
+    if _GUARDS:
+        _call(_GUARDS, obj, field_name, value)
+
+
+def _changed(obj, field_name: str) -> None:
+    """
+    Invalidates the state cached for a model instance after one of its fields changed, and propagates the invalidation
+    to the instances containing it. Instances that never cached anything have no tracker, so nothing is invalidated.
+
+    :param obj: The changed model instance.
+    :type obj: Any
+    :param field_name: The changed field.
+    :type field_name: str
+    """
+    tracker = obj.__dict__.get('_tracker')
+    if tracker is not None:
+        if tracker.owner is None or tracker.owner() is not obj:
+            del obj.__dict__['_tracker']
+        else:
+            _invalidate(obj, tracker, field_name)
+
+
+def _notify(obj, field_name: str) -> None:
+    """
+    Notifies the registered listeners of a change of a field of a model instance, and of the fields of the instances
+    containing it, once the new value passed validation.
+
+    :param obj: The changed model instance.
+    :type obj: Any
+    :param field_name: The changed field.
+    :type field_name: str
+    """
+    if not _LISTENERS:
+        return
+    _call(_LISTENERS, obj, field_name)
+    tracker = obj.__dict__.get('_tracker')
+    if tracker is not None and tracker.owner is not None and tracker.owner() is obj:
+        for reference, parent_field in list(tracker.parents.values()):
+            parent = reference()
+            if parent is not None:
+                _notify(parent, parent_field)
+
+
+def _invalidate(obj, tracker: _Tracker, field_name: str) -> None:
+    if tracker.track_lists:
+        _track(obj, tracker, field_name)
+    tracker.fingerprint = None
+    tracker.dict_view = None
+    tracker.dict_fields.pop(field_name, None)
+    tracker.derived.pop(field_name, None)
+    dead = []
+    for key, (reference, parent_field) in tracker.parents.items():
+        parent = reference()
+        if parent is None:
+            dead.append(key)
+        else:
+            _changed(parent, parent_field)
+    for key in dead:
+        del tracker.parents[key]
+
+
+def _derived(obj, field_name: str, compute):
+    """
+    Returns a value derived from a field of a model instance, computing it on first use and caching it until the field
+    is reassigned or changed in place through a tracked list.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :param field_name: The field the value is derived from.
+    :type field_name: str
+    :param compute: The function computing the value from the field value.
+    :type compute: Callable
+    :return: The derived value.
+    :rtype: Any
+    """
+    derived = _tracker(obj).derived
+    if field_name in derived:
+        return derived[field_name]
+    value = derived[field_name] = compute(getattr(obj, field_name))
+    return value
+
+
+def _is_model(value) -> bool:
+    return isinstance(getattr(type(value), 'fingerprint', None), property)
+
+
+def _encode(obj, field_name: str, value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if _is_model(value):
+        _link(value, obj, field_name)
+        return value.fingerprint
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        # AWS does not attach a meaning to the order of rules, ranges, keys or tags.
+        return tuple(sorted(str(_encode(obj, field_name, item)) for item in value))
+    if hasattr(value, 'to_dict'):
+        value = value.to_dict()
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _stamp(value) -> Optional[tuple]:
+    # The items of a list or model field with the fingerprints of the models among them, as hashed.
+    if _is_model(value):
+        return value, ((value, value.fingerprint),)
+    if isinstance(value, list) and not isinstance(value, _SharedList):
+        return value, tuple((item, item.fingerprint if _is_model(item) else None) for item in value)
+    return None
+
+
+def _current(obj, stamps: dict) -> bool:
+    values = obj.__dict__
+    for name, (value, items) in stamps.items():
+        if values.get(name) is not value:
+            return False
+        current = (value,) if _is_model(value) else value
+        if len(current) != len(items):
+            return False
+        for item, (stamped, fingerprint) in zip(current, items):
+            if item is not stamped or (fingerprint is not None and item.fingerprint != fingerprint):
+                return False
+    return True
+
+
+def _fingerprint(obj) -> str:
+    """
+    Returns the content fingerprint of a model instance, computed from its own fields and the fingerprints of its
+    children and cached until the instance or one of its children changes. The items of the list fields are recorded
+    along with the fingerprint and compared on each access, so that in-place mutations such as append invalidate it as
+    well, without replacing the lists held by the instance.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :return: The hexadecimal content fingerprint.
+    :rtype: str
+    """
+    tracker = _tracker(obj)
+    if tracker.fingerprint is None or not _current(obj, tracker.stamps):
+        parts = [type(obj).__name__]
+        stamps = {}
+        for name in obj.__dataclass_fields__:
+            value = getattr(obj, name)
+            parts.append((name, _encode(obj, name, value)))
+            stamp = _stamp(value)
+            if stamp is not None:
+                stamps[name] = stamp
+        tracker.stamps = stamps
+        tracker.fingerprint = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return tracker.fingerprint
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _holds_models(cls: type, field_name: str) -> bool:
+    key = (cls, field_name)
+    result = _MODEL_LISTS.get(key)
+    if result is None:
+        annotation = cls.__dataclass_fields__[field_name].type
+        result = _MODEL_LISTS[key] = any(
+            get_origin(argument) is list and any(
+                isinstance(getattr(item, 'fingerprint', None), property) for item in get_args(argument)
+            ) for argument in (annotation, *get_args(annotation))
+        )
+    return result
+
+
+def _serialize(obj, field_name: str, value):
+    if _is_model(value):
+        _link(value, obj, field_name)
+        _cache_dict(value, True)
+        return value.to_dict()
+    if isinstance(value, list) and _holds_models(type(obj), field_name):
+        # Mirrors to_dict(), which serializes empty lists of models as None.
+        return tuple(_serialize(obj, field_name, item) for item in value) if len(value) > 0 else None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'to_dict'):
+        value = value.to_dict()
+    return _freeze(value)
+
+
+def _cache_dict(obj, enabled: bool) -> None:
+    """
+    Enables or disables the serialization cache of a model instance. While enabled, to_dict() returns a read-only
+    dict that is rebuilt only for the fields modified since the previous call; the list fields of the instance are
+    tracked so that in-place mutations invalidate the cache as well.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :param enabled: Flag to enable or disable the cache.
+    :type enabled: bool
+    """
+    tracker = _tracker(obj)
+    if enabled:
+        _track_lists(obj)
+    else:
+        tracker.dict_fields.clear()
+        tracker.dict_view = None
+    tracker.cache_dict = enabled
+
+
+def _dict_cached(obj) -> bool:
+    """
+    Checks whether the serialization cache of a model instance is enabled.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :return: True if to_dict() should return the cached view, False otherwise.
+    :rtype: bool
+    """
+    tracker = obj.__dict__.get('_tracker')
+    return tracker is not None and tracker.cache_dict and tracker.owner is not None and tracker.owner() is obj
+
+
+def _cached_dict(obj) -> dict:
+    """
+    Returns the cached read-only dictionary representation of a model instance, reserializing only the fields that
+    were modified since it was last built. The dictionary and its nested dictionaries are read-only dict instances, so
+    that json serializes them, and lists are tuples. Copies are plain dictionaries.
+
+    :param obj: The model instance.
+    :type obj: Any
+    :return: Read-only dictionary representation of the instance.
+    :rtype: dict
+    """
+    tracker = _tracker(obj)
+    if tracker.dict_view is None:
+        keys = _DICT_KEYS.get(type(obj))
+        if keys is None:
+            tracker.cache_dict = False
+            try:
+                keys = _DICT_KEYS[type(obj)] = tuple(obj.to_dict())
+            finally:
+                tracker.cache_dict = True
+        fields = tracker.dict_fields
+        for name in keys:
+            if name not in fields:
+                fields[name] = _serialize(obj, name, getattr(obj, name))
+        tracker.dict_view = _FrozenDict((name, fields[name]) for name in keys)
+    return tracker.dict_view
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Iterable, Optional
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+
+
+@dataclass(frozen=True)
+class ARN:
+    """
+    A class representing a parsed Amazon Resource Name (ARN). Parsed ARNs are immutable and shared between the objects
+    holding the same ARN.
+    """
+
+    partition: str
+    service: str
+    region: str
+    account: str
+    resource: str
+
+    def __str__(self) -> str:
+        return f'arn:{self.partition}:{self.service}:{self.region}:{self.account}:{self.resource}'
+
+    @cached_property
+    def _resource_parts(self) -> tuple[Optional[str], str]:
+        separators = [index for index in (self.resource.find('/'), self.resource.find(':')) if index >= 0]
+        if len(separators) == 0:
+            return None, self.resource
+        index = min(separators)
+        return self.resource[:index], self.resource[index + 1:]
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the last segment of the resource ID, e.g. the name of an IAM role without its path.
+
+        :return: The resource name.
+        :rtype: str
+        """
+        return self.resource_id.rpartition('/')[2]
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        Returns the path of a resource ID made of slash-separated segments, e.g. the path of an IAM role.
+
+        :return: The path, starting and ending with a slash, or None if the resource has no type.
+        :rtype: str
+        """
+        if self.resource_type is None:
+            return None
+        return '/' + self.resource_id.rpartition('/')[0] + '/' if '/' in self.resource_id else '/'
+
+    @property
+    def resource_id(self) -> str:
+        """
+        Returns the resource ID, i.e. the resource without its type.
+
+        :return: The resource ID.
+        :rtype: str
+        """
+        return self._resource_parts[1]
+
+    @property
+    def resource_type(self) -> Optional[str]:
+        """
+        Returns the resource type, given before the first slash or colon of the resource, e.g. role or user.
+
+        :return: The resource type, or None if the resource is only an ID.
+        :rtype: str
+        """
+        return self._resource_parts[0]
+
+
+def _split(value: str) -> ARN:
+    parts = value.split(':', 5)
+    if len(parts) != 6 or parts[0] != 'arn' or not parts[1] or not parts[2] or not parts[5]:
+        raise ValueError(f'{value} is not a valid ARN.')
+    return ARN(parts[1], parts[2], parts[3], parts[4], parts[5])
+
+
+@lru_cache(maxsize=65536)
+def _parse(value: str) -> ARN:
+    return _split(value)
+
+
+def parse_arn(value: str) -> ARN:
+    """
+    Parses an ARN into its partition, service, region, account and resource. Parsed ARNs are cached by value, so
+    repeated calls return the same ARN object.
+
+    :param value: The ARN.
+    :type value: str
+    :return: The parsed ARN.
+    :rtype: ARN
+    """
+    _validate_type(value, str, 'value should be a string.')
+    return _parse(value)
+
+
+def parse_arns(values: Iterable[str], strict: bool = True) -> list[Optional[ARN]]:
+    """
+    Parses a batch of ARNs, e.g. to join resources by account or resource type. Each distinct value is parsed once and
+    repeated values share the same ARN object, without going through the cache of parse_arn.
+
+    :param values: The ARNs.
+    :type values: Iterable[str]
+    :param strict: Flag to raise an error for an invalid ARN or a value that is not a string; otherwise, they are
+        returned as None.
+    :type strict: bool
+    :return: The parsed ARNs, in the order of the values.
+    :rtype: list
+    """
+    parsed: dict[str, Optional[ARN]] = {}
+    result = []
+    for value in values:
+        if not isinstance(value, str):
+            # Values that are not strings, which may be unhashable, are not kept in parsed.
+            if strict:
+                raise TypeError('values should be a list of strings.')
+            result.append(None)
+            continue
+        item = parsed.get(value)
+        if item is None and value not in parsed:
+            try:
+                item = parsed[value] = _split(value)
+            except ValueError:
+                if strict:
+                    raise
+                parsed[value] = None
+        result.append(item)
+    return result
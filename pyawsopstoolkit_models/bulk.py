@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+
+
+def _chunks(payloads: Iterable[dict], chunk_size: int) -> Iterator[list[dict]]:
+    iterator = iter(payloads)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def _build_chunk(cls: type, args: tuple, lazy: bool, payloads: list[dict]) -> list:
+    if lazy:
+        return [cls.from_response(*args, data, lazy=True) for data in payloads]
+    return [cls.from_response(*args, data) for data in payloads]
+
+
+def _map_chunk(cls: type, args: tuple, lazy: bool, function: Callable[[list], Any], payloads: list[dict]) -> Any:
+    return function(_build_chunk(cls, args, lazy, payloads))
+
+
+def _run(
+        task: Callable[[list[dict]], Any],
+        cls: type,
+        payloads: Iterable[dict],
+        args: tuple,
+        workers: Optional[int],
+        chunk_size: int
+) -> list:
+    _validate_type(cls, type, 'cls should be a model class.')
+    if not callable(getattr(cls, 'from_response', None)):
+        raise TypeError('cls should be a model class with a from_response method.')
+    _validate_type(args, tuple, 'args should be of tuple type.')
+    _validate_type(workers, Optional[int], 'workers should be an integer.')
+    _validate_type(chunk_size, int, 'chunk_size should be an integer.')
+    if chunk_size < 1:
+        raise ValueError('chunk_size should be positive.')
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    chunks = _chunks(payloads, chunk_size)
+    if workers <= 1:
+        return [task(chunk) for chunk in chunks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(task, chunks))
+
+
+def build_models(
+        cls: type,
+        payloads: Iterable[dict],
+        args: tuple = (),
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        lazy: bool = False
+) -> list:
+    """
+    Builds and validates model objects from raw response payloads in a pool of worker processes, by calling the
+    from_response method of the model class on chunks of payloads. The objects are returned to the calling process
+    in the order of the payloads; shared policy documents and tag lists are pickled once per chunk and loaded as
+    shared copies.
+
+    :param cls: The model class, e.g. SecurityGroup or IPPermission.
+    :type cls: type
+    :param payloads: The raw response payloads, e.g. the SecurityGroups of EC2 DescribeSecurityGroups responses.
+    :type payloads: Iterable[dict]
+    :param args: The arguments of from_response preceding the payload, e.g. the account and region of security groups.
+    :type args: tuple
+    :param workers: The number of worker processes, by default the number of CPUs. The objects are built in the
+        calling process for a single worker.
+    :type workers: int
+    :param chunk_size: The number of payloads sent to a worker at a time.
+    :type chunk_size: int
+    :param lazy: Flag to convert the nested objects on first access, for model classes supporting it.
+    :type lazy: bool
+    :return: The model objects.
+    :rtype: list
+    """
+    results = _run(partial(_build_chunk, cls, args, lazy), cls, payloads, args, workers, chunk_size)
+    return list(chain.from_iterable(results))
+
+
+def map_models(
+        cls: type,
+        payloads: Iterable[dict],
+        function: Callable[[list], Any],
+        args: tuple = (),
+        workers: Optional[int] = None,
+        chunk_size: int = 1000,
+        lazy: bool = False
+) -> list:
+    """
+    Builds model objects from raw response payloads in a pool of worker processes and applies a function to each
+    chunk of objects in the worker, so that only the results are returned to the calling process, e.g. to count world
+    open rules without transferring the security groups. The function should be defined at module level so that it
+    can be sent to the workers.
+
+    :param cls: The model class, e.g. SecurityGroup or IPPermission.
+    :type cls: type
+    :param payloads: The raw response payloads.
+    :type payloads: Iterable[dict]
+    :param function: The function called with the list of objects of each chunk.
+    :type function: Callable
+    :param args: The arguments of from_response preceding the payload, e.g. the account and region of security groups.
+    :type args: tuple
+    :param workers: The number of worker processes, by default the number of CPUs. The objects are built in the
+        calling process for a single worker.
+    :type workers: int
+    :param chunk_size: The number of payloads sent to a worker at a time.
+    :type chunk_size: int
+    :param lazy: Flag to convert the nested objects on first access, for model classes supporting it.
+    :type lazy: bool
+    :return: The results of the function, one per chunk in the order of the payloads.
+    :rtype: list
+    """
+    if not callable(function):
+        raise TypeError('function should be callable.')
+    return _run(partial(_map_chunk, cls, args, lazy, function), cls, payloads, args, workers, chunk_size)
@@ -0,0 +1,555 @@
+import gzip
+import heapq
+import json
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, Optional
+
+from pyawsopstoolkit_models.__identity__ import _resource_key
+from pyawsopstoolkit_models.__loading__ import _policy_document
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import (
+    IPPermission, IPRange, IPv6Range, PrefixList, SecurityGroup, UserIDGroupPair
+)
+from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary, intern_permissions_boundary
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+from pyawsopstoolkit_models.query import Resource
+
+# Source lists of a security group rule, with the field identifying each source
+_SOURCES = (
+    ('ip_ranges', 'cidr_ip'),
+    ('ipv6_ranges', 'cidr_ipv6'),
+    ('prefix_lists', 'id'),
+    ('user_id_group_pairs', 'id')
+)
+
+# Method applying each supported event, keyed by event name
+_HANDLERS = {
+    'AuthorizeSecurityGroupEgress': '_authorize_egress',
+    'AuthorizeSecurityGroupIngress': '_authorize_ingress',
+    'CreateAccessKey': '_create_access_key',
+    'CreateRole': '_create_role',
+    'CreateSecurityGroup': '_create_security_group',
+    'CreateTags': '_create_tags',
+    'CreateUser': '_create_user',
+    'DeleteAccessKey': '_delete_access_key',
+    'DeleteRole': '_delete_role',
+    'DeleteRolePermissionsBoundary': '_delete_role_permissions_boundary',
+    'DeleteSecurityGroup': '_delete_security_group',
+    'DeleteTags': '_delete_tags',
+    'DeleteUser': '_delete_user',
+    'DeleteUserPermissionsBoundary': '_delete_user_permissions_boundary',
+    'PutRolePermissionsBoundary': '_put_role_permissions_boundary',
+    'PutUserPermissionsBoundary': '_put_user_permissions_boundary',
+    'RevokeSecurityGroupEgress': '_revoke_egress',
+    'RevokeSecurityGroupIngress': '_revoke_ingress',
+    'TagRole': '_tag_role',
+    'TagUser': '_tag_user',
+    'UntagRole': '_untag_role',
+    'UntagUser': '_untag_user',
+    'UpdateAccessKey': '_update_access_key',
+    'UpdateAssumeRolePolicy': '_update_assume_role_policy',
+    'UpdateRole': '_update_role'
+}
+
+SUPPORTED_EVENTS = frozenset(_HANDLERS)
+
+# Type reported by IAM for the managed policies used as permissions boundaries
+_BOUNDARY_TYPE = 'PermissionsBoundaryPolicy'
+
+
+def _items(value) -> list:
+    # CloudTrail records the lists of EC2 request parameters as {'items': [...]}, and empty lists as {}.
+    if isinstance(value, dict):
+        return value.get('items') or []
+    return value or []
+
+
+def _event_time(record: dict) -> Optional[datetime]:
+    value = record.get('eventTime')
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc) if value else None
+
+
+def _tags(items) -> list:
+    return [{'Key': item['key'], 'Value': item.get('value', '')} for item in _items(items)]
+
+
+def _boundary(arn: Optional[str]) -> Optional[PermissionsBoundary]:
+    return intern_permissions_boundary(PermissionsBoundary(_BOUNDARY_TYPE, arn)) if arn else None
+
+
+def _merge_tags(tags: Optional[list], added: list) -> Optional[list]:
+    keys = {tag['Key'] for tag in added}
+    merged = [tag for tag in tags or [] if tag.get('Key') not in keys] + added
+    return merged or None
+
+
+def _remove_tags(tags: Optional[list], keys: set) -> Optional[list]:
+    return [tag for tag in tags or [] if tag.get('Key') not in keys] or None
+
+
+def _permission(data: dict, account_number: str) -> IPPermission:
+    return IPPermission(
+        from_port=data.get('fromPort', -1),
+        to_port=data.get('toPort', -1),
+        ip_protocol=str(data['ipProtocol']),
+        ip_ranges=[
+            IPRange(item['cidrIp'], item.get('description')) for item in _items(data.get('ipRanges'))
+        ] or None,
+        ipv6_ranges=[
+            IPv6Range(item['cidrIpv6'], item.get('description')) for item in _items(data.get('ipv6Ranges'))
+        ] or None,
+        prefix_lists=[
+            PrefixList(item['prefixListId'], item.get('description')) for item in _items(data.get('prefixListIds'))
+        ] or None,
+        user_id_group_pairs=[
+            UserIDGroupPair(
+                id=item['groupId'],
+                name=item.get('groupName', ''),
+                status='',
+                user_id=item.get('userId', account_number),
+                vpc_id=item.get('vpcId', ''),
+                description=item.get('description')
+            ) for item in _items(data.get('groups'))
+        ] or None
+    )
+
+
+def _find_rule(permissions: list[IPPermission], permission: IPPermission) -> Optional[IPPermission]:
+    key = (permission.ip_protocol, permission.from_port, permission.to_port)
+    return next((rule for rule in permissions if (rule.ip_protocol, rule.from_port, rule.to_port) == key), None)
+
+
+def _authorize(permissions: Optional[list[IPPermission]], added: list[IPPermission]) -> list[IPPermission]:
+    permissions = list(permissions or [])
+    for permission in added:
+        rule = _find_rule(permissions, permission)
+        if rule is None:
+            permissions.append(permission)
+            continue
+        for field_name, key in _SOURCES:
+            current = getattr(rule, field_name) or []
+            known = {getattr(source, key) for source in current}
+            sources = [source for source in getattr(permission, field_name) or [] if getattr(source, key) not in known]
+            if sources:
+                setattr(rule, field_name, [*current, *sources])
+    return permissions
+
+
+def _revoke(permissions: Optional[list[IPPermission]], revoked: list[IPPermission]) -> Optional[list[IPPermission]]:
+    permissions = list(permissions or [])
+    for permission in revoked:
+        rule = _find_rule(permissions, permission)
+        if rule is None:
+            continue
+        for field_name, key in _SOURCES:
+            current = getattr(rule, field_name) or []
+            removed = {getattr(source, key) for source in getattr(permission, field_name) or []}
+            if removed and any(getattr(source, key) in removed for source in current):
+                setattr(rule, field_name, [source for source in current if getattr(source, key) not in removed] or None)
+        if not any(getattr(rule, field_name) for field_name, _ in _SOURCES):
+            permissions.remove(rule)
+    return permissions or None
+
+
+def _order(record: dict) -> str:
+    return record.get('eventTime') or ''
+
+
+def _read_records(path: str) -> list[dict]:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as file:
+        records = json.load(file).get('Records') or []
+    return sorted(records, key=_order)
+
+
+def read_events(paths: Iterable[str]) -> Iterator[dict]:
+    """
+    Returns the records of local CloudTrail log files, as delivered to S3 in plain or gzip-compressed JSON, merged in
+    the order of their event times. Records with equal event times keep the order of the files and of their entries.
+
+    :param paths: The paths of the log files.
+    :type paths: Iterable[str]
+    :return: The CloudTrail records.
+    :rtype: Iterator[dict]
+    """
+    _validate_type(paths, Iterable, 'paths should be an iterable of strings.')
+    files = []
+    for path in paths:
+        _validate_type(path, str, 'paths should be an iterable of strings.')
+        files.append(_read_records(path))
+    return heapq.merge(*files, key=_order)
+
+
+class EventApplier:
+    """
+    A class representing the application of CloudTrail records to in-memory security groups, roles and users, so
+    that they follow the changes made since they were described without describing them again. Each record only
+    touches the resource it names, which is looked up by account, region and group ID or by account and name, and is
+    changed through field assignments, so that fingerprints, cached dictionaries and the indexes following the fields
+    of their resources are updated as for any other change. Created and deleted resources are added to and removed
+    from the given collections.
+    """
+
+    def __init__(
+            self, resources: Optional[Iterable[Resource]] = None, collections: Optional[Iterable[Any]] = None
+    ) -> None:
+        """
+        Initializes a new EventApplier object.
+
+        :param resources: The security groups, roles and users to apply events to.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        :param collections: The collections, e.g. ResourceCollection, ShardedCollection or TagIndex objects, to which
+            created resources are added and from which deleted resources are removed, with their add_resource and
+            remove_resource methods.
+        :type collections: Iterable
+        """
+        self._security_groups: dict[tuple[str, str, str], SecurityGroup] = {}
+        self._roles: dict[tuple[str, str], Role] = {}
+        self._users: dict[tuple[str, str], User] = {}
+        self._accounts: dict[str, Any] = {}
+        self._collections = list(collections or [])
+        for collection in self._collections:
+            if not callable(getattr(collection, 'add_resource', None)) or not callable(
+                    getattr(collection, 'remove_resource', None)
+            ):
+                raise TypeError('collections should have add_resource and remove_resource methods.')
+        for resource in resources or []:
+            self.add_resource(resource)
+
+    def __iter__(self):
+        return iter([*self._security_groups.values(), *self._roles.values(), *self._users.values()])
+
+    def __len__(self) -> int:
+        return len(self._security_groups) + len(self._roles) + len(self._users)
+
+    def _registry(self, resource: Resource) -> tuple[dict, tuple]:
+        self._accounts.setdefault(resource.account.number, resource.account)
+        if isinstance(resource, SecurityGroup):
+            return self._security_groups, _resource_key(resource)[1]
+        if isinstance(resource, Role):
+            return self._roles, (resource.account.number, resource.name)
+        return self._users, (resource.account.number, resource.name)
+
+    def _account(self, number: str):
+        account = self._accounts.get(number)
+        if account is None:
+            from pyawsopstoolkit.account import Account
+
+            account = self._accounts[number] = Account(number)
+        return account
+
+    def _created(self, resource: Resource) -> None:
+        self.add_resource(resource)
+        for collection in self._collections:
+            collection.add_resource(resource)
+
+    def _deleted(self, resource: Optional[Resource]) -> bool:
+        if resource is None:
+            return False
+        self.remove_resource(resource)
+        for collection in self._collections:
+            try:
+                collection.remove_resource(resource)
+            except KeyError:
+                pass
+        return True
+
+    def _security_group(self, record: dict, parameters: dict) -> Optional[SecurityGroup]:
+        return self._security_groups.get((record.get('recipientAccountId'), record.get('awsRegion'),
+                                          parameters.get('groupId')))
+
+    def _role(self, record: dict, parameters: dict) -> Optional[Role]:
+        return self._roles.get((record.get('recipientAccountId'), parameters.get('roleName')))
+
+    def _user(self, record: dict, parameters: dict) -> Optional[User]:
+        # IAM users managing their own access keys omit the user name.
+        identity = record.get('userIdentity') or {}
+        name = parameters.get('userName') or (identity.get('userName') if identity.get('type') == 'IAMUser' else None)
+        return self._users.get((record.get('recipientAccountId'), name))
+
+    def _change_rules(self, record: dict, parameters: dict, field_name: str, function) -> bool:
+        security_group = self._security_group(record, parameters)
+        if security_group is None:
+            return False
+        changes = [
+            _permission(item, record.get('recipientAccountId')) for item in _items(parameters.get('ipPermissions'))
+        ]
+        setattr(security_group, field_name, function(getattr(security_group, field_name), changes))
+        return True
+
+    def _authorize_egress(self, record: dict, parameters: dict) -> bool:
+        return self._change_rules(record, parameters, 'ip_permissions_egress', _authorize)
+
+    def _authorize_ingress(self, record: dict, parameters: dict) -> bool:
+        return self._change_rules(record, parameters, 'ip_permissions', _authorize)
+
+    def _revoke_egress(self, record: dict, parameters: dict) -> bool:
+        return self._change_rules(record, parameters, 'ip_permissions_egress', _revoke)
+
+    def _revoke_ingress(self, record: dict, parameters: dict) -> bool:
+        return self._change_rules(record, parameters, 'ip_permissions', _revoke)
+
+    def _create_security_group(self, record: dict, parameters: dict) -> bool:
+        account_number = record['recipientAccountId']
+        # EC2 adds a rule allowing all outbound traffic to the security groups of a VPC.
+        egress = [IPPermission(-1, -1, '-1', ip_ranges=[IPRange('0.0.0.0/0')])] if parameters.get('vpcId') else None
+        self._created(SecurityGroup(
+            account=self._account(account_number),
+            region=record['awsRegion'],
+            id=record['responseElements']['groupId'],
+            name=parameters['groupName'],
+            owner_id=account_number,
+            vpc_id=parameters.get('vpcId', ''),
+            ip_permissions_egress=egress,
+            description=parameters.get('groupDescription'),
+            tags=[
+                tag for specification in _items(parameters.get('tagSpecificationSet'))
+                for tag in _tags(specification.get('tags'))
+            ] or None
+        ))
+        return True
+
+    def _delete_security_group(self, record: dict, parameters: dict) -> bool:
+        return self._deleted(self._security_group(record, parameters))
+
+    def _change_tags(self, record: dict, parameters: dict, function, argument) -> bool:
+        found = False
+        for item in _items(parameters.get('resourcesSet')):
+            security_group = self._security_group(record, {'groupId': item.get('resourceId')})
+            if security_group is not None:
+                security_group.tags = function(security_group.tags, argument)
+                found = True
+        return found
+
+    def _create_tags(self, record: dict, parameters: dict) -> bool:
+        return self._change_tags(record, parameters, _merge_tags, _tags(parameters.get('tagSet')))
+
+    def _delete_tags(self, record: dict, parameters: dict) -> bool:
+        return self._change_tags(
+            record, parameters, _remove_tags, {item['key'] for item in _items(parameters.get('tagSet'))}
+        )
+
+    def _create_role(self, record: dict, parameters: dict) -> bool:
+        data = record['responseElements']['role']
+        self._created(Role(
+            account=self._account(record['recipientAccountId']),
+            name=data['roleName'],
+            id=data['roleId'],
+            arn=data['arn'],
+            max_session_duration=int(parameters.get('maxSessionDuration', 3600)),
+            path=data.get('path', '/'),
+            created_date=_event_time(record),
+            assume_role_policy_document=_policy_document(
+                data.get('assumeRolePolicyDocument') or parameters.get('assumeRolePolicyDocument')
+            ),
+            description=parameters.get('description'),
+            permissions_boundary=_boundary(parameters.get('permissionsBoundary')),
+            tags=_tags(parameters.get('tags')) or None
+        ))
+        return True
+
+    def _delete_role(self, record: dict, parameters: dict) -> bool:
+        return self._deleted(self._role(record, parameters))
+
+    def _update_role(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        if 'description' in parameters:
+            role.description = parameters['description'] or None
+        if 'maxSessionDuration' in parameters:
+            role.max_session_duration = int(parameters['maxSessionDuration'])
+        return True
+
+    def _update_assume_role_policy(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        role.assume_role_policy_document = _policy_document(parameters['policyDocument'])
+        return True
+
+    def _put_role_permissions_boundary(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        role.permissions_boundary = _boundary(parameters['permissionsBoundary'])
+        return True
+
+    def _delete_role_permissions_boundary(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        role.permissions_boundary = None
+        return True
+
+    def _tag_role(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        role.tags = _merge_tags(role.tags, _tags(parameters.get('tags')))
+        return True
+
+    def _untag_role(self, record: dict, parameters: dict) -> bool:
+        role = self._role(record, parameters)
+        if role is None:
+            return False
+        role.tags = _remove_tags(role.tags, set(parameters.get('tagKeys') or []))
+        return True
+
+    def _create_user(self, record: dict, parameters: dict) -> bool:
+        data = record['responseElements']['user']
+        self._created(User(
+            account=self._account(record['recipientAccountId']),
+            name=data['userName'],
+            id=data['userId'],
+            arn=data['arn'],
+            path=data.get('path', '/'),
+            created_date=_event_time(record),
+            permissions_boundary=_boundary(parameters.get('permissionsBoundary')),
+            tags=_tags(parameters.get('tags')) or None
+        ))
+        return True
+
+    def _delete_user(self, record: dict, parameters: dict) -> bool:
+        return self._deleted(self._user(record, parameters))
+
+    def _put_user_permissions_boundary(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        user.permissions_boundary = _boundary(parameters['permissionsBoundary'])
+        return True
+
+    def _delete_user_permissions_boundary(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        user.permissions_boundary = None
+        return True
+
+    def _tag_user(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        user.tags = _merge_tags(user.tags, _tags(parameters.get('tags')))
+        return True
+
+    def _untag_user(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        user.tags = _remove_tags(user.tags, set(parameters.get('tagKeys') or []))
+        return True
+
+    def _create_access_key(self, record: dict, parameters: dict) -> bool:
+        data = record['responseElements']['accessKey']
+        user = self._user(record, {'userName': data.get('userName') or parameters.get('userName')})
+        if user is None:
+            return False
+        access_key = AccessKey(id=data['accessKeyId'], status=data.get('status', 'Active'),
+                               created_date=_event_time(record))
+        user.access_keys = [*(user.access_keys or []), access_key]
+        return True
+
+    def _delete_access_key(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        user.access_keys = [key for key in user.access_keys or [] if key.id != parameters['accessKeyId']] or None
+        return True
+
+    def _update_access_key(self, record: dict, parameters: dict) -> bool:
+        user = self._user(record, parameters)
+        if user is None:
+            return False
+        access_key = next((key for key in user.access_keys or [] if key.id == parameters['accessKeyId']), None)
+        if access_key is None:
+            return False
+        access_key.status = parameters['status']
+        # Reassigning the list reports the change of the key to the indexes following the access keys of users.
+        user.access_keys = list(user.access_keys)
+        return True
+
+    def add_resource(self, resource: Resource) -> None:
+        """
+        Adds a security group, role or user to which events are applied.
+
+        :param resource: The resource to add.
+        :type resource: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        registry, key = self._registry(resource)
+        if key in registry:
+            raise ValueError(f'resource {key} is already known.')
+        registry[key] = resource
+
+    def apply(self, records: Iterable[dict]) -> dict[str, int]:
+        """
+        Applies CloudTrail records in the given order, e.g. the records returned by read_events.
+
+        :param records: The CloudTrail records.
+        :type records: Iterable[dict]
+        :return: The number of records per outcome, as returned by apply_record.
+        :rtype: dict
+        """
+        _validate_type(records, Iterable, 'records should be an iterable of dictionaries.')
+        counts = {'applied': 0, 'failed': 0, 'ignored': 0, 'missing': 0}
+        for record in records:
+            counts[self.apply_record(record)] += 1
+        return counts
+
+    def apply_record(self, record: dict) -> str:
+        """
+        Applies a CloudTrail record to the resource it names.
+
+        :param record: The CloudTrail record.
+        :type record: dict
+        :return: 'applied' if the record changed a resource, 'failed' for a record of a failed call, 'ignored' for an
+            unsupported event, or 'missing' if the resource is unknown.
+        :rtype: str
+        """
+        _validate_type(record, dict, 'record should be a dictionary.')
+        handler = _HANDLERS.get(record.get('eventName'))
+        if handler is None:
+            return 'ignored'
+        if record.get('errorCode'):
+            return 'failed'
+        applied = getattr(self, handler)(record, record.get('requestParameters') or {})
+        return 'applied' if applied else 'missing'
+
+    def get_resource(self, cls: type, account: str, key: str, region: Optional[str] = None) -> Optional[Resource]:
+        """
+        Returns a known resource.
+
+        :param cls: The model class of the resource, i.e. SecurityGroup, Role or User.
+        :type cls: type
+        :param account: The account number of the resource.
+        :type account: str
+        :param key: The ID of the security group, or the name of the role or user.
+        :type key: str
+        :param region: The region of the security group.
+        :type region: str
+        :return: The resource, or None if it is unknown.
+        :rtype: SecurityGroup | Role | User
+        """
+        if cls is SecurityGroup:
+            return self._security_groups.get((account, region, key))
+        if cls is Role:
+            return self._roles.get((account, key))
+        if cls is User:
+            return self._users.get((account, key))
+        raise TypeError('cls should be SecurityGroup, Role or User.')
+
+    def remove_resource(self, resource: Resource) -> None:
+        """
+        Removes a security group, role or user to which events are applied.
+
+        :param resource: The resource to remove.
+        :type resource: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        registry, key = self._registry(resource)
+        if registry.get(key) is not resource:
+            raise KeyError(key)
+        del registry[key]
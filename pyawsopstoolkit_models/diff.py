@@ -0,0 +1,195 @@
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, Iterable, Union
+
+from pyawsopstoolkit_models.__identity__ import _resource_key
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+Resource = Union[SecurityGroup, Role, User]
+
+
+@dataclass
+class FieldChange:
+    """
+    A class representing a changed field of a resource. Nested fields are addressed with dotted paths, e.g.
+    last_used.used_date or access_keys[AKIA...].status.
+    """
+
+    field: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class ItemChange:
+    """
+    A class representing the items added to and removed from a list field of a resource. Security group rules are
+    split into one IPPermission per source, so that a single added or removed IPRange is reported on its own.
+    """
+
+    field: str
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+
+@dataclass
+class ResourceDelta:
+    """
+    A class representing the changes of a single resource between two snapshots.
+    """
+
+    key: tuple
+    old: Resource
+    new: Resource
+    field_changes: list[FieldChange] = field(default_factory=list)
+    item_changes: list[ItemChange] = field(default_factory=list)
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    A class representing the differences between two snapshots of resources.
+    """
+
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: list[ResourceDelta] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def resource_key(resource: Resource) -> tuple:
+    """
+    Returns the identity of a resource, used to match resources across snapshots: the model class name with the
+    account number, region and ID of a security group, or with the ARN of a role or user, the same identity as used
+    by IdentityMap.
+
+    :param resource: The resource.
+    :type resource: SecurityGroup | Role | User
+    :return: The identity of the resource.
+    :rtype: tuple
+    """
+    if not isinstance(resource, (SecurityGroup, Role, User)):
+        raise TypeError('resource should be of SecurityGroup, Role or User type.')
+    cls, key = _resource_key(resource)
+    return cls.__name__, key
+
+
+def _index(resources: Iterable[Resource], name: str) -> dict[tuple, Resource]:
+    index = {}
+    for resource in resources:
+        key = resource_key(resource)
+        if key in index:
+            raise ValueError(f'{name} contains more than one resource for {key}.')
+        index[key] = resource
+    return index
+
+
+def _rule_items(permissions: list[IPPermission]) -> dict[tuple, IPPermission]:
+    items = {}
+    for permission in permissions or []:
+        rule = (permission.ip_protocol, permission.from_port, permission.to_port)
+        sources = [
+            ('ip_ranges', (source.cidr_ip, source.description), source) for source in permission.ip_ranges or []
+        ]
+        sources.extend(
+            ('ipv6_ranges', (source.cidr_ipv6, source.description), source)
+            for source in permission.ipv6_ranges or []
+        )
+        sources.extend(
+            ('prefix_lists', (source.id, source.description), source) for source in permission.prefix_lists or []
+        )
+        sources.extend(
+            ('user_id_group_pairs', tuple(source.to_dict().values()), source)
+            for source in permission.user_id_group_pairs or []
+        )
+        for kind, key, source in sources:
+            items.setdefault(
+                (*rule, kind, key),
+                IPPermission(permission.from_port, permission.to_port, permission.ip_protocol, **{kind: [source]})
+            )
+    return items
+
+
+def _compare(path: str, old: Any, new: Any, delta: ResourceDelta) -> None:
+    if old is new:
+        return
+    if path in ('ip_permissions', 'ip_permissions_egress'):
+        old_items, new_items = _rule_items(old), _rule_items(new)
+        change = ItemChange(
+            path,
+            added=[item for key, item in new_items.items() if key not in old_items],
+            removed=[item for key, item in old_items.items() if key not in new_items]
+        )
+        if change.added or change.removed:
+            delta.item_changes.append(change)
+    elif path == 'access_keys':
+        old_keys = {key.id: key for key in old or []}
+        new_keys = {key.id: key for key in new or []}
+        change = ItemChange(
+            path,
+            added=[key for key_id, key in new_keys.items() if key_id not in old_keys],
+            removed=[key for key_id, key in old_keys.items() if key_id not in new_keys]
+        )
+        if change.added or change.removed:
+            delta.item_changes.append(change)
+        for key_id, key in new_keys.items():
+            if key_id in old_keys:
+                _compare(f'{path}[{key_id}]', old_keys[key_id], key, delta)
+    elif is_dataclass(old) and type(old) is type(new):
+        for item in fields(old):
+            name = f'{path}.{item.name}' if path else item.name
+            _compare(name, getattr(old, item.name), getattr(new, item.name), delta)
+    elif old != new:
+        delta.field_changes.append(FieldChange(path, old, new))
+
+
+def diff_resource(old: Resource, new: Resource) -> ResourceDelta:
+    """
+    Returns the field-level and item-level changes between two versions of the same resource.
+
+    :param old: The previous version of the resource.
+    :type old: SecurityGroup | Role | User
+    :param new: The current version of the resource.
+    :type new: SecurityGroup | Role | User
+    :return: The changes of the resource.
+    :rtype: ResourceDelta
+    """
+    key = resource_key(old)
+    if resource_key(new) != key:
+        raise ValueError('old and new should be versions of the same resource.')
+    delta = ResourceDelta(key, old, new)
+    _compare('', old, new, delta)
+    return delta
+
+
+def diff_snapshots(old: Iterable[Resource], new: Iterable[Resource]) -> SnapshotDiff:
+    """
+    Returns the differences between two snapshots of security groups, roles and users. Resources are matched by
+    identity, and unchanged resources are skipped by comparing content fingerprints, so the cost is linear in the size
+    of the snapshots plus the size of the changed resources.
+
+    :param old: The resources of the previous snapshot.
+    :type old: Iterable[SecurityGroup | Role | User]
+    :param new: The resources of the current snapshot.
+    :type new: Iterable[SecurityGroup | Role | User]
+    :return: The differences between the snapshots.
+    :rtype: SnapshotDiff
+    """
+    old_index = _index(old, 'old')
+    new_index = _index(new, 'new')
+    result = SnapshotDiff()
+    for key, resource in new_index.items():
+        previous = old_index.get(key)
+        if previous is None:
+            result.added.append(resource)
+        elif previous is resource or previous.fingerprint == resource.fingerprint:
+            result.unchanged += 1
+        else:
+            delta = diff_resource(previous, resource)
+            if delta.field_changes or delta.item_changes:
+                result.changed.append(delta)
+            else:
+                result.unchanged += 1
+    result.removed.extend(resource for key, resource in old_index.items() if key not in new_index)
+    return result
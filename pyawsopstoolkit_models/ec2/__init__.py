@@ -1,5 +1,8 @@
 __all__ = [
-    "security_group"
+    "exposure",
+    "normalizer",
+    "security_group",
+    "security_group_graph"
 ]
 __name__ = "pyawsopstoolkit_models.ec2.security_group"
 __description__ = """
@@ -0,0 +1,178 @@
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import compress
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, SecurityGroup
+
+# Ports commonly targeted when exposed to the internet (remote access, databases, caches, file sharing)
+SENSITIVE_PORTS: tuple[int, ...] = (
+    20, 21, 22, 23, 25, 110, 135, 139, 143, 445, 1433, 1521, 2049, 3306, 3389, 5432, 5900, 6379, 9200, 11211, 27017
+)
+WORLD_OPEN_CIDRS: frozenset[str] = frozenset(['0.0.0.0/0', '::/0'])
+
+_INGRESS = 0
+_EGRESS = 1
+_PORT_PROTOCOLS = frozenset(['tcp', 'udp', '6', '17'])
+_ALL_PROTOCOLS = '-1'
+
+
+@dataclass
+class ExposureFinding:
+    """
+    A class representing a security group rule that opens a port range to a world-open CIDR.
+    """
+
+    security_group: SecurityGroup
+    permission: IPPermission
+    ip_protocol: str
+    from_port: int
+    to_port: int
+    cidr: str
+    egress: bool = False
+
+
+class SecurityGroupRuleTable:
+    """
+    A class representing a flattened, column-oriented view of the IPv4 and IPv6 ranges of a collection of EC2 Security
+    Groups. Each row is one CIDR of one rule, and every column is stored in a compact array or list so that bulk checks
+    scan the columns once instead of walking the nested model objects.
+    """
+
+    def __init__(self, security_groups: Optional[Iterable[SecurityGroup]] = None) -> None:
+        """
+        Initializes a new SecurityGroupRuleTable object, optionally populated with the given security groups.
+
+        :param security_groups: The security groups to flatten into the table.
+        :type security_groups: Iterable[SecurityGroup]
+        """
+        self.security_groups: list[SecurityGroup] = []
+        self.permissions: list[IPPermission] = []
+        self.permission_group = array('l')
+        self.permission_direction = bytearray()
+        self.row_permission = array('l')
+        self.from_port = array('l')
+        self.to_port = array('l')
+        self.ip_protocol: list[str] = []
+        self.cidr: list[str] = []
+        if security_groups is not None:
+            self.extend(security_groups)
+
+    def __len__(self) -> int:
+        return len(self.cidr)
+
+    def _append_permission(self, group: int, permission: IPPermission, direction: int) -> None:
+        rule = len(self.permissions)
+        self.permissions.append(permission)
+        self.permission_group.append(group)
+        self.permission_direction.append(direction)
+
+        cidrs = [ip_range.cidr_ip for ip_range in permission.ip_ranges or []]
+        cidrs.extend(ip_range.cidr_ipv6 for ip_range in permission.ipv6_ranges or [])
+        count = len(cidrs)
+        if count == 0:
+            return
+        self.row_permission.extend([rule] * count)
+        self.from_port.extend([permission.from_port] * count)
+        self.to_port.extend([permission.to_port] * count)
+        self.ip_protocol.extend([permission.ip_protocol] * count)
+        self.cidr.extend(cidrs)
+
+    def append(self, security_group: SecurityGroup) -> None:
+        """
+        Flattens the inbound and outbound rules of a security group into the table.
+
+        :param security_group: The security group to add.
+        :type security_group: SecurityGroup
+        """
+        _validate_type(security_group, SecurityGroup, 'security_group should be of SecurityGroup type.')
+        group = len(self.security_groups)
+        self.security_groups.append(security_group)
+        for permission in security_group.ip_permissions or []:
+            self._append_permission(group, permission, _INGRESS)
+        for permission in security_group.ip_permissions_egress or []:
+            self._append_permission(group, permission, _EGRESS)
+
+    def extend(self, security_groups: Iterable[SecurityGroup]) -> None:
+        """
+        Flattens the rules of every given security group into the table.
+
+        :param security_groups: The security groups to add.
+        :type security_groups: Iterable[SecurityGroup]
+        """
+        for security_group in security_groups:
+            self.append(security_group)
+
+    def find_world_open(
+            self,
+            ports: Optional[Iterable[int]] = SENSITIVE_PORTS,
+            egress: bool = False
+    ) -> list[ExposureFinding]:
+        """
+        Returns the rules that open any of the given ports to 0.0.0.0/0 or ::/0. Rules for all protocols (-1) always
+        match, rules for protocols without ports (e.g. ICMP) only match if ports is None, which reports every
+        world-open rule regardless of its port range.
+
+        :param ports: The ports to check, or None to report all world-open rules.
+        :type ports: Iterable[int]
+        :param egress: Flag to check outbound instead of inbound rules.
+        :type egress: bool
+        :return: The list of findings, in table order.
+        :rtype: list
+        """
+        direction = _EGRESS if egress else _INGRESS
+        sorted_ports = sorted(set(ports)) if ports is not None else None
+        port_count = len(sorted_ports) if sorted_ports is not None else 0
+
+        row_permission = self.row_permission
+        permission_direction = self.permission_direction
+        from_port = self.from_port
+        to_port = self.to_port
+        ip_protocol = self.ip_protocol
+        cidr = self.cidr
+
+        findings = []
+        for row in compress(range(len(cidr)), map(WORLD_OPEN_CIDRS.__contains__, cidr)):
+            rule = row_permission[row]
+            if permission_direction[rule] != direction:
+                continue
+            protocol = ip_protocol[row]
+            if sorted_ports is not None and protocol != _ALL_PROTOCOLS:
+                if protocol not in _PORT_PROTOCOLS:
+                    continue
+                position = bisect_left(sorted_ports, from_port[row])
+                if position == port_count or sorted_ports[position] > to_port[row]:
+                    continue
+            findings.append(
+                ExposureFinding(
+                    security_group=self.security_groups[self.permission_group[rule]],
+                    permission=self.permissions[rule],
+                    ip_protocol=protocol,
+                    from_port=from_port[row],
+                    to_port=to_port[row],
+                    cidr=cidr[row],
+                    egress=egress
+                )
+            )
+        return findings
+
+
+def find_world_open_ingress(
+        security_groups: Union[SecurityGroupRuleTable, Iterable[SecurityGroup]],
+        ports: Optional[Iterable[int]] = SENSITIVE_PORTS
+) -> list[ExposureFinding]:
+    """
+    Returns the inbound rules that open any of the given ports to 0.0.0.0/0 or ::/0.
+
+    :param security_groups: A rule table, or the security groups to flatten into one.
+    :type security_groups: SecurityGroupRuleTable | Iterable[SecurityGroup]
+    :param ports: The ports to check, or None to report all world-open inbound rules.
+    :type ports: Iterable[int]
+    :return: The list of findings.
+    :rtype: list
+    """
+    if not isinstance(security_groups, SecurityGroupRuleTable):
+        security_groups = SecurityGroupRuleTable(security_groups)
+    return security_groups.find_world_open(ports)
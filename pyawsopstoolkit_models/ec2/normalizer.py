@@ -0,0 +1,228 @@
+import ipaddress
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import (
+    IPPermission, IPRange, IPv6Range, PrefixList, SecurityGroup, UserIDGroupPair
+)
+
+_ALL_PROTOCOLS = '-1'
+_PROTOCOL_NAMES = {'6': 'tcp', '17': 'udp', '1': 'icmp', '58': 'icmpv6'}
+_PORT_PROTOCOLS = frozenset(['tcp', 'udp'])
+_IPV4 = 'ipv4'
+_IPV6 = 'ipv6'
+_PREFIX_LIST = 'prefix_list'
+_GROUP = 'group'
+
+
+@dataclass
+class RedundantRule:
+    """
+    A class representing a source of a security group rule whose access is already granted by other rules.
+    """
+
+    permission: IPPermission
+    source: Optional[Union[IPRange, IPv6Range, PrefixList, UserIDGroupPair]]
+    reason: str
+    egress: bool = False
+
+
+@dataclass
+class NormalizedRules:
+    """
+    A class representing the canonical minimal rule set of an EC2 Security Group, together with the original rule
+    sources that were found to be redundant.
+    """
+
+    ip_permissions: list[IPPermission] = field(default_factory=list)
+    ip_permissions_egress: list[IPPermission] = field(default_factory=list)
+    redundant: list[RedundantRule] = field(default_factory=list)
+
+
+class _Entry:
+    """
+    A single source of a rule, i.e. one CIDR, prefix list or group pair with the protocol and ports of its rule.
+    """
+
+    __slots__ = ('position', 'permission', 'source', 'protocol', 'low', 'high', 'kind', 'key', 'description')
+
+    def __init__(self, position, permission, source, protocol, low, high, kind, key, description):
+        self.position = position
+        self.permission = permission
+        self.source = source
+        self.protocol = protocol
+        self.low = low
+        self.high = high
+        self.kind = kind
+        self.key = key
+        self.description = description
+
+    @property
+    def identity(self) -> tuple:
+        return self.kind, self.protocol, self.key, self.low, self.high
+
+    def covering_keys(self) -> list:
+        if isinstance(self.key, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+            return [self.key.supernet(new_prefix=prefix) for prefix in range(self.key.prefixlen + 1)]
+        return [self.key]
+
+    def sort_key(self) -> tuple:
+        prefix = self.key.prefixlen if isinstance(self.key, (ipaddress.IPv4Network, ipaddress.IPv6Network)) else 0
+        return self.protocol == _ALL_PROTOCOLS, -prefix, self.high - self.low, self.position
+
+
+def _protocol(ip_protocol: str) -> str:
+    return _PROTOCOL_NAMES.get(ip_protocol.lower(), ip_protocol.lower())
+
+
+def _network(cidr: str, version: int) -> Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]:
+    try:
+        network = ipaddress.ip_network(cidr, strict=False)
+    except ValueError:
+        return cidr
+    return network if network.version == version else cidr
+
+
+def _entries(permissions: list[IPPermission], redundant: list, egress: bool) -> list[_Entry]:
+    entries = []
+    for permission in permissions:
+        protocol = _protocol(permission.ip_protocol)
+        low, high = (-1, -1) if protocol == _ALL_PROTOCOLS else (permission.from_port, permission.to_port)
+        sources = []
+        for ip_range in permission.ip_ranges or []:
+            sources.append((ip_range, _IPV4, _network(ip_range.cidr_ip, 4)))
+        for ip_range in permission.ipv6_ranges or []:
+            sources.append((ip_range, _IPV6, _network(ip_range.cidr_ipv6, 6)))
+        for prefix_list in permission.prefix_lists or []:
+            sources.append((prefix_list, _PREFIX_LIST, prefix_list.id))
+        for pair in permission.user_id_group_pairs or []:
+            sources.append((pair, _GROUP, (pair.user_id, pair.id, pair.vpc_peering_connection_id)))
+        if len(sources) == 0:
+            redundant.append((len(entries), RedundantRule(permission, None, 'empty', egress)))
+        for source, kind, key in sources:
+            entries.append(
+                _Entry(len(entries), permission, source, protocol, low, high, kind, key, source.description)
+            )
+    return entries
+
+
+def _merge(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[list[int]] = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1] + 1:
+            if high > merged[-1][1]:
+                merged[-1][1] = high
+        else:
+            merged.append([low, high])
+    return [(low, high) for low, high in merged]
+
+
+def _covered(entry: _Entry, kept: dict) -> bool:
+    intervals = []
+    for key in entry.covering_keys():
+        if any(other is not entry for other in kept.get((entry.kind, _ALL_PROTOCOLS, key), ())):
+            return True
+        if entry.protocol == _ALL_PROTOCOLS:
+            continue
+        for other in kept.get((entry.kind, entry.protocol, key), ()):
+            if other is entry:
+                continue
+            if entry.protocol in _PORT_PROTOCOLS:
+                intervals.append((other.low, other.high))
+            elif other.low in (-1, entry.low) and other.high in (-1, entry.high):
+                return True
+    return any(low <= entry.low and entry.high <= high for low, high in _merge(intervals))
+
+
+def _collapse(networks: list) -> list:
+    addresses = [network for network in networks if not isinstance(network, str)]
+    return [*ipaddress.collapse_addresses(addresses), *sorted(set(networks) - set(addresses))]
+
+
+def normalize_permissions(
+        permissions: Optional[Iterable[IPPermission]],
+        egress: bool = False
+) -> tuple[list[IPPermission], list[RedundantRule]]:
+    """
+    Returns the canonical minimal equivalent of a list of security group rules. Duplicate sources and sources whose
+    protocol, ports and CIDR are covered by other sources are dropped, the port ranges of each remaining source are
+    merged by sorting and sweeping, and the CIDRs sharing the same protocol and ports are aggregated into the fewest
+    prefixes. Port ranges are only merged for TCP and UDP, as ICMP uses them for types and codes.
+
+    :param permissions: The rules to normalize.
+    :type permissions: Iterable[IPPermission]
+    :param egress: Flag to indicate that the rules are outbound rules, recorded on the redundancy report.
+    :type egress: bool
+    :return: The normalized rules, sorted by protocol and ports, and the redundant sources of the original rules.
+    :rtype: tuple
+    """
+    redundant: list[tuple[int, RedundantRule]] = []
+    permissions = list(permissions or [])
+    for permission in permissions:
+        _validate_type(permission, IPPermission, 'permissions should be a list of IPPermission type.')
+    entries = _entries(permissions, redundant, egress)
+
+    unique: dict[tuple, _Entry] = {}
+    for entry in entries:
+        if entry.identity in unique:
+            redundant.append((entry.position, RedundantRule(entry.permission, entry.source, 'duplicate', egress)))
+        else:
+            unique[entry.identity] = entry
+
+    kept: dict[tuple, list[_Entry]] = {}
+    for entry in unique.values():
+        kept.setdefault((entry.kind, entry.protocol, entry.key), []).append(entry)
+    for entry in sorted(unique.values(), key=_Entry.sort_key):
+        if _covered(entry, kept):
+            kept[(entry.kind, entry.protocol, entry.key)].remove(entry)
+            redundant.append((entry.position, RedundantRule(entry.permission, entry.source, 'covered', egress)))
+
+    rules: dict[tuple, dict[str, list]] = {}
+    for (kind, protocol, key), group in kept.items():
+        if len(group) == 0:
+            continue
+        if protocol in _PORT_PROTOCOLS:
+            ports = _merge((entry.low, entry.high) for entry in group)
+        else:
+            ports = sorted(set((entry.low, entry.high) for entry in group))
+        for low, high in ports:
+            rules.setdefault((protocol, low, high), {}).setdefault(kind, []).append(group[0])
+
+    normalized = []
+    for (protocol, low, high), sources in sorted(rules.items(), key=lambda item: item[0]):
+        ranges = {}
+        for kind in (_IPV4, _IPV6):
+            descriptions = {entry.key: entry.description for entry in reversed(sources.get(kind, []))}
+            ranges[kind] = [
+                (str(network), descriptions.get(network)) for network in _collapse(list(descriptions))
+            ]
+        normalized.append(
+            IPPermission(
+                from_port=low,
+                to_port=high,
+                ip_protocol=protocol,
+                ip_ranges=[IPRange(cidr, description) for cidr, description in ranges[_IPV4]] or None,
+                ipv6_ranges=[IPv6Range(cidr, description) for cidr, description in ranges[_IPV6]] or None,
+                prefix_lists=[entry.source for entry in sources.get(_PREFIX_LIST, [])] or None,
+                user_id_group_pairs=[entry.source for entry in sources.get(_GROUP, [])] or None
+            )
+        )
+    redundant.sort(key=lambda item: item[0])
+    return normalized, [rule for _, rule in redundant]
+
+
+def normalize_security_group(security_group: SecurityGroup) -> NormalizedRules:
+    """
+    Returns the canonical minimal inbound and outbound rule sets of a security group, together with the report of
+    redundant sources in its original rules. The security group itself is not modified.
+
+    :param security_group: The security group to normalize.
+    :type security_group: SecurityGroup
+    :return: The normalized rules and the redundancy report.
+    :rtype: NormalizedRules
+    """
+    _validate_type(security_group, SecurityGroup, 'security_group should be of SecurityGroup type.')
+    ip_permissions, redundant = normalize_permissions(security_group.ip_permissions)
+    ip_permissions_egress, redundant_egress = normalize_permissions(security_group.ip_permissions_egress, True)
+    return NormalizedRules(ip_permissions, ip_permissions_egress, redundant + redundant_egress)
@@ -1,6 +1,12 @@
 from dataclasses import dataclass
 from typing import Optional, Union
 
+from pyawsopstoolkit_models.__identity__ import _identity, _new, _register
+from pyawsopstoolkit_models.__interning__ import _shared, _thaw
+from pyawsopstoolkit_models.__loading__ import _lazy_fields, _list_loader, _load
+from pyawsopstoolkit_models.__tracking__ import (
+    _cache_dict, _cached_dict, _changed, _check, _derived, _dict_cached, _fingerprint, _notify
+)
 from pyawsopstoolkit_models.__validation__ import _validate_type
 
 
@@ -25,9 +31,47 @@ class IPRange:
             _validate_type(field_value, Union[str, None], f'{field_name} should be a string.')
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the IPRange instance. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'IPRange':
+        """
+        Creates an IPRange instance from an entry of the IpRanges list of an EC2 DescribeSecurityGroups response.
+
+        :param data: The IpRanges entry.
+        :type data: dict
+        :return: The IPRange instance.
+        :rtype: IPRange
+        """
+        return cls(
+            cidr_ip=data['CidrIp'],
+            description=data.get('Description')
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the IPRange instance, cached until the IPRange instance is modified.
+
+        :return: Content fingerprint of the IPRange instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -36,6 +80,8 @@ class IPRange:
         :return: Dictionary representation of the IPRange instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "cidr_ip": self.cidr_ip,
             "description": self.description
@@ -63,9 +109,47 @@ class IPv6Range:
             _validate_type(field_value, Union[str, None], f'{field_name} should be a string.')
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the IPv6Range instance. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'IPv6Range':
+        """
+        Creates an IPv6Range instance from an entry of the Ipv6Ranges list of an EC2 DescribeSecurityGroups response.
+
+        :param data: The Ipv6Ranges entry.
+        :type data: dict
+        :return: The IPv6Range instance.
+        :rtype: IPv6Range
+        """
+        return cls(
+            cidr_ipv6=data['CidrIpv6'],
+            description=data.get('Description')
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the IPv6Range instance, cached until the IPv6Range instance is modified.
+
+        :return: Content fingerprint of the IPv6Range instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -74,6 +158,8 @@ class IPv6Range:
         :return: Dictionary representation of the IPv6Range instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "cidr_ipv6": self.cidr_ipv6,
             "description": self.description
@@ -101,9 +187,47 @@ class PrefixList:
             _validate_type(field_value, Union[str, None], f'{field_name} should be a string.')
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the PrefixList instance. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'PrefixList':
+        """
+        Creates a PrefixList instance from an entry of the PrefixListIds list of an EC2 DescribeSecurityGroups response.
+
+        :param data: The PrefixListIds entry.
+        :type data: dict
+        :return: The PrefixList instance.
+        :rtype: PrefixList
+        """
+        return cls(
+            id=data['PrefixListId'],
+            description=data.get('Description')
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the PrefixList instance, cached until the PrefixList instance is modified.
+
+        :return: Content fingerprint of the PrefixList instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -112,6 +236,8 @@ class PrefixList:
         :return: Dictionary representation of the PrefixList instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "id": self.id,
             "description": self.description
@@ -144,9 +270,55 @@ class UserIDGroupPair:
             _validate_type(field_value, Union[str, None], f'{field_name} should be a string.')
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the UserIDGroupPair instance. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'UserIDGroupPair':
+        """
+        Creates a UserIDGroupPair instance from an entry of the UserIdGroupPairs list of an EC2
+        DescribeSecurityGroups response. The group name, peering status and VPC ID, which EC2 omits for some
+        references, default to empty strings.
+
+        :param data: The UserIdGroupPairs entry.
+        :type data: dict
+        :return: The UserIDGroupPair instance.
+        :rtype: UserIDGroupPair
+        """
+        return cls(
+            id=data['GroupId'],
+            name=data.get('GroupName', ''),
+            status=data.get('PeeringStatus', ''),
+            user_id=data['UserId'],
+            vpc_id=data.get('VpcId', ''),
+            description=data.get('Description'),
+            vpc_peering_connection_id=data.get('VpcPeeringConnectionId')
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the UserIDGroupPair instance, cached until the UserIDGroupPair instance is
+        modified.
+
+        :return: Content fingerprint of the UserIDGroupPair instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -155,6 +327,8 @@ class UserIDGroupPair:
         :return: Dictionary representation of the UserIDGroupPair instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "id": self.id,
             "name": self.name,
@@ -204,9 +378,66 @@ class IPPermission:
                 all(_validate_type(item, field_type, message) for item in field_value)
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the IPPermission instance. While enabled, to_dict() returns a
+        read-only dict that only rebuilds the fields changed since the previous call, including in-place changes of the
+        range, prefix list and group pair lists, whose items cache their own dicts.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict, lazy: bool = False) -> 'IPPermission':
+        """
+        Creates an IPPermission instance from an entry of the IpPermissions or IpPermissionsEgress list of an EC2
+        DescribeSecurityGroups response. Ports, which EC2 omits for rules covering all protocols, default to -1. In
+        lazy mode, the ranges, prefix lists and group pairs are kept as raw response data and converted on first
+        access.
+
+        :param data: The IpPermissions entry.
+        :type data: dict
+        :param lazy: Flag to convert the nested objects on first access.
+        :type lazy: bool
+        :return: The IPPermission instance.
+        :rtype: IPPermission
+        """
+        return _load(
+            cls,
+            {
+                'from_port': data.get('FromPort', -1),
+                'to_port': data.get('ToPort', -1),
+                'ip_protocol': data['IpProtocol']
+            },
+            {
+                'ip_ranges': data.get('IpRanges'),
+                'ipv6_ranges': data.get('Ipv6Ranges'),
+                'prefix_lists': data.get('PrefixListIds'),
+                'user_id_group_pairs': data.get('UserIdGroupPairs')
+            },
+            lazy
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the IPPermission instance. The fingerprint is computed from the
+        fingerprints of its children, ignores the order of list items, and is cached until the IPPermission instance or
+        one of its children is modified.
+
+        :return: Content fingerprint of the IPPermission instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -215,6 +446,8 @@ class IPPermission:
         :return: Dictionary representation of the IPPermission instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "from_port": self.from_port,
             "to_port": self.to_port,
@@ -237,7 +470,8 @@ class IPPermission:
 @dataclass
 class SecurityGroup:
     """
-    A class representing the EC2 Security Group.
+    A class representing the EC2 Security Group. Equal tag lists are stored once as a shared, read-only copy: modifying
+    it in place raises TypeError, so a new list is assigned instead, and to_dict() returns a plain copy.
     """
 
     from pyawsopstoolkit.account import Account
@@ -254,9 +488,13 @@ class SecurityGroup:
     tags: Optional[list] = None
     in_use: Optional[bool] = None
 
+    def __new__(cls, *args, **kwargs):
+        return _new(cls, args, kwargs)
+
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
             self.__validate__(field_name)
+        _register(self)
 
     def __validate__(self, field_name):
         from pyawsopstoolkit.account import Account
@@ -293,9 +531,101 @@ class SecurityGroup:
             _validate_type(field_value, Union[bool, None], f'{field_name} should be a boolean.')
 
     def __setattr__(self, key, value):
+        if key == 'tags':
+            value = _shared(value)
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the SecurityGroup instance. While enabled, to_dict() returns a
+        read-only dict that only rebuilds the fields changed since the previous call, including in-place changes of the
+        rule lists, whose rules cache their own dicts.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, account: Account, region: str, data: dict, lazy: bool = False) -> 'SecurityGroup':
+        """
+        Creates a SecurityGroup instance from an entry of the SecurityGroups list of an EC2 DescribeSecurityGroups
+        response. In lazy mode, the rules are kept as raw response data and converted into IPPermission instances on
+        first access, so that reading the other fields does not pay for the construction of the rules.
+
+        :param account: The account of the security group.
+        :type account: Account
+        :param region: The region of the security group.
+        :type region: str
+        :param data: The SecurityGroups entry.
+        :type data: dict
+        :param lazy: Flag to convert the nested objects on first access.
+        :type lazy: bool
+        :return: The SecurityGroup instance.
+        :rtype: SecurityGroup
+        """
+        return _load(
+            cls,
+            {
+                'account': account,
+                'region': region,
+                'id': data['GroupId'],
+                'name': data['GroupName'],
+                'owner_id': data['OwnerId'],
+                'vpc_id': data.get('VpcId', ''),
+                'description': data.get('Description'),
+                'tags': data.get('Tags') or None,
+                'in_use': None
+            },
+            {
+                'ip_permissions': data.get('IpPermissions'),
+                'ip_permissions_egress': data.get('IpPermissionsEgress')
+            },
+            lazy
+        )
+
+    def get_tag(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Gets the value of a tag of the SecurityGroup instance.
+
+        :param key: The tag key.
+        :type key: str
+        :param default: The value to return if the tag is missing.
+        :type default: str
+        :return: The tag value, or the default value if the tag is missing.
+        :rtype: str
+        """
+        return self.tag_map.get(key, default)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the SecurityGroup instance. The fingerprint is computed from the
+        fingerprints of its children, ignores the order of list items, and is cached until the SecurityGroup instance or
+        one of its children is modified.
+
+        :return: Content fingerprint of the SecurityGroup instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
+
+    @property
+    def tag_map(self):
+        """
+        Returns the read-only mapping of tag keys to values of the SecurityGroup instance, cached until tags is
+        changed.
+
+        :return: The tag values keyed by tag key.
+        :rtype: MappingProxyType
+        """
+        from pyawsopstoolkit_models.tags import tag_map
+
+        return _derived(self, 'tags', tag_map)
 
     def to_dict(self) -> dict:
         """
@@ -304,6 +634,8 @@ class SecurityGroup:
         :return: Dictionary representation of the SecurityGroup instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "account": self.account.to_dict(),
             "region": self.region,
@@ -318,6 +650,21 @@ class SecurityGroup:
                 ip_perm.to_dict() for ip_perm in self.ip_permissions_egress
             ] if self.ip_permissions_egress and len(self.ip_permissions_egress) > 0 else None,
             "description": self.description,
-            "tags": self.tags,
+            "tags": _thaw(self.tags),
             "in_use": self.in_use
         }
+
+
+_lazy_fields(
+    IPPermission,
+    ip_ranges=_list_loader(IPRange),
+    ipv6_ranges=_list_loader(IPv6Range),
+    prefix_lists=_list_loader(PrefixList),
+    user_id_group_pairs=_list_loader(UserIDGroupPair)
+)
+_lazy_fields(
+    SecurityGroup,
+    ip_permissions=_list_loader(IPPermission),
+    ip_permissions_egress=_list_loader(IPPermission)
+)
+_identity(SecurityGroup, lambda values: (values['account'].number, values['region'], values['id']))
@@ -0,0 +1,369 @@
+from array import array
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup, UserIDGroupPair
+
+_INGRESS = 0
+_EGRESS = 1
+_DIRECTIONS = ('ingress', 'egress')
+
+
+@dataclass
+class SecurityGroupEdge:
+    """
+    A class representing a reference from one EC2 Security Group to another, derived from a User ID Group Pair. The
+    edge follows the direction of the traffic: an inbound rule of the target referencing the source, or an outbound
+    rule of the source referencing the target.
+    """
+
+    source_id: str
+    target_id: str
+    direction: str
+    pair: UserIDGroupPair
+    owner_id: str
+
+    @property
+    def cross_account(self) -> bool:
+        """
+        Indicates whether the referenced security group belongs to a different account than the rule owner.
+
+        :return: True if the edge crosses an account boundary, False otherwise.
+        :rtype: bool
+        """
+        return self.pair.user_id != self.owner_id
+
+    @property
+    def peered(self) -> bool:
+        """
+        Indicates whether the reference is made through a VPC peering connection.
+
+        :return: True if the edge crosses a VPC peering connection, False otherwise.
+        :rtype: bool
+        """
+        return self.pair.vpc_peering_connection_id is not None
+
+
+class SecurityGroupGraph:
+    """
+    A class representing the security group reference graph built from the User ID Group Pairs of a collection of EC2
+    Security Groups. Nodes are security group IDs, including referenced groups that are not part of the collection,
+    and edges are stored as integer adjacency lists in both directions so that neighbour and reachability queries are
+    linear in the size of the visited part of the graph.
+    """
+
+    def __init__(self, security_groups: Optional[Iterable[SecurityGroup]] = None) -> None:
+        """
+        Initializes a new SecurityGroupGraph object, optionally populated with the given security groups.
+
+        :param security_groups: The security groups to add to the graph.
+        :type security_groups: Iterable[SecurityGroup]
+        """
+        self._index: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._groups: list[Optional[SecurityGroup]] = []
+        self._succ: list[list[int]] = []
+        self._pred: list[list[int]] = []
+        self._out_edges: list[list[int]] = []
+        self._in_edges: list[list[int]] = []
+        self._edge_src = array('l')
+        self._edge_dst = array('l')
+        self._edge_direction = bytearray()
+        self._edge_pair: list[UserIDGroupPair] = []
+        self._edge_owner: list[str] = []
+        if security_groups is not None:
+            for security_group in security_groups:
+                self.add_security_group(security_group)
+
+    def __contains__(self, group_id: object) -> bool:
+        return group_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        The number of edges in the graph.
+
+        :return: The number of edges.
+        :rtype: int
+        """
+        return len(self._edge_src)
+
+    @property
+    def node_count(self) -> int:
+        """
+        The number of nodes in the graph, including referenced security groups outside the collection.
+
+        :return: The number of nodes.
+        :rtype: int
+        """
+        return len(self._ids)
+
+    def _node(self, group_id: str) -> int:
+        node = self._index.get(group_id)
+        if node is None:
+            node = len(self._ids)
+            self._index[group_id] = node
+            self._ids.append(group_id)
+            self._groups.append(None)
+            self._succ.append([])
+            self._pred.append([])
+            self._out_edges.append([])
+            self._in_edges.append([])
+        return node
+
+    def _lookup(self, group_id: str) -> int:
+        node = self._index.get(group_id)
+        if node is None:
+            raise KeyError(f'{group_id} is not a node of the security group graph.')
+        return node
+
+    def _add_edge(self, source: int, target: int, direction: int, pair: UserIDGroupPair, owner_id: str) -> None:
+        edge = len(self._edge_src)
+        self._edge_src.append(source)
+        self._edge_dst.append(target)
+        self._edge_direction.append(direction)
+        self._edge_pair.append(pair)
+        self._edge_owner.append(owner_id)
+        self._succ[source].append(target)
+        self._pred[target].append(source)
+        self._out_edges[source].append(edge)
+        self._in_edges[target].append(edge)
+
+    def add_security_group(self, security_group: SecurityGroup) -> None:
+        """
+        Adds a security group and the edges of its User ID Group Pairs to the graph.
+
+        :param security_group: The security group to add.
+        :type security_group: SecurityGroup
+        """
+        _validate_type(security_group, SecurityGroup, 'security_group should be of SecurityGroup type.')
+        node = self._node(security_group.id)
+        if self._groups[node] is not None:
+            raise ValueError(f'{security_group.id} has already been added to the security group graph.')
+        self._groups[node] = security_group
+
+        owner_id = security_group.owner_id
+        for permission in security_group.ip_permissions or []:
+            for pair in permission.user_id_group_pairs or []:
+                self._add_edge(self._node(pair.id), node, _INGRESS, pair, owner_id)
+        for permission in security_group.ip_permissions_egress or []:
+            for pair in permission.user_id_group_pairs or []:
+                self._add_edge(node, self._node(pair.id), _EGRESS, pair, owner_id)
+
+    def get_security_group(self, group_id: str) -> Optional[SecurityGroup]:
+        """
+        Returns the security group for the given node, or None if the group is only known through references.
+
+        :param group_id: The security group ID.
+        :type group_id: str
+        :return: The security group, if it is part of the collection.
+        :rtype: SecurityGroup
+        """
+        return self._groups[self._lookup(group_id)]
+
+    def nodes(self) -> list[str]:
+        """
+        Returns the security group IDs of all nodes in insertion order.
+
+        :return: The list of security group IDs.
+        :rtype: list
+        """
+        return list(self._ids)
+
+    def _edge(self, edge: int) -> SecurityGroupEdge:
+        return SecurityGroupEdge(
+            source_id=self._ids[self._edge_src[edge]],
+            target_id=self._ids[self._edge_dst[edge]],
+            direction=_DIRECTIONS[self._edge_direction[edge]],
+            pair=self._edge_pair[edge],
+            owner_id=self._edge_owner[edge]
+        )
+
+    def edges(self, group_id: Optional[str] = None, reverse: bool = False) -> Iterator[SecurityGroupEdge]:
+        """
+        Iterates over the edges of the graph, or over the outgoing (or incoming, if reverse) edges of a single node.
+
+        :param group_id: The security group ID whose edges are returned. All edges are returned if omitted.
+        :type group_id: str
+        :param reverse: Flag to return incoming instead of outgoing edges of the node.
+        :type reverse: bool
+        :return: An iterator of edges.
+        :rtype: Iterator[SecurityGroupEdge]
+        """
+        if group_id is None:
+            edges = range(len(self._edge_src))
+        else:
+            node = self._lookup(group_id)
+            edges = self._in_edges[node] if reverse else self._out_edges[node]
+        return (self._edge(edge) for edge in edges)
+
+    def successors(self, group_id: str) -> list[str]:
+        """
+        Returns the security groups that the given security group can send traffic to directly.
+
+        :param group_id: The security group ID.
+        :type group_id: str
+        :return: The list of security group IDs.
+        :rtype: list
+        """
+        return [self._ids[node] for node in dict.fromkeys(self._succ[self._lookup(group_id)])]
+
+    def predecessors(self, group_id: str) -> list[str]:
+        """
+        Returns the security groups that can send traffic to the given security group directly.
+
+        :param group_id: The security group ID.
+        :type group_id: str
+        :return: The list of security group IDs.
+        :rtype: list
+        """
+        return [self._ids[node] for node in dict.fromkeys(self._pred[self._lookup(group_id)])]
+
+    @staticmethod
+    def _reach(start: int, adjacency: list[list[int]], target: Optional[int] = None) -> set[int]:
+        # A set rather than a flag per node, so that a query does not pay for the groups it never visits.
+        seen = set()
+        stack = list(adjacency[start])
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node == target:
+                break
+            stack.extend(adjacency[node])
+        return seen
+
+    def reachable(self, group_id: str, reverse: bool = False) -> set[str]:
+        """
+        Returns the security groups reachable from the given security group through one or more edges. With reverse,
+        returns the security groups from which the given security group can be reached instead. The group itself is
+        only part of the result if it lies on a cycle.
+
+        :param group_id: The security group ID.
+        :type group_id: str
+        :param reverse: Flag to follow the edges backwards.
+        :type reverse: bool
+        :return: The set of security group IDs.
+        :rtype: set
+        """
+        ids = self._ids
+        return {ids[node] for node in self._reach(self._lookup(group_id), self._pred if reverse else self._succ)}
+
+    def is_reachable(self, source_id: str, target_id: str) -> bool:
+        """
+        Checks whether traffic from the source security group can reach the target security group through one or
+        more edges.
+
+        :param source_id: The source security group ID.
+        :type source_id: str
+        :param target_id: The target security group ID.
+        :type target_id: str
+        :return: True if the target is reachable from the source, False otherwise.
+        :rtype: bool
+        """
+        target = self._lookup(target_id)
+        return target in self._reach(self._lookup(source_id), self._succ, target)
+
+    def _components(self) -> list[list[int]]:
+        # Iterative Tarjan, components are emitted in reverse topological order.
+        succ = self._succ
+        count = len(self._ids)
+        index = [-1] * count
+        low = [0] * count
+        on_stack = bytearray(count)
+        stack: list[int] = []
+        components: list[list[int]] = []
+        counter = 0
+        for root in range(count):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [(root, 0)]
+            while work:
+                node, position = work[-1]
+                neighbours = succ[node]
+                if position < len(neighbours):
+                    work[-1] = (node, position + 1)
+                    neighbour = neighbours[position]
+                    if index[neighbour] == -1:
+                        index[neighbour] = low[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack[neighbour] = 1
+                        work.append((neighbour, 0))
+                    elif on_stack[neighbour] and index[neighbour] < low[node]:
+                        low[node] = index[neighbour]
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    def strongly_connected_components(self) -> list[list[str]]:
+        """
+        Returns the strongly connected components of the graph, i.e. the maximal sets of security groups that can all
+        reach each other. Components are returned in reverse topological order, so a component only references
+        components listed before it.
+
+        :return: The list of components, each a list of security group IDs.
+        :rtype: list
+        """
+        ids = self._ids
+        return [[ids[node] for node in component] for component in self._components()]
+
+    def transitive_closure(self) -> dict[str, frozenset[str]]:
+        """
+        Returns the transitive closure of the graph as a mapping of every security group ID to the set of security
+        group IDs reachable from it. The closure is computed once per strongly connected component over the condensed
+        graph, and members of the same component share the same set.
+
+        :return: The mapping of security group IDs to reachable security group IDs.
+        :rtype: dict
+        """
+        ids = self._ids
+        succ = self._succ
+        components = self._components()
+        component_of = [0] * len(ids)
+        for position, component in enumerate(components):
+            for node in component:
+                component_of[node] = position
+
+        closures: list[frozenset[str]] = []
+        members = [frozenset(ids[node] for node in component) for component in components]
+        for position, component in enumerate(components):
+            reach: set[str] = set()
+            visited = set()
+            cyclic = len(component) > 1
+            for node in component:
+                for neighbour in succ[node]:
+                    other = component_of[neighbour]
+                    if other == position:
+                        cyclic = True
+                    elif other not in visited:
+                        visited.add(other)
+                        reach |= members[other]
+                        reach |= closures[other]
+            if cyclic:
+                reach |= members[position]
+            closures.append(frozenset(reach))
+
+        return {ids[node]: closures[component_of[node]] for node in range(len(ids))}
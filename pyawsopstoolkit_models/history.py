@@ -0,0 +1,314 @@
+import json
+import sqlite3
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__loading__ import _from_dict
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.diff import resource_key
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+Resource = Union[SecurityGroup, Role, User]
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data BLOB NOT NULL,
+    first INTEGER NOT NULL,
+    last INTEGER
+);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    egress INTEGER NOT NULL,
+    ip_protocol TEXT NOT NULL,
+    from_port INTEGER NOT NULL,
+    to_port INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    first INTEGER NOT NULL,
+    last INTEGER
+);
+CREATE INDEX IF NOT EXISTS versions_key ON versions (kind, key, first);
+CREATE INDEX IF NOT EXISTS versions_first ON versions (first);
+CREATE INDEX IF NOT EXISTS versions_current ON versions (last);
+CREATE INDEX IF NOT EXISTS rules_group_id ON rules (account, region, group_id, last);
+CREATE INDEX IF NOT EXISTS rules_source ON rules (source);
+'''
+
+_MODELS: dict[str, type] = {'SecurityGroup': SecurityGroup, 'Role': Role, 'User': User}
+
+
+@dataclass
+class RuleLifetime:
+    """
+    A class representing the period during which a security group rule allowed a source, from the snapshot where it
+    appeared to the snapshot where it disappeared.
+    """
+
+    account: str
+    region: str
+    security_group_id: str
+    egress: bool
+    ip_protocol: str
+    from_port: int
+    to_port: int
+    source: str
+    appeared: str
+    disappeared: Optional[str] = None
+
+
+def _encode(resource: Resource) -> bytes:
+    return zlib.compress(json.dumps(resource.to_dict(), separators=(',', ':')).encode())
+
+
+def _key(resource: Resource) -> tuple[str, str]:
+    # The identity of a resource, with the account number, region and ID of a security group stored as JSON text.
+    kind, key = resource_key(resource)
+    return kind, key if isinstance(key, str) else json.dumps(key)
+
+
+def _decode(kind: str, data: bytes) -> Resource:
+    return _from_dict(_MODELS[kind], json.loads(zlib.decompress(data)))
+
+
+def _rules(security_group: SecurityGroup) -> set[tuple]:
+    rules = set()
+    for egress, permissions in ((0, security_group.ip_permissions), (1, security_group.ip_permissions_egress)):
+        for permission in permissions or []:
+            rule = (egress, permission.ip_protocol, permission.from_port, permission.to_port)
+            sources = [source.cidr_ip for source in permission.ip_ranges or []]
+            sources.extend(source.cidr_ipv6 for source in permission.ipv6_ranges or [])
+            sources.extend(source.id for source in permission.prefix_lists or [])
+            sources.extend(source.id for source in permission.user_id_group_pairs or [])
+            rules.update((*rule, source) for source in sources)
+    return rules
+
+
+class HistoryStore:
+    """
+    A class representing the history of snapshots of security groups, roles and users in a SQLite database. Each
+    snapshot only writes the resources that were added or changed since the previous snapshot, detected by comparing
+    content fingerprints, and every stored version records the snapshots between which it was current. Any snapshot
+    is therefore read without replaying the previous ones, and the rules of security groups are tracked the same way,
+    so that the appearance of a rule is found with an indexed query.
+    """
+
+    def __init__(self, path: str = ':memory:') -> None:
+        """
+        Initializes a new HistoryStore object, creating the tables and indexes of the database if needed.
+
+        :param path: The path of the database file, or :memory: for a store kept in memory.
+        :type path: str
+        """
+        _validate_type(path, str, 'path should be a string.')
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'HistoryStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _snapshot_id(self, name: str) -> int:
+        _validate_type(name, str, 'name should be a string.')
+        row = self._connection.execute('SELECT id FROM snapshots WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def _names(self) -> dict[int, str]:
+        return dict(self._connection.execute('SELECT id, name FROM snapshots'))
+
+    def add_snapshot(self, name: str, resources: Iterable[Resource]) -> dict[str, int]:
+        """
+        Adds a snapshot taken after the previous ones, storing the resources that were added or changed since the
+        previous snapshot and closing the versions of the resources that were changed or removed, in one transaction.
+        Changes are detected with the content fingerprints of the resources, which follow field assignments as well as
+        in-place changes of their lists, so live objects can be passed again after being modified.
+
+        :param name: The unique name of the snapshot, e.g. its date.
+        :type name: str
+        :param resources: The security groups, roles and users of the snapshot.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        :return: The number of added, changed, removed and unchanged resources.
+        :rtype: dict
+        """
+        _validate_type(name, str, 'name should be a string.')
+        current = {
+            (kind, key): (version, fingerprint) for version, kind, key, fingerprint in self._connection.execute(
+                'SELECT id, kind, key, fingerprint FROM versions WHERE last IS NULL'
+            )
+        }
+        seen, inserted, closed, changed_groups = set(), [], [], []
+        counts = {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        for resource in resources:
+            kind, key = _key(resource)
+            if (kind, key) in seen:
+                raise ValueError(f'resources contains more than one resource for {(kind, key)}.')
+            seen.add((kind, key))
+            fingerprint = resource.fingerprint
+            previous = current.get((kind, key))
+            if previous is not None and previous[1] == fingerprint:
+                counts['unchanged'] += 1
+                continue
+            counts['added' if previous is None else 'changed'] += 1
+            if previous is not None:
+                closed.append(previous[0])
+            inserted.append((kind, key, fingerprint, _encode(resource)))
+            if kind == 'SecurityGroup':
+                changed_groups.append((tuple(json.loads(key)), _rules(resource)))
+        removed = [(kind, key, version) for (kind, key), (version, _) in current.items() if (kind, key) not in seen]
+        counts['removed'] = len(removed)
+        closed.extend(version for _, _, version in removed)
+        changed_groups.extend((tuple(json.loads(key)), set()) for kind, key, _ in removed if kind == 'SecurityGroup')
+        with self._connection:
+            try:
+                snapshot = self._connection.execute('INSERT INTO snapshots (name) VALUES (?)', (name,)).lastrowid
+            except sqlite3.IntegrityError:
+                raise ValueError(f'snapshot {name} already exists.') from None
+            self._connection.executemany('UPDATE versions SET last = ? WHERE id = ?', [
+                (snapshot, version) for version in closed
+            ])
+            self._connection.executemany(
+                'INSERT INTO versions (kind, key, fingerprint, data, first) VALUES (?, ?, ?, ?, ?)',
+                [(*row, snapshot) for row in inserted]
+            )
+            for group, rules in changed_groups:
+                open_rules = {
+                    tuple(row[1:]): row[0] for row in self._connection.execute(
+                        'SELECT id, egress, ip_protocol, from_port, to_port, source FROM rules '
+                        'WHERE account = ? AND region = ? AND group_id = ? AND last IS NULL', group
+                    )
+                }
+                self._connection.executemany('UPDATE rules SET last = ? WHERE id = ?', [
+                    (snapshot, rule_id) for rule, rule_id in open_rules.items() if rule not in rules
+                ])
+                self._connection.executemany(
+                    'INSERT INTO rules (account, region, group_id, egress, ip_protocol, from_port, to_port, source, '
+                    'first) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(*group, *rule, snapshot) for rule in sorted(rules) if rule not in open_rules]
+                )
+        return counts
+
+    def close(self) -> None:
+        """
+        Closes the database connection of the store.
+        """
+        self._connection.close()
+
+    def get_snapshot(self, name: str, cls: Optional[type] = None) -> list[Resource]:
+        """
+        Returns the resources of a snapshot, read from the versions current at that snapshot.
+
+        :param name: The name of the snapshot.
+        :type name: str
+        :param cls: The model class of the resources to return, i.e. SecurityGroup, Role or User, by default all.
+        :type cls: type
+        :return: The resources of the snapshot.
+        :rtype: list
+        """
+        snapshot = self._snapshot_id(name)
+        query = 'SELECT kind, data FROM versions WHERE first <= ? AND (last IS NULL OR last > ?)'
+        parameters = [snapshot, snapshot]
+        if cls is not None:
+            if cls not in _MODELS.values():
+                raise TypeError('cls should be SecurityGroup, Role or User.')
+            query += ' AND kind = ?'
+            parameters.append(cls.__name__)
+        return [_decode(kind, data) for kind, data in self._connection.execute(query + ' ORDER BY id', parameters)]
+
+    def history(self, resource: Resource) -> list[tuple[str, Optional[str], Resource]]:
+        """
+        Returns the stored versions of a resource, with the snapshot where each version appeared and the snapshot
+        where it was replaced or removed.
+
+        :param resource: The resource, or any version of it.
+        :type resource: SecurityGroup | Role | User
+        :return: The (appeared, replaced, version) tuples, oldest first; replaced is None for the current version.
+        :rtype: list
+        """
+        kind, key = _key(resource)
+        names = self._names()
+        return [
+            (names[first], names.get(last), _decode(kind, data)) for data, first, last in self._connection.execute(
+                'SELECT data, first, last FROM versions WHERE kind = ? AND key = ? ORDER BY first', (kind, key)
+            )
+        ]
+
+    def rule_lifetimes(
+            self,
+            security_group_id: Optional[str] = None,
+            source: Optional[str] = None,
+            port: Optional[int] = None,
+            egress: Optional[bool] = None,
+            account: Optional[str] = None,
+            region: Optional[str] = None
+    ) -> list[RuleLifetime]:
+        """
+        Returns the periods during which security group rules allowed a source, e.g. to find when 0.0.0.0/0 was
+        allowed on port 22 of a security group.
+
+        :param security_group_id: The ID of the security group, by default all security groups.
+        :type security_group_id: str
+        :param source: The CIDR, prefix list ID or security group ID allowed by the rule, by default any source.
+        :type source: str
+        :param port: A port opened by the rule. Rules for all protocols (-1) open every port.
+        :type port: int
+        :param egress: Flag to return outbound rules, inbound rules, or both if None.
+        :type egress: bool
+        :param account: The account number of the security group, by default all accounts.
+        :type account: str
+        :param region: The region of the security group, by default all regions.
+        :type region: str
+        :return: The rule lifetimes, in order of appearance.
+        :rtype: list
+        """
+        _validate_type(security_group_id, Optional[str], 'security_group_id should be a string.')
+        _validate_type(source, Optional[str], 'source should be a string.')
+        _validate_type(port, Optional[int], 'port should be an integer.')
+        _validate_type(egress, Optional[bool], 'egress should be a boolean.')
+        _validate_type(account, Optional[str], 'account should be a string.')
+        _validate_type(region, Optional[str], 'region should be a string.')
+        clauses, parameters = [], []
+        for clause, value in (
+                ('account = ?', account), ('region = ?', region), ('group_id = ?', security_group_id),
+                ('source = ?', source), ('egress = ?', egress)
+        ):
+            if value is not None:
+                clauses.append(clause)
+                parameters.append(value)
+        if port is not None:
+            clauses.append("(ip_protocol = '-1' OR (from_port <= ? AND to_port >= ?))")
+            parameters.extend((port, port))
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        names = self._names()
+        return [
+            RuleLifetime(*group, bool(is_egress), protocol, from_port, to_port, rule_source, names[first],
+                         names.get(last))
+            for *group, is_egress, protocol, from_port, to_port, rule_source, first, last in self._connection.execute(
+                'SELECT account, region, group_id, egress, ip_protocol, from_port, to_port, source, first, last '
+                f'FROM rules{where} ORDER BY first, id', parameters
+            )
+        ]
+
+    def snapshots(self) -> list[str]:
+        """
+        Returns the names of the snapshots, oldest first.
+
+        :return: The snapshot names.
+        :rtype: list
+        """
+        return [name for name, in self._connection.execute('SELECT name FROM snapshots ORDER BY id')]
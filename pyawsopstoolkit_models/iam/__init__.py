@@ -1,6 +1,12 @@
 __all__ = [
+    "access_key_index",
+    "credentials",
     "permissions_boundary",
+    "permissions_boundary_index",
     "role",
+    "role_usage",
+    "trust_graph",
+    "trust_policy",
     "user"
 ]
 __name__ = "pyawsopstoolkit_models.iam"
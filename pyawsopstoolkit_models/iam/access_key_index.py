@@ -0,0 +1,187 @@
+from typing import Iterable, Optional
+
+from pyawsopstoolkit_models.__tracking__ import _guard, _listen, _track_lists
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+
+
+class AccessKeyIndex:
+    """
+    A class representing a reverse index from access key IDs to the IAM users owning them. The index follows the
+    changes of the indexed users: reassigning access_keys, modifying it in place or changing the id of an indexed
+    AccessKey updates the index. A change giving an access key ID to a second user raises ValueError before the user is
+    modified, so the users and the index never diverge. To observe in-place changes, the lists of the indexed users are
+    replaced with tracked copies.
+    """
+
+    def __init__(self, users: Optional[Iterable[User]] = None) -> None:
+        """
+        Initializes a new AccessKeyIndex object, optionally populated with the given users.
+
+        :param users: The users to add to the index.
+        :type users: Iterable[User]
+        """
+        self._entries: dict[str, tuple[User, AccessKey]] = {}
+        self._users: dict[int, User] = {}
+        self._user_keys: dict[int, tuple[str, ...]] = {}
+        self._key_ids: dict[int, str] = {}
+        _guard(User, 'access_keys', self._check_access_keys)
+        _guard(AccessKey, 'id', self._check_id)
+        _listen(User, 'access_keys', self._access_keys_changed)
+        _listen(AccessKey, 'id', self._id_changed)
+        if users is not None:
+            self.extend(users)
+
+    def __contains__(self, key_id: object) -> bool:
+        return key_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _keys_of(user: User) -> list[AccessKey]:
+        keys = user.access_keys
+        if not keys:
+            return []
+        for key in keys:
+            _validate_type(key, AccessKey, 'access_keys should be a list of AccessKey type.')
+        return list(keys)
+
+    def _check_conflicts(self, user: User, key_ids: Iterable[str]) -> None:
+        seen = set()
+        for key_id in key_ids:
+            entry = self._entries.get(key_id)
+            if key_id in seen or (entry is not None and entry[0] is not user):
+                raise ValueError(f'access key {key_id} belongs to more than one user.')
+            seen.add(key_id)
+
+    def _assign(self, user: User, keys: list[AccessKey]) -> None:
+        key_ids = [key.id for key in keys]
+        self._check_conflicts(user, key_ids)
+        for key_id in self._user_keys.get(id(user), ()):
+            entry = self._entries.pop(key_id, None)
+            if entry is not None:
+                del self._key_ids[id(entry[1])]
+        for key in keys:
+            self._entries[key.id] = (user, key)
+            self._key_ids[id(key)] = key.id
+        self._user_keys[id(user)] = tuple(key_ids)
+
+    def _check_access_keys(self, user: User, field_name: str, keys) -> None:
+        # Invalid values are left to the validation of the field, which rejects them before the index is notified.
+        if self._users.get(id(user)) is user and isinstance(keys, list):
+            self._check_conflicts(user, [key.id for key in keys if isinstance(key, AccessKey)])
+
+    def _check_id(self, key: AccessKey, field_name: str, key_id) -> None:
+        current = self._key_ids.get(id(key))
+        if current is not None and current != key_id:
+            user = self._entries[current][0]
+            self._check_conflicts(user, [key_id if item is key else item.id for item in self._keys_of(user)])
+
+    def _access_keys_changed(self, user: User, field_name: str) -> None:
+        if self._users.get(id(user)) is user:
+            self._assign(user, self._keys_of(user))
+
+    def _id_changed(self, key: AccessKey, field_name: str) -> None:
+        key_id = self._key_ids.get(id(key))
+        if key_id is not None and key_id != key.id:
+            user = self._entries[key_id][0]
+            self._assign(user, self._keys_of(user))
+
+    def add_user(self, user: User) -> None:
+        """
+        Adds a user and its access keys to the index.
+
+        :param user: The user to add.
+        :type user: User
+        """
+        self.extend([user])
+
+    def extend(self, users: Iterable[User]) -> None:
+        """
+        Adds users and their access keys to the index in bulk. The index is left unchanged if an access key ID is
+        found more than once.
+
+        :param users: The users to add.
+        :type users: Iterable[User]
+        """
+        users = list(users)
+        existing = self._entries
+        entries = {}
+        user_keys = {}
+        for user in users:
+            _validate_type(user, User, 'user should be of User type.')
+            if id(user) in self._users or id(user) in user_keys:
+                raise ValueError(f'user {user.arn} is already indexed.')
+            keys = self._keys_of(user)
+            for key in keys:
+                key_id = key.id
+                if key_id in entries or key_id in existing:
+                    raise ValueError(f'access key {key_id} belongs to more than one user.')
+                entries[key_id] = (user, key)
+            user_keys[id(user)] = tuple(key.id for key in keys)
+        for user in users:
+            _track_lists(user)
+            self._users[id(user)] = user
+        self._user_keys.update(user_keys)
+        existing.update(entries)
+        self._key_ids.update((id(key), key_id) for key_id, (user, key) in entries.items())
+
+    def get_access_key(self, key_id: str) -> Optional[AccessKey]:
+        """
+        Returns the access key with the given ID.
+
+        :param key_id: The access key ID.
+        :type key_id: str
+        :return: The access key, or None if the ID is not indexed.
+        :rtype: AccessKey
+        """
+        entry = self._entries.get(key_id)
+        return entry[1] if entry is not None else None
+
+    def get_account(self, key_id: str):
+        """
+        Returns the account of the user owning the access key with the given ID.
+
+        :param key_id: The access key ID.
+        :type key_id: str
+        :return: The account, or None if the ID is not indexed.
+        :rtype: Account
+        """
+        entry = self._entries.get(key_id)
+        return entry[0].account if entry is not None else None
+
+    def get_user(self, key_id: str) -> Optional[User]:
+        """
+        Returns the user owning the access key with the given ID.
+
+        :param key_id: The access key ID.
+        :type key_id: str
+        :return: The user, or None if the ID is not indexed.
+        :rtype: User
+        """
+        entry = self._entries.get(key_id)
+        return entry[0] if entry is not None else None
+
+    def remove_user(self, user: User) -> None:
+        """
+        Removes a user and its access keys from the index.
+
+        :param user: The user to remove.
+        :type user: User
+        """
+        if self._users.get(id(user)) is not user:
+            raise KeyError(user.arn)
+        self._assign(user, [])
+        del self._users[id(user)]
+        del self._user_keys[id(user)]
+
+    @property
+    def user_count(self) -> int:
+        """
+        Returns the number of indexed users.
+
+        :return: The number of indexed users.
+        :rtype: int
+        """
+        return len(self._users)
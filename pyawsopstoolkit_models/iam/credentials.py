@@ -0,0 +1,164 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__time__ import _NOT_SET, _cutoff, _timestamp
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+
+ACCESS_KEY_UNUSED = 'access_key_unused'
+ACCESS_KEY_NEVER_USED = 'access_key_never_used'
+PASSWORD_UNUSED = 'password_unused'
+PASSWORD_NEVER_USED = 'password_never_used'
+
+
+@dataclass
+class StaleCredential:
+    """
+    A class representing an access key or console password of an IAM user that has not been used for longer than the
+    allowed number of days.
+    """
+
+    user: User
+    reason: str
+    access_key: Optional[AccessKey] = None
+    last_used_date: Optional[datetime] = None
+
+
+class CredentialTable:
+    """
+    A class representing a column-oriented view of the access keys and console passwords of a collection of IAM users.
+    Dates are stored as POSIX timestamps in compact arrays, with NaN for missing dates and naive datetimes treated as
+    UTC, so that staleness checks compare numbers in a single scan of the columns instead of doing datetime
+    arithmetic per object.
+    """
+
+    def __init__(self, users: Optional[Iterable[User]] = None) -> None:
+        """
+        Initializes a new CredentialTable object, optionally populated with the given users.
+
+        :param users: The users to add to the table.
+        :type users: Iterable[User]
+        """
+        self.users: list[User] = []
+        self.login_profile = bytearray()
+        self.login_profile_created = array('d')
+        self.password_last_used = array('d')
+        self.access_keys: list[AccessKey] = []
+        self.key_user = array('l')
+        self.key_active = bytearray()
+        self.key_created = array('d')
+        self.key_last_used = array('d')
+        if users is not None:
+            self.extend(users)
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def append(self, user: User) -> None:
+        """
+        Adds the access keys and console password of a user to the table.
+
+        :param user: The user to add.
+        :type user: User
+        """
+        _validate_type(user, User, 'user should be of User type.')
+        row = len(self.users)
+        self.users.append(user)
+        login_profile = user.login_profile
+        self.login_profile.append(login_profile is not None)
+        self.login_profile_created.append(_timestamp(login_profile.created_date) if login_profile else _NOT_SET)
+        self.password_last_used.append(_timestamp(user.password_last_used_date))
+        keys = user.access_keys or []
+        if len(keys) == 0:
+            return
+        self.access_keys.extend(keys)
+        self.key_user.extend([row] * len(keys))
+        self.key_active.extend(key.status == 'Active' for key in keys)
+        self.key_created.extend(_timestamp(key.created_date) for key in keys)
+        self.key_last_used.extend(_timestamp(key.last_used_date) for key in keys)
+
+    def extend(self, users: Iterable[User]) -> None:
+        """
+        Adds the access keys and console passwords of every given user to the table.
+
+        :param users: The users to add.
+        :type users: Iterable[User]
+        """
+        for user in users:
+            self.append(user)
+
+    def find_stale(self, days: int = 90, now: Optional[datetime] = None) -> list[StaleCredential]:
+        """
+        Returns the credentials that have not been used for more than the given number of days: active access keys
+        last used before the cutoff, active access keys never used and created before the cutoff (or at an unknown
+        date), and console passwords of users with a login profile last used before the cutoff, or never used and
+        created before the cutoff (or at an unknown date).
+
+        :param days: The number of days after which an unused credential is stale.
+        :type days: int
+        :param now: The reference time, the current time if not set.
+        :type now: datetime
+        :return: The list of stale credentials, ordered by user, access keys first.
+        :rtype: list
+        """
+        cutoff = _cutoff(days, now)
+
+        findings = []
+        keys = self.access_keys
+        key_user = self.key_user
+        key_created = self.key_created
+        for position, (active, last_used) in enumerate(zip(self.key_active, self.key_last_used)):
+            if not active:
+                continue
+            if last_used < cutoff:
+                reason = ACCESS_KEY_UNUSED
+            elif last_used != last_used and not key_created[position] >= cutoff:
+                reason = ACCESS_KEY_NEVER_USED
+            else:
+                continue
+            key = keys[position]
+            findings.append((key_user[position], StaleCredential(
+                user=self.users[key_user[position]], reason=reason, access_key=key, last_used_date=key.last_used_date
+            )))
+
+        created = self.login_profile_created
+        for row, (has_profile, last_used) in enumerate(zip(self.login_profile, self.password_last_used)):
+            if not has_profile:
+                continue
+            if last_used < cutoff:
+                reason = PASSWORD_UNUSED
+            elif last_used != last_used and not created[row] >= cutoff:
+                reason = PASSWORD_NEVER_USED
+            else:
+                continue
+            user = self.users[row]
+            findings.append((row, StaleCredential(
+                user=user, reason=reason, last_used_date=user.password_last_used_date
+            )))
+
+        findings.sort(key=lambda finding: finding[0])
+        return [finding for row, finding in findings]
+
+
+def find_stale_credentials(
+        users: Union[CredentialTable, Iterable[User]],
+        days: int = 90,
+        now: Optional[datetime] = None
+) -> list[StaleCredential]:
+    """
+    Returns the access keys and console passwords that have not been used for more than the given number of days.
+
+    :param users: A credential table, or the users to add to one.
+    :type users: CredentialTable | Iterable[User]
+    :param days: The number of days after which an unused credential is stale.
+    :type days: int
+    :param now: The reference time, the current time if not set.
+    :type now: datetime
+    :return: The list of stale credentials.
+    :rtype: list
+    """
+    if not isinstance(users, CredentialTable):
+        users = CredentialTable(users)
+    return users.find_stale(days, now)
@@ -1,12 +1,19 @@
-from dataclasses import dataclass
+import weakref
+from dataclasses import FrozenInstanceError, dataclass
 
+from pyawsopstoolkit_models.__tracking__ import (
+    _cache_dict, _cached_dict, _changed, _check, _derived, _dict_cached, _fingerprint, _notify
+)
 from pyawsopstoolkit_models.__validation__ import _validate_type
 
+# Interned permissions boundaries by type and ARN, released once no principal references them
+_INTERNED = weakref.WeakValueDictionary()
+
 
 @dataclass
 class PermissionsBoundary:
     """
-    A class representing an IAM permissions boundary.
+    A class representing an IAM permissions boundary. Interned objects are shared between principals and read-only.
     """
 
     type: str
@@ -26,9 +33,66 @@ class PermissionsBoundary:
             arn(field_value, True)
 
     def __setattr__(self, key, value):
+        if key in self.__dataclass_fields__ and self._interned():
+            raise FrozenInstanceError(f'cannot assign to field {key!r} of an interned PermissionsBoundary.')
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def _interned(self) -> bool:
+        values = self.__dict__
+        return 'type' in values and 'arn' in values and _INTERNED.get((values['type'], values['arn'])) is self
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enable or disable the serialization cache of the PermissionsBoundary object. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'PermissionsBoundary':
+        """
+        Create a PermissionsBoundary object from the PermissionsBoundary of an IAM GetRole or GetUser response.
+
+        :param data: The PermissionsBoundary of the response.
+        :type data: dict
+        :return: The PermissionsBoundary object.
+        :rtype: PermissionsBoundary
+        """
+        return cls(
+            type=data['PermissionsBoundaryType'],
+            arn=data['PermissionsBoundaryArn']
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Return the content fingerprint of the PermissionsBoundary object, cached until the PermissionsBoundary object is
+        modified.
+
+        :return: Content fingerprint of the PermissionsBoundary object.
+        :rtype: str
+        """
+        return _fingerprint(self)
+
+    @property
+    def parsed_arn(self):
+        """
+        Return the parsed ARN of the PermissionsBoundary object, cached until arn is reassigned.
+
+        :return: The parsed ARN of the PermissionsBoundary object.
+        :rtype: ARN
+        """
+        from pyawsopstoolkit_models.arn import parse_arn
+
+        return _derived(self, 'arn', parse_arn)
 
     def to_dict(self) -> dict:
         """
@@ -37,7 +101,31 @@ class PermissionsBoundary:
         :return: Dictionary representation of the PermissionsBoundary object.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "type": self.type,
             "arn": self.arn
         }
+
+
+def intern_permissions_boundary(permissions_boundary: PermissionsBoundary) -> PermissionsBoundary:
+    """
+    Return the shared PermissionsBoundary object equal to the given one, registering a copy of the given one if there
+    is none, so that the given object stays writable. Interned objects are shared between principals, so they are
+    read-only: assigning one of their fields raises FrozenInstanceError, and principals are changed by assigning another
+    PermissionsBoundary object. Copies of an interned object are not interned.
+
+    :param permissions_boundary: The PermissionsBoundary object.
+    :type permissions_boundary: PermissionsBoundary
+    :return: The interned PermissionsBoundary object.
+    :rtype: PermissionsBoundary
+    """
+    _validate_type(
+        permissions_boundary, PermissionsBoundary, 'permissions_boundary should be of PermissionsBoundary type.'
+    )
+    key = (permissions_boundary.type, permissions_boundary.arn)
+    interned = _INTERNED.get(key)
+    if interned is None:
+        _INTERNED[key] = interned = PermissionsBoundary(*key)
+    return interned
@@ -0,0 +1,217 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__tracking__ import _listen
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary, intern_permissions_boundary
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+Principal = Union[User, Role]
+
+
+@dataclass
+class BoundaryCoverage:
+    """
+    A class representing the permissions boundary coverage of the IAM users and roles of an account.
+    """
+
+    account: str
+    principal_count: int = 0
+    bounded_count: int = 0
+    boundaries: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def ratio(self) -> float:
+        """
+        Returns the share of principals with a permissions boundary.
+
+        :return: The share of bounded principals, between 0 and 1.
+        :rtype: float
+        """
+        return self.bounded_count / self.principal_count if self.principal_count > 0 else 0.0
+
+    @property
+    def unbounded_count(self) -> int:
+        """
+        Returns the number of principals without a permissions boundary.
+
+        :return: The number of unbounded principals.
+        :rtype: int
+        """
+        return self.principal_count - self.bounded_count
+
+
+class PermissionsBoundaryIndex:
+    """
+    A class representing an inverted index from permissions boundary ARNs to the IAM users and roles using them, with
+    per-account counters for coverage statistics. The permissions boundaries of indexed principals are replaced with
+    read-only interned objects, and the index follows the assignment of permissions_boundary and account on indexed
+    principals.
+    """
+
+    def __init__(self, principals: Optional[Iterable[Principal]] = None) -> None:
+        """
+        Initializes a new PermissionsBoundaryIndex object, optionally populated with the given users and roles.
+
+        :param principals: The users and roles to add to the index.
+        :type principals: Iterable[User | Role]
+        """
+        self._principals: dict[int, Principal] = {}
+        self._entries: dict[int, tuple[str, Optional[str]]] = {}
+        self._by_arn: dict[Optional[str], dict[int, Principal]] = {}
+        self._unbounded: dict[Optional[str], dict[int, Principal]] = {}
+        self._counts: dict[str, dict[Optional[str], int]] = {}
+        for cls in (User, Role):
+            _listen(cls, 'permissions_boundary', self._principal_changed)
+            _listen(cls, 'account', self._principal_changed)
+        if principals is not None:
+            self.extend(principals)
+
+    def __contains__(self, principal: object) -> bool:
+        return self._principals.get(id(principal)) is principal
+
+    def __len__(self) -> int:
+        return len(self._principals)
+
+    def _remove(self, key: int) -> None:
+        account, arn = self._entries.pop(key)
+        group = self._by_arn[arn]
+        del group[key]
+        if len(group) == 0:
+            del self._by_arn[arn]
+        if arn is None:
+            group = self._unbounded[account]
+            del group[key]
+            if len(group) == 0:
+                del self._unbounded[account]
+        counts = self._counts[account]
+        counts[arn] -= 1
+        if counts[arn] == 0:
+            del counts[arn]
+            if len(counts) == 0:
+                del self._counts[account]
+
+    def _add(self, key: int, principal: Principal) -> None:
+        # Invalid values are indexed as missing until the validation of the assignment raises.
+        boundary = principal.permissions_boundary
+        if not isinstance(boundary, PermissionsBoundary):
+            boundary = None
+        arn = boundary.arn if boundary is not None else None
+        account = getattr(principal.account, 'number', None)
+        self._entries[key] = (account, arn)
+        self._by_arn.setdefault(arn, {})[key] = principal
+        if arn is None:
+            self._unbounded.setdefault(account, {})[key] = principal
+        counts = self._counts.setdefault(account, {})
+        counts[arn] = counts.get(arn, 0) + 1
+
+    @staticmethod
+    def _intern(principal: Principal) -> bool:
+        boundary = principal.permissions_boundary
+        if isinstance(boundary, PermissionsBoundary):
+            interned = intern_permissions_boundary(boundary)
+            if interned is not boundary:
+                principal.permissions_boundary = interned
+                return True
+        return False
+
+    def _principal_changed(self, principal: Principal, field_name: str) -> None:
+        key = id(principal)
+        if self._principals.get(key) is not principal:
+            return
+        if field_name == 'permissions_boundary' and self._intern(principal):
+            # The assignment of the interned object has updated the index.
+            return
+        self._remove(key)
+        self._add(key, principal)
+
+    def add_principal(self, principal: Principal) -> None:
+        """
+        Adds a user or role to the index.
+
+        :param principal: The user or role to add.
+        :type principal: User | Role
+        """
+        _validate_type(principal, Union[User, Role], 'principal should be of User or Role type.')
+        key = id(principal)
+        if key in self._principals:
+            raise ValueError(f'principal {principal.arn} is already indexed.')
+        self._intern(principal)
+        self._principals[key] = principal
+        self._add(key, principal)
+
+    def extend(self, principals: Iterable[Principal]) -> None:
+        """
+        Adds users and roles to the index.
+
+        :param principals: The users and roles to add.
+        :type principals: Iterable[User | Role]
+        """
+        for principal in principals:
+            self.add_principal(principal)
+
+    def remove_principal(self, principal: Principal) -> None:
+        """
+        Removes a user or role from the index.
+
+        :param principal: The user or role to remove.
+        :type principal: User | Role
+        """
+        if principal not in self:
+            raise KeyError(getattr(principal, 'arn', principal))
+        key = id(principal)
+        self._remove(key)
+        del self._principals[key]
+
+    def boundary_arns(self) -> list[str]:
+        """
+        Returns the ARNs of the permissions boundaries used by indexed principals.
+
+        :return: The permissions boundary ARNs.
+        :rtype: list
+        """
+        return [arn for arn in self._by_arn if arn is not None]
+
+    def get_principals(self, arn: str) -> list[Principal]:
+        """
+        Returns the users and roles using the permissions boundary with the given ARN.
+
+        :param arn: The permissions boundary ARN.
+        :type arn: str
+        :return: The users and roles, in index order.
+        :rtype: list
+        """
+        return list(self._by_arn.get(arn, {}).values())
+
+    def get_unbounded(self, account: Optional[str] = None) -> list[Principal]:
+        """
+        Returns the users and roles without a permissions boundary, optionally limited to an account.
+
+        :param account: The account number.
+        :type account: str
+        :return: The users and roles, in index order.
+        :rtype: list
+        """
+        if account is None:
+            return list(self._by_arn.get(None, {}).values())
+        return list(self._unbounded.get(account, {}).values())
+
+    def coverage(self) -> dict[str, BoundaryCoverage]:
+        """
+        Returns the permissions boundary coverage per account number, computed from counters maintained by the index.
+
+        :return: The coverage statistics keyed by account number.
+        :rtype: dict
+        """
+        result = {}
+        for account, counts in self._counts.items():
+            boundaries = {arn: count for arn, count in counts.items() if arn is not None}
+            bounded = sum(boundaries.values())
+            result[account] = BoundaryCoverage(
+                account=account,
+                principal_count=bounded + counts.get(None, 0),
+                bounded_count=bounded,
+                boundaries=boundaries
+            )
+        return result
@@ -2,6 +2,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Union
 
+from pyawsopstoolkit_models.__identity__ import _identity, _new, _register
+from pyawsopstoolkit_models.__interning__ import _shared, _thaw
+from pyawsopstoolkit_models.__loading__ import _available, _lazy_fields, _load, _model_loader, _policy_document
+from pyawsopstoolkit_models.__tracking__ import (
+    _cache_dict, _cached_dict, _changed, _check, _derived, _dict_cached, _fingerprint, _notify
+)
 from pyawsopstoolkit_models.__validation__ import _validate_type
 from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
 
@@ -30,9 +36,47 @@ class LastUsed:
                 region(field_value, True)
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enables or disables the serialization cache of the LastUsed instance. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'LastUsed':
+        """
+        Creates a LastUsed instance from the RoleLastUsed of an IAM GetRole response.
+
+        :param data: The RoleLastUsed of the response.
+        :type data: dict
+        :return: The LastUsed instance.
+        :rtype: LastUsed
+        """
+        return cls(
+            used_date=data.get('LastUsedDate'),
+            region=_available(data.get('Region'))
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Returns the content fingerprint of the LastUsed instance, cached until the LastUsed instance is modified.
+
+        :return: Content fingerprint of the LastUsed instance.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -41,6 +85,8 @@ class LastUsed:
         :return: Dictionary representation of the LastUsed instance.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "used_date": self.used_date.isoformat() if self.used_date is not None else None,
             "region": self.region
@@ -50,7 +96,9 @@ class LastUsed:
 @dataclass
 class Role:
     """
-    A class representing an IAM role.
+    A class representing an IAM role. Equal tag lists and assume role policy documents are stored once as shared,
+    read-only copies: modifying them in place raises TypeError, so a new value is assigned instead, and to_dict()
+    returns plain copies.
     """
     from pyawsopstoolkit.account import Account
 
@@ -67,9 +115,13 @@ class Role:
     last_used: Optional[LastUsed] = None
     tags: Optional[list] = None
 
+    def __new__(cls, *args, **kwargs):
+        return _new(cls, args, kwargs)
+
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
             self.__validate__(field_name)
+        _register(self)
 
     def __validate__(self, field_name):
         from pyawsopstoolkit.account import Account
@@ -101,9 +153,123 @@ class Role:
             _validate_type(field_value, Union[str, None], f'{field_name} should be a string.')
 
     def __setattr__(self, key, value):
+        if key in ('assume_role_policy_document', 'tags'):
+            value = _shared(value)
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enable or disable the serialization cache of the Role object. While enabled, to_dict() returns a read-only
+        dict that only rebuilds the fields assigned since the previous call; the permissions boundary and last used
+        information cache their own dicts.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, account: Account, data: dict, lazy: bool = False) -> 'Role':
+        """
+        Create a Role object from the Role of an IAM GetRole response, or an entry of the Roles list of an IAM
+        ListRoles response. In lazy mode, the permissions boundary and last used information are kept as raw response
+        data and converted on first access.
+
+        :param account: The account of the role.
+        :type account: Account
+        :param data: The Role of the response.
+        :type data: dict
+        :param lazy: Flag to convert the nested objects on first access.
+        :type lazy: bool
+        :return: The Role object.
+        :rtype: Role
+        """
+        return _load(
+            cls,
+            {
+                'account': account,
+                'name': data['RoleName'],
+                'id': data['RoleId'],
+                'arn': data['Arn'],
+                'max_session_duration': data.get('MaxSessionDuration', 3600),
+                'path': data.get('Path', '/'),
+                'created_date': data.get('CreateDate'),
+                'assume_role_policy_document': _policy_document(data.get('AssumeRolePolicyDocument')),
+                'description': data.get('Description'),
+                'tags': data.get('Tags') or None
+            },
+            {
+                'permissions_boundary': data.get('PermissionsBoundary'),
+                'last_used': data.get('RoleLastUsed')
+            },
+            lazy
+        )
+
+    def get_tag(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Return the value of a tag of the Role object.
+
+        :param key: The tag key.
+        :type key: str
+        :param default: The value to return if the tag is missing.
+        :type default: str
+        :return: The tag value, or the default value if the tag is missing.
+        :rtype: str
+        """
+        return self.tag_map.get(key, default)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Return the content fingerprint of the Role object. The fingerprint is computed from the fingerprints of
+        its children, ignores the order of list items, and is cached until the Role object or one of its
+        children is modified.
+
+        :return: Content fingerprint of the Role object.
+        :rtype: str
+        """
+        return _fingerprint(self)
+
+    @property
+    def parsed_arn(self):
+        """
+        Return the parsed ARN of the Role object, cached until arn is reassigned.
+
+        :return: The parsed ARN of the Role object.
+        :rtype: ARN
+        """
+        from pyawsopstoolkit_models.arn import parse_arn
+
+        return _derived(self, 'arn', parse_arn)
+
+    @property
+    def tag_map(self):
+        """
+        Return the read-only mapping of tag keys to values of the Role object, cached until tags is changed.
+
+        :return: The tag values keyed by tag key.
+        :rtype: MappingProxyType
+        """
+        from pyawsopstoolkit_models.tags import tag_map
+
+        return _derived(self, 'tags', tag_map)
+
+    @property
+    def trust_policy(self):
+        """
+        Return the parsed trust policy of the Role object, cached until assume_role_policy_document is reassigned.
+
+        :return: The parsed trust policy of the Role object.
+        :rtype: TrustPolicy
+        """
+        from pyawsopstoolkit_models.iam.trust_policy import parse_trust_policy
+
+        return _derived(self, 'assume_role_policy_document', parse_trust_policy)
 
     def to_dict(self) -> dict:
         """
@@ -112,6 +278,8 @@ class Role:
         :return: Dictionary representation of the Role object.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "account": self.account.to_dict(),
             "path": self.path,
@@ -119,12 +287,20 @@ class Role:
             "id": self.id,
             "arn": self.arn,
             "created_date": self.created_date.isoformat() if self.created_date is not None else None,
-            "assume_role_policy_document": self.assume_role_policy_document,
+            "assume_role_policy_document": _thaw(self.assume_role_policy_document),
             "description": self.description,
             "max_session_duration": self.max_session_duration,
             "permissions_boundary": (
                 self.permissions_boundary.to_dict() if self.permissions_boundary is not None else None
             ),
             "last_used": self.last_used.to_dict() if self.last_used is not None else None,
-            "tags": self.tags
+            "tags": _thaw(self.tags)
         }
+
+
+_lazy_fields(
+    Role,
+    permissions_boundary=_model_loader(PermissionsBoundary),
+    last_used=_model_loader(LastUsed)
+)
+_identity(Role, lambda values: values['arn'])
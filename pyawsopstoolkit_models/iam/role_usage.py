@@ -0,0 +1,194 @@
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__time__ import _cutoff, _timestamp
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.role import Role
+
+GROUP_FIELDS: tuple[str, ...] = ('account', 'region', 'path')
+
+
+@dataclass
+class RoleUsageSummary:
+    """
+    A class representing the usage of a group of IAM roles, based on their last used information.
+    """
+
+    role_count: int = 0
+    never_used: int = 0
+    unused: int = 0
+    regions: tuple[str, ...] = ()
+
+    @property
+    def single_region(self) -> bool:
+        """
+        Indicates whether every used role of the group was last used from the same region.
+
+        :return: True if the used roles were last used from exactly one region, False otherwise.
+        :rtype: bool
+        """
+        return len(self.regions) == 1
+
+
+class RoleUsageTable:
+    """
+    A class representing a column-oriented view of the last used information of a collection of IAM roles. Accounts,
+    regions and paths are encoded as integer codes and last used dates as POSIX timestamps (NaN if never used, naive
+    datetimes treated as UTC), so that aggregations scan the columns once and only count per group.
+    """
+
+    def __init__(self, roles: Optional[Iterable[Role]] = None) -> None:
+        """
+        Initializes a new RoleUsageTable object, optionally populated with the given roles.
+
+        :param roles: The roles to add to the table.
+        :type roles: Iterable[Role]
+        """
+        self.roles: list[Role] = []
+        self.values: dict[str, list] = {name: [] for name in GROUP_FIELDS}
+        self._codes: dict[str, dict] = {name: {} for name in GROUP_FIELDS}
+        self.account = array('l')
+        self.region = array('l')
+        self.path = array('l')
+        self.used_date = array('d')
+        if roles is not None:
+            self.extend(roles)
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def _code(self, name: str, value) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.values[name].append(value)
+        return code
+
+    def append(self, role: Role) -> None:
+        """
+        Adds the last used information of a role to the table.
+
+        :param role: The role to add.
+        :type role: Role
+        """
+        _validate_type(role, Role, 'role should be of Role type.')
+        last_used = role.last_used
+        self.roles.append(role)
+        self.account.append(self._code('account', role.account.number))
+        self.region.append(self._code('region', last_used.region if last_used is not None else None))
+        self.path.append(self._code('path', role.path))
+        self.used_date.append(_timestamp(last_used.used_date if last_used is not None else None))
+
+    def extend(self, roles: Iterable[Role]) -> None:
+        """
+        Adds the last used information of every given role to the table.
+
+        :param roles: The roles to add.
+        :type roles: Iterable[Role]
+        """
+        for role in roles:
+            self.append(role)
+
+    def find_never_used(self) -> list[Role]:
+        """
+        Returns the roles that have never been used.
+
+        :return: The list of roles, in table order.
+        :rtype: list
+        """
+        return [self.roles[row] for row, used in enumerate(self.used_date) if used != used]
+
+    def find_unused(self, days: int = 90, now: Optional[datetime] = None) -> list[Role]:
+        """
+        Returns the roles that were last used more than the given number of days ago. Roles that have never been used
+        are not included.
+
+        :param days: The number of days after which a role is unused.
+        :type days: int
+        :param now: The reference time, the current time if not set.
+        :type now: datetime
+        :return: The list of roles, in table order.
+        :rtype: list
+        """
+        cutoff = _cutoff(days, now)
+        return [self.roles[row] for row, used in enumerate(self.used_date) if used < cutoff]
+
+    def summarize(
+            self,
+            group_by: Iterable[str] = ('account',),
+            days: int = 90,
+            now: Optional[datetime] = None
+    ) -> dict[tuple, RoleUsageSummary]:
+        """
+        Returns the usage of the roles grouped by any combination of account (number), region (last used region,
+        None if never used) and path, computed in a single scan of the columns.
+
+        :param group_by: The fields to group by, among account, region and path. No field summarizes all roles.
+        :type group_by: Iterable[str]
+        :param days: The number of days after which a role is unused.
+        :type days: int
+        :param now: The reference time, the current time if not set.
+        :type now: datetime
+        :return: The summaries keyed by the tuple of group values, in order of first appearance.
+        :rtype: dict
+        """
+        group_by = tuple(group_by)
+        for name in group_by:
+            if name not in GROUP_FIELDS:
+                raise ValueError(f'group_by should only contain {", ".join(GROUP_FIELDS)}.')
+        cutoff = _cutoff(days, now)
+        columns = [getattr(self, name) for name in group_by]
+        region = self.region
+
+        counts: dict[tuple, list] = {}
+        for row, used in enumerate(self.used_date):
+            key = tuple(column[row] for column in columns)
+            group = counts.get(key)
+            if group is None:
+                group = counts[key] = [0, 0, 0, set()]
+            group[0] += 1
+            if used != used:
+                group[1] += 1
+            else:
+                if used < cutoff:
+                    group[2] += 1
+                group[3].add(region[row])
+
+        values = [self.values[name] for name in group_by]
+        regions = self.values['region']
+        return {
+            tuple(names[code] for names, code in zip(values, key)): RoleUsageSummary(
+                role_count=role_count,
+                never_used=never_used,
+                unused=unused,
+                regions=tuple(sorted(regions[code] for code in region_codes if regions[code] is not None))
+            ) for key, (role_count, never_used, unused, region_codes) in counts.items()
+        }
+
+
+def summarize_role_usage(
+        roles: Union[RoleUsageTable, Iterable[Role]],
+        group_by: Iterable[str] = ('account',),
+        days: int = 90,
+        now: Optional[datetime] = None
+) -> dict[tuple, RoleUsageSummary]:
+    """
+    Returns the usage of the roles grouped by any combination of account, region and path.
+
+    :param roles: A role usage table, or the roles to add to one.
+    :type roles: RoleUsageTable | Iterable[Role]
+    :param group_by: The fields to group by, among account, region and path.
+    :type group_by: Iterable[str]
+    :param days: The number of days after which a role is unused.
+    :type days: int
+    :param now: The reference time, the current time if not set.
+    :type now: datetime
+    :return: The summaries keyed by the tuple of group values.
+    :rtype: dict
+    """
+    if not isinstance(roles, RoleUsageTable):
+        roles = RoleUsageTable(roles)
+    return roles.summarize(group_by, days, now)
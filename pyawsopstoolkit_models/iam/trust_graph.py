@@ -0,0 +1,265 @@
+from array import array
+from collections import deque
+from itertools import accumulate
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.trust_policy import ACCOUNT, AWS, WILDCARD, TrustPrincipal, _principal
+
+_WILDCARD = TrustPrincipal(WILDCARD, WILDCARD)
+
+
+def _csr(node_count: int, sources: array, targets: array) -> tuple[array, array]:
+    """
+    Returns the compressed sparse row representation of a list of edges: the adjacency of node n is stored in
+    targets[offsets[n]:offsets[n + 1]].
+
+    :param node_count: The number of nodes.
+    :type node_count: int
+    :param sources: The source node of each edge.
+    :type sources: array
+    :param targets: The target node of each edge.
+    :type targets: array
+    :return: The offsets and adjacency arrays.
+    :rtype: tuple
+    """
+    counts = [0] * (node_count + 1)
+    for source in sources:
+        counts[source + 1] += 1
+    offsets = array('l', accumulate(counts))
+    adjacency = array('l', bytes(len(targets) * offsets.itemsize))
+    position = list(offsets[:-1])
+    for source, target in zip(sources, targets):
+        adjacency[position[source]] = target
+        position[source] += 1
+    return offsets, adjacency
+
+
+class TrustGraph:
+    """
+    A class representing the graph of who can assume which IAM role, built from the trust policies of a collection of
+    roles. Nodes are trust principals, with each role represented by the AWS principal of its ARN, and an edge goes
+    from a principal to every role trusting it. Principals given as an ARN are also linked to the node of their
+    account, as trusting an account delegates to all of its principals, which makes multi-hop chains through roles of
+    trusted accounts visible. The edges are stored as compressed sparse row arrays in both directions.
+    """
+
+    def __init__(self, roles: Iterable[Role]) -> None:
+        """
+        Initializes a new TrustGraph object from the given roles.
+
+        :param roles: The roles of the graph.
+        :type roles: Iterable[Role]
+        """
+        self._index: dict[TrustPrincipal, int] = {}
+        self._nodes: list[TrustPrincipal] = []
+        self._roles: list[Optional[Role]] = []
+        sources = array('l')
+        targets = array('l')
+
+        for role in roles:
+            _validate_type(role, Role, 'roles should be a list of Role type.')
+            node = self._node(TrustPrincipal(AWS, role.arn))
+            if self._roles[node] is not None:
+                raise ValueError(f'roles contains more than one role for {role.arn}.')
+            self._roles[node] = role
+            for principal in role.trust_policy.trusted_principals:
+                sources.append(self._node(principal))
+                targets.append(node)
+        for node, principal in enumerate(list(self._nodes)):
+            if principal.type == AWS:
+                account = self._index.get(TrustPrincipal(ACCOUNT, principal.account or ''))
+                if account is not None:
+                    sources.append(node)
+                    targets.append(account)
+
+        self._offsets, self._successors = _csr(len(self._nodes), sources, targets)
+        self._reverse_offsets, self._predecessors = _csr(len(self._nodes), targets, sources)
+
+    def __contains__(self, principal: object) -> bool:
+        return isinstance(principal, (TrustPrincipal, str)) and self._find(principal) is not None
+
+    def _node(self, principal: TrustPrincipal) -> int:
+        node = self._index.get(principal)
+        if node is None:
+            node = self._index[principal] = len(self._nodes)
+            self._nodes.append(principal)
+            self._roles.append(None)
+        return node
+
+    def _find(self, principal: Union[TrustPrincipal, str]) -> Optional[int]:
+        if isinstance(principal, str):
+            principal = _principal(AWS, principal)
+        return self._index.get(principal)
+
+    def _lookup(self, principal: Union[TrustPrincipal, str]) -> int:
+        node = self._find(principal)
+        if node is None:
+            raise KeyError(principal)
+        return node
+
+    def _search(self, sources: list[int], reverse: bool = False, target: Optional[int] = None) -> array:
+        if reverse:
+            offsets, adjacency = self._reverse_offsets, self._predecessors
+        else:
+            offsets, adjacency = self._offsets, self._successors
+        parents = array('l', [-1]) * len(self._nodes)
+        queue = deque()
+        for source in sources:
+            if parents[source] == -1:
+                parents[source] = source
+                queue.append(source)
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for neighbour in adjacency[offsets[node]:offsets[node + 1]]:
+                if parents[neighbour] == -1:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+        return parents
+
+    def _sources(self, principal: Union[TrustPrincipal, str], include_wildcard: bool) -> list[int]:
+        if isinstance(principal, str):
+            principal = _principal(AWS, principal)
+        node = self._index.get(principal)
+        if node is None and principal.type == AWS:
+            # A principal trusted by no role can still use the trust granted to its account.
+            node = self._index.get(TrustPrincipal(ACCOUNT, principal.account or ''))
+        if node is None:
+            raise KeyError(principal)
+        sources = [node]
+        wildcard = self._index.get(_WILDCARD)
+        if include_wildcard and wildcard is not None:
+            sources.append(wildcard)
+        return sources
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Returns the number of edges in the graph.
+
+        :return: The number of edges.
+        :rtype: int
+        """
+        return len(self._successors)
+
+    @property
+    def node_count(self) -> int:
+        """
+        Returns the number of nodes in the graph.
+
+        :return: The number of nodes.
+        :rtype: int
+        """
+        return len(self._nodes)
+
+    def get_role(self, principal: Union[TrustPrincipal, str]) -> Optional[Role]:
+        """
+        Returns the role of a node.
+
+        :param principal: The principal of the node, or a role ARN.
+        :type principal: TrustPrincipal | str
+        :return: The role, or None if the node is not a role of the graph.
+        :rtype: Role
+        """
+        node = self._find(principal)
+        return self._roles[node] if node is not None else None
+
+    def nodes(self) -> list[TrustPrincipal]:
+        """
+        Returns the principals of all nodes.
+
+        :return: The principals of the nodes.
+        :rtype: list
+        """
+        return list(self._nodes)
+
+    def predecessors(self, principal: Union[TrustPrincipal, str]) -> list[TrustPrincipal]:
+        """
+        Returns the principals directly trusted by a role, or linked to an account node.
+
+        :param principal: The principal of the node, an account ID or an ARN.
+        :type principal: TrustPrincipal | str
+        :return: The principals of the predecessor nodes.
+        :rtype: list
+        """
+        node = self._lookup(principal)
+        start, end = self._reverse_offsets[node], self._reverse_offsets[node + 1]
+        return [self._nodes[item] for item in self._predecessors[start:end]]
+
+    def successors(self, principal: Union[TrustPrincipal, str]) -> list[TrustPrincipal]:
+        """
+        Returns the roles that a principal can assume directly, and its account node.
+
+        :param principal: The principal of the node, an account ID or an ARN.
+        :type principal: TrustPrincipal | str
+        :return: The principals of the successor nodes.
+        :rtype: list
+        """
+        node = self._lookup(principal)
+        return [self._nodes[item] for item in self._successors[self._offsets[node]:self._offsets[node + 1]]]
+
+    def reachable_roles(self, principal: Union[TrustPrincipal, str], include_wildcard: bool = False) -> list[Role]:
+        """
+        Returns the roles that a principal can assume, directly or through a chain of roles.
+
+        :param principal: The principal, an account ID or an ARN.
+        :type principal: TrustPrincipal | str
+        :param include_wildcard: Flag to include the roles trusting any principal (*) and the roles reachable from them.
+        :type include_wildcard: bool
+        :return: The roles, in breadth-first order.
+        :rtype: list
+        """
+        sources = self._sources(principal, include_wildcard)
+        parents = self._search(sources)
+        roles = self._roles
+        return [
+            roles[node] for node, parent in enumerate(parents)
+            if parent != -1 and roles[node] is not None and node not in sources
+        ]
+
+    def principals_reaching(self, principal: Union[TrustPrincipal, str]) -> list[TrustPrincipal]:
+        """
+        Returns the principals that can assume a role, directly or through a chain of roles.
+
+        :param principal: The principal of the role node, or the role ARN.
+        :type principal: TrustPrincipal | str
+        :return: The principals.
+        :rtype: list
+        """
+        node = self._lookup(principal)
+        parents = self._search([node], reverse=True)
+        return [self._nodes[item] for item, parent in enumerate(parents) if parent != -1 and item != node]
+
+    def shortest_chain(
+            self,
+            source: Union[TrustPrincipal, str],
+            target: Union[TrustPrincipal, str],
+            include_wildcard: bool = False
+    ) -> Optional[list[TrustPrincipal]]:
+        """
+        Returns a shortest chain of principals from a principal to a role, found by breadth-first search.
+
+        :param source: The starting principal, an account ID or an ARN.
+        :type source: TrustPrincipal | str
+        :param target: The principal of the role node, or the role ARN.
+        :type target: TrustPrincipal | str
+        :param include_wildcard: Flag to allow chains through roles trusting any principal (*).
+        :type include_wildcard: bool
+        :return: The chain of principals from the source to the target, or None if the role cannot be reached.
+        :rtype: list
+        """
+        sources = self._sources(source, include_wildcard)
+        target_node = self._lookup(target)
+        parents = self._search(sources, target=target_node)
+        if parents[target_node] == -1:
+            return None
+        chain = [target_node]
+        while parents[chain[-1]] != chain[-1]:
+            chain.append(parents[chain[-1]])
+        result = [self._nodes[node] for node in reversed(chain)]
+        if isinstance(source, str):
+            source = _principal(AWS, source)
+        return result if result[0] == source else [source] + result
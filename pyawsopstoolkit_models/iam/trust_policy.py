@@ -0,0 +1,324 @@
+import json
+import re
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Iterable, Optional
+
+from pyawsopstoolkit_models.__tracking__ import _listen
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.iam.role import Role
+
+ACCOUNT = 'Account'
+AWS = 'AWS'
+CANONICAL_USER = 'CanonicalUser'
+FEDERATED = 'Federated'
+SERVICE = 'Service'
+WILDCARD = '*'
+
+# Actions granting the right to assume a role, in lower case
+ASSUME_ROLE_ACTIONS: tuple[str, ...] = (
+    'sts:assumerole', 'sts:assumerolewithsaml', 'sts:assumerolewithwebidentity'
+)
+
+_ACCOUNT_ID = re.compile(r'^\d{12}$')
+_ROOT_ARN = re.compile(r'^arn:[^:]+:iam::(\d{12}):root$')
+
+
+@dataclass(frozen=True)
+class TrustPrincipal:
+    """
+    A class representing a principal of a role trust policy. AWS account principals, given either as an account ID or
+    as the root ARN of the account, are normalized to the Account type with the account ID as value.
+    """
+
+    type: str
+    value: str
+
+    @property
+    def account(self) -> Optional[str]:
+        """
+        Returns the account ID of an Account principal, or of an AWS principal given as an ARN.
+
+        :return: The account ID, or None for other principals.
+        :rtype: str
+        """
+        if self.type == ACCOUNT:
+            return self.value
+        if self.type == AWS and self.value.startswith('arn:'):
+            parts = self.value.split(':')
+            return parts[4] if len(parts) > 5 and parts[4] else None
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _assume_role(actions: tuple[str, ...]) -> bool:
+    return any(fnmatchcase(name, action) for action in actions for name in ASSUME_ROLE_ACTIONS)
+
+
+@dataclass(frozen=True)
+class TrustStatement:
+    """
+    A class representing a parsed statement of a role trust policy. Actions are lower case, and conditions are kept as
+    a read-only mapping.
+    """
+
+    effect: str
+    principals: tuple[TrustPrincipal, ...]
+    actions: tuple[str, ...]
+    not_principal: bool = False
+    conditions: Optional[MappingProxyType] = None
+
+    @property
+    def assume_role(self) -> bool:
+        """
+        Indicates whether the statement applies to one of the actions assuming a role.
+
+        :return: True if an action of the statement matches an assume role action, False otherwise.
+        :rtype: bool
+        """
+        return _assume_role(self.actions)
+
+
+@dataclass(frozen=True)
+class TrustPolicy:
+    """
+    A class representing a parsed role trust policy. Parsed policies are immutable and shared between roles with the
+    same trust policy document.
+    """
+
+    statements: tuple[TrustStatement, ...] = ()
+
+    @cached_property
+    def trusted_principals(self) -> frozenset[TrustPrincipal]:
+        """
+        Returns the principals allowed to assume the role: the principals of the Allow statements for an assume role
+        action, less the principals of the unconditional Deny statements, where denying an account also denies the
+        roles and users of the account. Conditions are not evaluated, so conditional Deny statements, such as
+        organization guardrails, do not remove principals, and NotPrincipal statements are ignored. The result is
+        computed once per policy.
+
+        :return: The trusted principals.
+        :rtype: frozenset
+        """
+        allowed = set()
+        denied = set()
+        for statement in self.statements:
+            if statement.not_principal or not statement.assume_role:
+                continue
+            if statement.effect == 'Allow':
+                allowed.update(statement.principals)
+            elif not statement.conditions:
+                denied.update(statement.principals)
+        if TrustPrincipal(WILDCARD, WILDCARD) in denied:
+            return frozenset()
+        accounts = {principal.value for principal in denied if principal.type == ACCOUNT}
+        return frozenset(principal for principal in allowed - denied if principal.account not in accounts)
+
+
+def _list(value) -> list:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _principal(principal_type: str, value: str) -> TrustPrincipal:
+    if value == WILDCARD:
+        return TrustPrincipal(WILDCARD, WILDCARD)
+    if principal_type == AWS:
+        if _ACCOUNT_ID.match(value):
+            return TrustPrincipal(ACCOUNT, value)
+        match = _ROOT_ARN.match(value)
+        if match is not None:
+            return TrustPrincipal(ACCOUNT, match.group(1))
+    return TrustPrincipal(principal_type, value)
+
+
+def _principals(value) -> tuple[TrustPrincipal, ...]:
+    if value == WILDCARD:
+        return TrustPrincipal(WILDCARD, WILDCARD),
+    if not isinstance(value, dict):
+        raise ValueError('Principal should be "*" or a mapping of principal types to values.')
+    return tuple(
+        _principal(principal_type, item) for principal_type, values in value.items() for item in _list(values)
+    )
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _parse(document: str) -> TrustPolicy:
+    statements = []
+    for statement in _list(json.loads(document).get('Statement')):
+        if statement.get('Effect') not in ('Allow', 'Deny'):
+            raise ValueError('Effect should be "Allow" or "Deny".')
+        not_principal = 'NotPrincipal' in statement
+        statements.append(TrustStatement(
+            effect=statement['Effect'],
+            principals=_principals(statement.get('NotPrincipal' if not_principal else 'Principal', {})),
+            actions=tuple(action.lower() for action in _list(statement.get('Action'))),
+            not_principal=not_principal,
+            conditions=_freeze(statement['Condition']) if statement.get('Condition') else None
+        ))
+    return TrustPolicy(tuple(statements))
+
+
+def parse_trust_policy(document: Optional[dict]) -> TrustPolicy:
+    """
+    Parses a role trust policy document. Identical documents return the same TrustPolicy object, as parsed policies
+    are cached by their content.
+
+    :param document: The trust policy document.
+    :type document: dict
+    :return: The parsed trust policy, without statements if the document is None.
+    :rtype: TrustPolicy
+    """
+    if document is None:
+        return TrustPolicy()
+    _validate_type(document, dict, 'document should be of dict type.')
+    return _parse(json.dumps(document, sort_keys=True, default=str))
+
+
+class TrustPolicyIndex:
+    """
+    A class representing an index from trusted principals to the IAM roles they can assume, built from the parsed
+    trust policies of the roles. The index is updated when the assume_role_policy_document of an indexed role is
+    reassigned, which is the only way to change it as documents are shared and read-only.
+    """
+
+    def __init__(self, roles: Optional[Iterable[Role]] = None) -> None:
+        """
+        Initializes a new TrustPolicyIndex object, optionally populated with the given roles.
+
+        :param roles: The roles to add to the index.
+        :type roles: Iterable[Role]
+        """
+        self._roles: dict[int, Role] = {}
+        self._entries: dict[int, frozenset[TrustPrincipal]] = {}
+        self._by_principal: dict[TrustPrincipal, dict[int, Role]] = {}
+        self._by_account: dict[str, dict[int, list]] = {}
+        _listen(Role, 'assume_role_policy_document', self._document_changed)
+        if roles is not None:
+            self.extend(roles)
+
+    def __contains__(self, role: object) -> bool:
+        return self._roles.get(id(role)) is role
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def _add(self, key: int, role: Role) -> None:
+        principals = role.trust_policy.trusted_principals
+        self._entries[key] = principals
+        for principal in principals:
+            self._by_principal.setdefault(principal, {})[key] = role
+            account = principal.account
+            if account is not None:
+                holders = self._by_account.setdefault(account, {})
+                holders.setdefault(key, [role, 0])[1] += 1
+
+    def _remove(self, key: int) -> None:
+        for principal in self._entries.pop(key):
+            group = self._by_principal[principal]
+            del group[key]
+            if len(group) == 0:
+                del self._by_principal[principal]
+            account = principal.account
+            if account is not None:
+                holders = self._by_account[account]
+                holders[key][1] -= 1
+                if holders[key][1] == 0:
+                    del holders[key]
+                    if len(holders) == 0:
+                        del self._by_account[account]
+
+    def _document_changed(self, role: Role, field_name: str) -> None:
+        key = id(role)
+        if self._roles.get(key) is role and isinstance(role.assume_role_policy_document, (dict, type(None))):
+            self._remove(key)
+            self._add(key, role)
+
+    def add_role(self, role: Role) -> None:
+        """
+        Adds a role to the index.
+
+        :param role: The role to add.
+        :type role: Role
+        """
+        _validate_type(role, Role, 'role should be of Role type.')
+        key = id(role)
+        if key in self._roles:
+            raise ValueError(f'role {role.arn} is already indexed.')
+        self._add(key, role)
+        self._roles[key] = role
+
+    def extend(self, roles: Iterable[Role]) -> None:
+        """
+        Adds roles to the index.
+
+        :param roles: The roles to add.
+        :type roles: Iterable[Role]
+        """
+        for role in roles:
+            self.add_role(role)
+
+    def remove_role(self, role: Role) -> None:
+        """
+        Removes a role from the index.
+
+        :param role: The role to remove.
+        :type role: Role
+        """
+        if role not in self:
+            raise KeyError(getattr(role, 'arn', role))
+        key = id(role)
+        self._remove(key)
+        del self._roles[key]
+
+    def get_roles(self, principal_type: str, value: str) -> list[Role]:
+        """
+        Returns the roles trusting exactly the given principal, e.g. (Service, ec2.amazonaws.com), (Federated, the ARN
+        of a SAML provider) or (AWS, a role ARN). AWS principals for a whole account are looked up with the account ID
+        or root ARN.
+
+        :param principal_type: The principal type: Account, AWS, Service, Federated, CanonicalUser or *.
+        :type principal_type: str
+        :param value: The principal value.
+        :type value: str
+        :return: The roles, in index order.
+        :rtype: list
+        """
+        return list(self._by_principal.get(_principal(principal_type, value), {}).values())
+
+    def get_roles_for_account(self, account: str, include_wildcard: bool = False) -> list[Role]:
+        """
+        Returns the roles that principals of the given account can assume: roles trusting the account, or a user or
+        role of the account, optionally with the roles trusting any principal.
+
+        :param account: The account ID.
+        :type account: str
+        :param include_wildcard: Flag to include the roles trusting any principal (*).
+        :type include_wildcard: bool
+        :return: The roles, without duplicates.
+        :rtype: list
+        """
+        roles = {key: holder[0] for key, holder in self._by_account.get(account, {}).items()}
+        if include_wildcard:
+            roles.update(self._by_principal.get(TrustPrincipal(WILDCARD, WILDCARD), {}))
+        return list(roles.values())
+
+    def principals(self) -> list[TrustPrincipal]:
+        """
+        Returns the principals trusted by at least one indexed role.
+
+        :return: The trusted principals.
+        :rtype: list
+        """
+        return list(self._by_principal)
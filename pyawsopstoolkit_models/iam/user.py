@@ -2,6 +2,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, Union
 
+from pyawsopstoolkit_models.__identity__ import _identity, _new, _register
+from pyawsopstoolkit_models.__interning__ import _shared, _thaw
+from pyawsopstoolkit_models.__loading__ import _available, _lazy_fields, _list_loader, _load, _model_loader
+from pyawsopstoolkit_models.__tracking__ import (
+    _cache_dict, _cached_dict, _changed, _check, _derived, _dict_cached, _fingerprint, _notify
+)
 from pyawsopstoolkit_models.__validation__ import _validate_type
 from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
 
@@ -38,9 +44,54 @@ class AccessKey:
                 region(field_value, True)
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enable or disable the serialization cache of the AccessKey object. While enabled, to_dict() returns a read-only
+        dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'AccessKey':
+        """
+        Create an AccessKey object from an entry of the AccessKeyMetadata list of an IAM ListAccessKeys response.
+        The entry may hold the AccessKeyLastUsed of an IAM GetAccessKeyLastUsed response, whose service and region
+        are ignored when IAM reports them as N/A.
+
+        :param data: The AccessKeyMetadata entry.
+        :type data: dict
+        :return: The AccessKey object.
+        :rtype: AccessKey
+        """
+        last_used = data.get('AccessKeyLastUsed') or {}
+        return cls(
+            id=data['AccessKeyId'],
+            status=data['Status'],
+            created_date=data.get('CreateDate'),
+            last_used_date=last_used.get('LastUsedDate'),
+            last_used_service=_available(last_used.get('ServiceName')),
+            last_used_region=_available(last_used.get('Region'))
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Return the content fingerprint of the AccessKey object, cached until the AccessKey object is modified.
+
+        :return: Content fingerprint of the AccessKey object.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -49,6 +100,8 @@ class AccessKey:
         :return: Dictionary representation of the AccessKey object.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "id": self.id,
             "status": self.status,
@@ -80,9 +133,47 @@ class LoginProfile:
             _validate_type(field_value, Union[bool, None], f'{field_name} should be a boolean.')
 
     def __setattr__(self, key, value):
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enable or disable the serialization cache of the LoginProfile object. While enabled, to_dict() returns a
+        read-only dict that is only rebuilt once a field is assigned.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, data: dict) -> 'LoginProfile':
+        """
+        Create a LoginProfile object from the LoginProfile of an IAM GetLoginProfile response.
+
+        :param data: The LoginProfile of the response.
+        :type data: dict
+        :return: The LoginProfile object.
+        :rtype: LoginProfile
+        """
+        return cls(
+            created_date=data.get('CreateDate'),
+            password_reset_required=data.get('PasswordResetRequired', False)
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Return the content fingerprint of the LoginProfile object, cached until the LoginProfile object is modified.
+
+        :return: Content fingerprint of the LoginProfile object.
+        :rtype: str
+        """
+        return _fingerprint(self)
 
     def to_dict(self) -> dict:
         """
@@ -91,6 +182,8 @@ class LoginProfile:
         :return: Dictionary representation of the LoginProfile object.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "created_date": self.created_date.isoformat() if self.created_date is not None else None,
             "password_reset_required": self.password_reset_required
@@ -100,7 +193,8 @@ class LoginProfile:
 @dataclass
 class User:
     """
-    A class representing an IAM user.
+    A class representing an IAM user. Equal tag lists are stored once as a shared, read-only copy: modifying it in place
+    raises TypeError, so a new list is assigned instead, and to_dict() returns a plain copy.
     """
     from pyawsopstoolkit.account import Account
 
@@ -116,9 +210,13 @@ class User:
     access_keys: Optional[list[AccessKey]] = None
     tags: Optional[list] = None
 
+    def __new__(cls, *args, **kwargs):
+        return _new(cls, args, kwargs)
+
     def __post_init__(self):
         for field_name, field_value in self.__dataclass_fields__.items():
             self.__validate__(field_name)
+        _register(self)
 
     def __validate__(self, field_name):
         from pyawsopstoolkit.account import Account
@@ -157,9 +255,111 @@ class User:
                 )
 
     def __setattr__(self, key, value):
+        if key == 'tags':
+            value = _shared(value)
+        _check(self, key, value)
         super().__setattr__(key, value)
         if key in self.__dataclass_fields__:
+            _changed(self, key)
             self.__validate__(key)
+            _notify(self, key)
+
+    def cache_dict(self, enabled: bool = True) -> None:
+        """
+        Enable or disable the serialization cache of the User object. While enabled, to_dict() returns a read-only
+        dict that only rebuilds the fields changed since the previous call, including in-place changes of the access
+        key list; the access keys, login profile and permissions boundary cache their own dicts.
+
+        :param enabled: Flag to enable or disable the cache.
+        :type enabled: bool
+        """
+        _cache_dict(self, enabled)
+
+    @classmethod
+    def from_response(cls, account: Account, data: dict, lazy: bool = False) -> 'User':
+        """
+        Create a User object from the User of an IAM GetUser response, or an entry of the Users list of an IAM
+        ListUsers response. The data may also hold the LoginProfile of an IAM GetLoginProfile response and the
+        AccessKeyMetadata entries of an IAM ListAccessKeys response under AccessKeys. In lazy mode, the permissions
+        boundary, login profile and access keys are kept as raw response data and converted on first access.
+
+        :param account: The account of the user.
+        :type account: Account
+        :param data: The User of the response.
+        :type data: dict
+        :param lazy: Flag to convert the nested objects on first access.
+        :type lazy: bool
+        :return: The User object.
+        :rtype: User
+        """
+        return _load(
+            cls,
+            {
+                'account': account,
+                'name': data['UserName'],
+                'id': data['UserId'],
+                'arn': data['Arn'],
+                'path': data.get('Path', '/'),
+                'created_date': data.get('CreateDate'),
+                'password_last_used_date': data.get('PasswordLastUsed'),
+                'tags': data.get('Tags') or None
+            },
+            {
+                'permissions_boundary': data.get('PermissionsBoundary'),
+                'login_profile': data.get('LoginProfile'),
+                'access_keys': data.get('AccessKeys')
+            },
+            lazy
+        )
+
+    def get_tag(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Return the value of a tag of the User object.
+
+        :param key: The tag key.
+        :type key: str
+        :param default: The value to return if the tag is missing.
+        :type default: str
+        :return: The tag value, or the default value if the tag is missing.
+        :rtype: str
+        """
+        return self.tag_map.get(key, default)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Return the content fingerprint of the User object. The fingerprint is computed from the fingerprints of
+        its children, ignores the order of list items, and is cached until the User object or one of its
+        children is modified.
+
+        :return: Content fingerprint of the User object.
+        :rtype: str
+        """
+        return _fingerprint(self)
+
+    @property
+    def parsed_arn(self):
+        """
+        Return the parsed ARN of the User object, cached until arn is reassigned.
+
+        :return: The parsed ARN of the User object.
+        :rtype: ARN
+        """
+        from pyawsopstoolkit_models.arn import parse_arn
+
+        return _derived(self, 'arn', parse_arn)
+
+    @property
+    def tag_map(self):
+        """
+        Return the read-only mapping of tag keys to values of the User object, cached until tags is changed.
+
+        :return: The tag values keyed by tag key.
+        :rtype: MappingProxyType
+        """
+        from pyawsopstoolkit_models.tags import tag_map
+
+        return _derived(self, 'tags', tag_map)
 
     def to_dict(self) -> dict:
         """
@@ -168,6 +368,8 @@ class User:
         :return: Dictionary representation of the User object.
         :rtype: dict
         """
+        if _dict_cached(self):
+            return _cached_dict(self)
         return {
             "account": self.account.to_dict(),
             "path": self.path,
@@ -185,5 +387,14 @@ class User:
             "access_keys": [
                 key.to_dict() for key in self.access_keys
             ] if self.access_keys and len(self.access_keys) > 0 else None,
-            "tags": self.tags
+            "tags": _thaw(self.tags)
         }
+
+
+_lazy_fields(
+    User,
+    permissions_boundary=_model_loader(PermissionsBoundary),
+    login_profile=_model_loader(LoginProfile),
+    access_keys=_list_loader(AccessKey)
+)
+_identity(User, lambda values: values['arn'])
@@ -0,0 +1,86 @@
+import weakref
+from typing import Optional
+
+from pyawsopstoolkit_models.__identity__ import _ACTIVE, _resource_key
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.query import Resource
+
+
+class IdentityMap:
+    """
+    A class representing a registry holding one instance per security group, identified by account, region and group
+    ID, and per role and user, identified by ARN. While the map is active, as a context manager, the constructors,
+    from_response methods and the loaders built on them return the registered instance for an identity they were
+    already called for, updated in place with the new values, so that every holder of the resource sees the same
+    current object and the indexes following its fields are updated. Values failing validation raise before the
+    registered instance is changed. Instances are referenced weakly and leave the map once no longer used elsewhere.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new, empty IdentityMap object.
+        """
+        self._instances = weakref.WeakValueDictionary()
+        self._tokens = []
+
+    def __contains__(self, resource: object) -> bool:
+        key = _resource_key(resource)
+        return key is not None and self._instances.get(key) is resource
+
+    def __enter__(self) -> 'IdentityMap':
+        self._tokens.append(_ACTIVE.set(self._instances))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _ACTIVE.reset(self._tokens.pop())
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def get(self, cls: type, account: str, key: str, region: Optional[str] = None) -> Optional[Resource]:
+        """
+        Returns the registered instance of a resource.
+
+        :param cls: The model class of the resource, i.e. SecurityGroup, Role or User.
+        :type cls: type
+        :param account: The account number of the resource.
+        :type account: str
+        :param key: The ID of the security group, or the ARN of the role or user.
+        :type key: str
+        :param region: The region of the security group.
+        :type region: str
+        :return: The registered instance, or None if there is none.
+        :rtype: SecurityGroup | Role | User
+        """
+        if cls is SecurityGroup:
+            return self._instances.get((cls, (account, region, key)))
+        if cls in (Role, User):
+            return self._instances.get((cls, key))
+        raise TypeError('cls should be SecurityGroup, Role or User.')
+
+    def resolve(self, resource: Resource) -> Resource:
+        """
+        Returns the registered instance with the identity of a resource created outside of the map, e.g. before the
+        map was active or in a worker process, registering the resource if there is none. A registered instance with a
+        different fingerprint is updated in place with the fields of the resource that differ.
+
+        :param resource: The resource.
+        :type resource: SecurityGroup | Role | User
+        :return: The registered instance.
+        :rtype: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        key = _resource_key(resource)
+        existing = self._instances.get(key)
+        if existing is None:
+            self._instances[key] = resource
+            return resource
+        if existing is not resource and existing.fingerprint != resource.fingerprint:
+            for name in resource.__dataclass_fields__:
+                value = getattr(resource, name)
+                if getattr(existing, name) != value:
+                    setattr(existing, name, value)
+        return existing
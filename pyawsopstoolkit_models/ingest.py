@@ -0,0 +1,153 @@
+import asyncio
+import contextvars
+import inspect
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Callable, Iterable, Optional
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.bulk import _build_chunk
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+# Key of the list of items in the pages of the describe and list calls of each model class
+_ITEMS_KEYS: dict[type, str] = {
+    SecurityGroup: 'SecurityGroups',
+    Role: 'Roles',
+    User: 'Users'
+}
+
+
+@dataclass(frozen=True)
+class PageSource:
+    """
+    A class representing an asynchronous stream of response pages of one describe or list call, e.g. the pages of EC2
+    DescribeSecurityGroups for one account and region, with the model class and from_response arguments used to
+    convert the items of each page.
+    """
+
+    cls: type
+    pages: AsyncIterable[dict]
+    args: tuple = ()
+    items_key: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        _validate_type(self.cls, type, 'cls should be a model class.')
+        if not callable(getattr(self.cls, 'from_response', None)):
+            raise TypeError('cls should be a model class with a from_response method.')
+        _validate_type(self.pages, AsyncIterable, 'pages should be an asynchronous iterable.')
+        _validate_type(self.args, tuple, 'args should be of tuple type.')
+        _validate_type(self.items_key, Optional[str], 'items_key should be a string.')
+        if self.items_key is None:
+            if self.cls not in _ITEMS_KEYS:
+                raise ValueError(f'items_key is required for {self.cls.__name__} pages.')
+            object.__setattr__(self, 'items_key', _ITEMS_KEYS[self.cls])
+
+
+async def _emit(sinks: list[Callable[[Any], Any]], model) -> None:
+    for sink in sinks:
+        result = sink(model)
+        if inspect.isawaitable(result):
+            await result
+
+
+async def ingest(
+        sources: Iterable[PageSource],
+        sinks: Iterable[Callable[[Any], Any]],
+        queue_size: int = 8,
+        converters: int = 2,
+        executor: Optional[Executor] = None,
+        lazy: bool = False
+) -> int:
+    """
+    Fetches the pages of all sources concurrently, converts their items into model objects as the pages arrive, and
+    passes each object to the sinks, so that fetching and model building overlap. Pages and converted batches wait in
+    bounded queues, so that slow converters or sinks hold back the fetching instead of buffering every page in memory.
+    Objects are emitted as their pages are converted; the order of the pages of different sources, and of pages
+    converted concurrently, is not preserved. If a source, a conversion or a sink fails, the pipeline is cancelled and
+    the error is raised.
+
+    :param sources: The page sources, e.g. one per account and region.
+    :type sources: Iterable[PageSource]
+    :param sinks: The functions called with each model object, e.g. the add_resource method of an index or the write
+        method of a writer. Coroutine functions are awaited.
+    :type sinks: Iterable[Callable]
+    :param queue_size: The number of pages, and of converted pages, that may wait in each queue.
+    :type queue_size: int
+    :param converters: The number of pages converted concurrently.
+    :type converters: int
+    :param executor: The executor converting the pages, e.g. a ProcessPoolExecutor to build the objects on other
+        CPUs. By default, the pages are converted in the default executor of the event loop, in the current context,
+        so that the event loop keeps fetching pages and emitting objects during conversions.
+    :type executor: Executor
+    :param lazy: Flag to convert the nested objects on first access, for model classes supporting it.
+    :type lazy: bool
+    :return: The number of model objects emitted.
+    :rtype: int
+    """
+    sources = list(sources)
+    sinks = list(sinks)
+    for source in sources:
+        _validate_type(source, PageSource, 'sources should be a list of PageSource objects.')
+    for sink in sinks:
+        if not callable(sink):
+            raise TypeError('sinks should be a list of callables.')
+    _validate_type(queue_size, int, 'queue_size should be an integer.')
+    _validate_type(converters, int, 'converters should be an integer.')
+    _validate_type(executor, Optional[Executor], 'executor should be of Executor type.')
+    if queue_size < 1 or converters < 1:
+        raise ValueError('queue_size and converters should be positive.')
+
+    loop = asyncio.get_running_loop()
+    pages: asyncio.Queue = asyncio.Queue(queue_size)
+    batches: asyncio.Queue = asyncio.Queue(queue_size)
+
+    async def fetch(source: PageSource) -> None:
+        async for page in source.pages:
+            await pages.put((source, page))
+
+    async def convert() -> None:
+        while (item := await pages.get()) is not None:
+            source, page = item
+            items = page.get(source.items_key) or []
+            if executor is None:
+                # The default thread pool runs in a copy of the current context, e.g. with the active identity map.
+                batch = await loop.run_in_executor(
+                    None, contextvars.copy_context().run, _build_chunk, source.cls, source.args, lazy, items
+                )
+            else:
+                batch = await loop.run_in_executor(executor, _build_chunk, source.cls, source.args, lazy, items)
+            await batches.put(batch)
+
+    async def emit() -> int:
+        count = 0
+        while (batch := await batches.get()) is not None:
+            for model in batch:
+                await _emit(sinks, model)
+            count += len(batch)
+        return count
+
+    async def close(tasks: list[asyncio.Task], queue: asyncio.Queue, count: int) -> None:
+        await asyncio.gather(*tasks)
+        for _ in range(count):
+            await queue.put(None)
+
+    fetchers = [asyncio.ensure_future(fetch(source)) for source in sources]
+    workers = [asyncio.ensure_future(convert()) for _ in range(converters)]
+    emitter = asyncio.ensure_future(emit())
+    tasks = [
+        *fetchers, *workers, emitter,
+        asyncio.ensure_future(close(fetchers, pages, converters)),
+        asyncio.ensure_future(close(workers, batches, 1))
+    ]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return emitter.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,624 @@
+import operator
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Callable, Iterable, Optional, Union, get_args, get_origin
+
+from pyawsopstoolkit_models.__tracking__ import _listen
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.tags import TagIndex
+
+Resource = Union[SecurityGroup, Role, User]
+
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+_RANGE_OPERATORS = ('<', '<=', '>', '>=', 'between')
+_MISSING = object()
+
+
+def _utc(value):
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _hashable(annotation) -> bool:
+    for argument in get_args(annotation) if get_origin(annotation) is Union else (annotation,):
+        cls = get_origin(argument) or argument
+        if isinstance(cls, type) and cls.__hash__ is None:
+            return False
+    return True
+
+
+def _getter(path: str) -> Callable[[Any], Any]:
+    # Collections mix resource types, so missing fields read as None.
+    names = path.split('.')
+    if len(names) == 1:
+        return lambda obj: getattr(obj, path, None)
+
+    def get(obj):
+        for name in names:
+            if obj is None:
+                return None
+            obj = getattr(obj, name, None)
+        return obj
+
+    return get
+
+
+class Condition(ABC):
+    """
+    A class representing a query condition on a model object. Conditions are combined with the & (and), | (or) and ~
+    (not) operators, and compiled once into a predicate. Subclasses implement _compile.
+    """
+
+    def __and__(self, other: 'Condition') -> 'Condition':
+        _validate_type(other, Condition, 'other should be of Condition type.')
+        return And(_flatten(And, (self, other)))
+
+    def __or__(self, other: 'Condition') -> 'Condition':
+        _validate_type(other, Condition, 'other should be of Condition type.')
+        return Or(_flatten(Or, (self, other)))
+
+    def __invert__(self) -> 'Condition':
+        return Not(self)
+
+    def __call__(self, obj) -> bool:
+        return self.predicate(obj)
+
+    @cached_property
+    def predicate(self) -> Callable[[Any], bool]:
+        """
+        Returns the predicate compiled from the condition, computed on first use.
+
+        :return: The function returning True for the objects matching the condition.
+        :rtype: Callable
+        """
+        return self._compile()
+
+    @abstractmethod
+    def _compile(self) -> Callable[[Any], bool]:
+        """
+        Compiles the condition into a predicate.
+
+        :return: The function returning True for the objects matching the condition.
+        :rtype: Callable
+        """
+
+
+def _flatten(cls: type, conditions: Iterable[Condition]) -> tuple[Condition, ...]:
+    result = []
+    for condition in conditions:
+        result.extend(condition.conditions if isinstance(condition, cls) else (condition,))
+    return tuple(result)
+
+
+@dataclass(frozen=True, eq=False)
+class Comparison(Condition):
+    """
+    A class representing the comparison of a field of a model object with a value. Paths are dotted attribute names
+    (e.g. last_used.used_date), missing fields read as None, and naive datetimes are treated as UTC. Ordering
+    comparisons are false for missing values.
+    """
+
+    path: str
+    operator: str
+    value: Any
+
+    def __str__(self) -> str:
+        if self.operator == 'between':
+            return f'{self.path} between {self.value[0]!r} and {self.value[1]!r}'
+        return f'{self.path} {self.operator} {self.value!r}'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        get = _getter(self.path)
+        if self.operator == 'in':
+            values = frozenset(_utc(item) for item in self.value)
+            return lambda obj: _utc(get(obj)) in values
+        if self.operator == 'between':
+            low, high = _utc(self.value[0]), _utc(self.value[1])
+
+            def between(obj):
+                value = _utc(get(obj))
+                return value is not None and low <= value <= high
+
+            return between
+        if self.operator == 'startswith':
+            prefix = self.value
+            return lambda obj: isinstance(value := get(obj), str) and value.startswith(prefix)
+        compare, expected = _OPERATORS[self.operator], _utc(self.value)
+        if self.operator in ('==', '!='):
+            return lambda obj: compare(_utc(get(obj)), expected)
+
+        def ordered(obj):
+            value = _utc(get(obj))
+            return value is not None and compare(value, expected)
+
+        return ordered
+
+
+@dataclass(frozen=True, eq=False)
+class TagCondition(Condition):
+    """
+    A class representing a condition on a tag of a security group, role or user: the tag key is present, or holds the
+    given value.
+    """
+
+    key: str
+    value: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f'tag {self.key!r} exists' if self.value is None else f'tag {self.key!r} == {self.value!r}'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        key, value = self.key, self.value
+        if value is None:
+            return lambda obj: key in getattr(obj, 'tag_map', ())
+        return lambda obj: getattr(obj, 'tag_map', {}).get(key, _MISSING) == value
+
+
+@dataclass(frozen=True, eq=False)
+class Quantifier(Condition):
+    """
+    A class representing a condition on the items of a list field, e.g. the ip_permissions of a security group or the
+    access_keys of a user. A missing list is treated as empty, so that all() holds and any() does not.
+    """
+
+    path: str
+    condition: Condition
+    every: bool = False
+
+    def __str__(self) -> str:
+        return f'{"all" if self.every else "any"}({self.path}: {self.condition})'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        get, predicate = _getter(self.path), self.condition.predicate
+        quantifier = all if self.every else any
+        return lambda obj: quantifier(predicate(item) for item in get(obj) or ())
+
+
+@dataclass(frozen=True, eq=False)
+class And(Condition):
+    """
+    A class representing the conjunction of conditions.
+    """
+
+    conditions: tuple[Condition, ...]
+
+    def __str__(self) -> str:
+        return '(' + ' and '.join(str(condition) for condition in self.conditions) + ')'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        predicates = tuple(condition.predicate for condition in self.conditions)
+        return lambda obj: all(predicate(obj) for predicate in predicates)
+
+
+@dataclass(frozen=True, eq=False)
+class Or(Condition):
+    """
+    A class representing the disjunction of conditions.
+    """
+
+    conditions: tuple[Condition, ...]
+
+    def __str__(self) -> str:
+        return '(' + ' or '.join(str(condition) for condition in self.conditions) + ')'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        predicates = tuple(condition.predicate for condition in self.conditions)
+        return lambda obj: any(predicate(obj) for predicate in predicates)
+
+
+@dataclass(frozen=True, eq=False)
+class Not(Condition):
+    """
+    A class representing the negation of a condition.
+    """
+
+    condition: Condition
+
+    def __str__(self) -> str:
+        return f'not {self.condition}'
+
+    def _compile(self) -> Callable[[Any], bool]:
+        predicate = self.condition.predicate
+        return lambda obj: not predicate(obj)
+
+
+class Field:
+    """
+    A class representing a field of a model object in a query, turned into a condition by a comparison operator or
+    one of the methods below, e.g. field('created_date') >= start or field('ip_permissions').any(...).
+    """
+
+    __hash__ = None
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes a new Field object.
+
+        :param path: The dotted attribute path of the field.
+        :type path: str
+        """
+        _validate_type(path, str, 'path should be a string.')
+        self.path = path
+
+    def __eq__(self, value) -> Comparison:
+        return Comparison(self.path, '==', value)
+
+    def __ne__(self, value) -> Comparison:
+        return Comparison(self.path, '!=', value)
+
+    def __lt__(self, value) -> Comparison:
+        return Comparison(self.path, '<', value)
+
+    def __le__(self, value) -> Comparison:
+        return Comparison(self.path, '<=', value)
+
+    def __gt__(self, value) -> Comparison:
+        return Comparison(self.path, '>', value)
+
+    def __ge__(self, value) -> Comparison:
+        return Comparison(self.path, '>=', value)
+
+    def all(self, condition: Condition) -> Quantifier:
+        """
+        Returns the condition that all items of the list field match a condition.
+
+        :param condition: The condition on the items.
+        :type condition: Condition
+        :return: The condition.
+        :rtype: Quantifier
+        """
+        _validate_type(condition, Condition, 'condition should be of Condition type.')
+        return Quantifier(self.path, condition, True)
+
+    def any(self, condition: Condition) -> Quantifier:
+        """
+        Returns the condition that at least one item of the list field matches a condition.
+
+        :param condition: The condition on the items.
+        :type condition: Condition
+        :return: The condition.
+        :rtype: Quantifier
+        """
+        _validate_type(condition, Condition, 'condition should be of Condition type.')
+        return Quantifier(self.path, condition)
+
+    def between(self, low, high) -> Comparison:
+        """
+        Returns the condition that the field lies between two values, both included.
+
+        :param low: The lower bound.
+        :type low: Any
+        :param high: The upper bound.
+        :type high: Any
+        :return: The condition.
+        :rtype: Comparison
+        """
+        return Comparison(self.path, 'between', (low, high))
+
+    def isin(self, values: Iterable) -> Comparison:
+        """
+        Returns the condition that the field equals one of the given values.
+
+        :param values: The values.
+        :type values: Iterable
+        :return: The condition.
+        :rtype: Comparison
+        """
+        return Comparison(self.path, 'in', tuple(values))
+
+    def startswith(self, prefix: str) -> Comparison:
+        """
+        Returns the condition that the string field starts with a prefix.
+
+        :param prefix: The prefix.
+        :type prefix: str
+        :return: The condition.
+        :rtype: Comparison
+        """
+        _validate_type(prefix, str, 'prefix should be a string.')
+        return Comparison(self.path, 'startswith', prefix)
+
+
+def field(path: str) -> Field:
+    """
+    Returns a field of a model object to build query conditions.
+
+    :param path: The dotted attribute path of the field.
+    :type path: str
+    :return: The field.
+    :rtype: Field
+    """
+    return Field(path)
+
+
+def tag(key: str, value: Optional[str] = None) -> TagCondition:
+    """
+    Returns the condition that a security group, role or user holds a tag key, or a tag key with the given value.
+
+    :param key: The tag key.
+    :type key: str
+    :param value: The tag value, or None for any value.
+    :type value: str
+    :return: The condition.
+    :rtype: TagCondition
+    """
+    _validate_type(key, str, 'key should be a string.')
+    return TagCondition(key, value)
+
+
+@dataclass
+class QueryPlan:
+    """
+    A class representing how a query is executed: the index and the condition used to select candidate objects, if
+    any, and the number of candidates checked against the whole condition.
+    """
+
+    condition: Condition
+    index: Optional[str] = None
+    index_condition: Optional[Condition] = None
+    candidates: int = 0
+    total: int = 0
+
+    def __str__(self) -> str:
+        if self.index is None:
+            return f'scan {self.total} objects for {self.condition}'
+        return (
+            f'use {self.index} index for {self.index_condition}: check {self.candidates} of {self.total} objects for '
+            f'{self.condition}'
+        )
+
+
+class ResourceCollection:
+    """
+    A class representing a queryable collection of security groups, roles and users. Hash indexes answer equality
+    and membership conditions, range indexes answer ordering conditions, and a tag index answers tag conditions; the
+    query planner selects the candidates of the most selective indexed condition of a conjunction, and checks them
+    against the whole condition. Indexes follow the reassignment of the indexed fields.
+    """
+
+    def __init__(self, resources: Optional[Iterable[Resource]] = None) -> None:
+        """
+        Initializes a new ResourceCollection object, optionally populated with the given resources.
+
+        :param resources: The security groups, roles and users of the collection.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        self._resources: dict[int, Resource] = {}
+        self._positions: dict[int, int] = {}
+        self._counter = 0
+        self._hash: dict[str, dict[Any, dict[int, Resource]]] = {}
+        self._hash_entries: dict[str, dict[int, Any]] = {}
+        self._ranges: dict[str, Optional[tuple[list, list]]] = {}
+        self._tag_index: Optional[TagIndex] = None
+        if resources is not None:
+            self.extend(resources)
+
+    def __contains__(self, resource: object) -> bool:
+        return self._resources.get(id(resource)) is resource
+
+    def __iter__(self):
+        return iter(list(self._resources.values()))
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def _listen(self, field_name: str) -> None:
+        if field_name not in self._hash and field_name not in self._ranges:
+            for cls in (SecurityGroup, Role, User):
+                if field_name in cls.__dataclass_fields__:
+                    _listen(cls, field_name, self._field_changed)
+
+    def _hash_add(self, field_name: str, key: int, resource: Resource) -> None:
+        value = _utc(getattr(resource, field_name, None))
+        self._hash_entries[field_name][key] = value
+        self._hash[field_name].setdefault(value, {})[key] = resource
+
+    def _hash_remove(self, field_name: str, key: int) -> None:
+        value = self._hash_entries[field_name].pop(key)
+        group = self._hash[field_name][value]
+        del group[key]
+        if len(group) == 0:
+            del self._hash[field_name][value]
+
+    def _field_changed(self, resource: Resource, field_name: str) -> None:
+        key = id(resource)
+        if self._resources.get(key) is not resource:
+            return
+        if field_name in self._hash:
+            self._hash_remove(field_name, key)
+            self._hash_add(field_name, key, resource)
+        if field_name in self._ranges:
+            self._ranges[field_name] = None
+
+    def _range(self, field_name: str) -> tuple[list, list]:
+        entries = self._ranges[field_name]
+        if entries is None:
+            pairs = sorted(
+                (
+                    (value, key) for key, value in (
+                        (key, _utc(getattr(resource, field_name, None))) for key, resource in self._resources.items()
+                    ) if value is not None
+                ),
+                key=operator.itemgetter(0)
+            )
+            entries = self._ranges[field_name] = ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        return entries
+
+    def _lookup(self, condition: Condition) -> Optional[tuple[str, Iterable[int], int]]:
+        if isinstance(condition, Comparison):
+            if condition.path in self._hash and condition.operator in ('==', 'in'):
+                index = self._hash[condition.path]
+                values = (condition.value,) if condition.operator == '==' else condition.value
+                groups = [index.get(_utc(value), {}) for value in dict.fromkeys(values)]
+                return f'hash({condition.path})', (key for group in groups for key in group), sum(map(len, groups))
+            if condition.path in self._ranges and condition.operator in _RANGE_OPERATORS:
+                values, keys = self._range(condition.path)
+                start, end = 0, len(values)
+                bound = condition.value if condition.operator == 'between' else (condition.value, condition.value)
+                low, high = _utc(bound[0]), _utc(bound[1])
+                if condition.operator in ('>', '>='):
+                    start = (bisect_right if condition.operator == '>' else bisect_left)(values, low)
+                elif condition.operator in ('<', '<='):
+                    end = (bisect_left if condition.operator == '<' else bisect_right)(values, high)
+                else:
+                    start, end = bisect_left(values, low), bisect_right(values, high)
+                end = max(start, end)
+                return f'range({condition.path})', keys[start:end], end - start
+        elif isinstance(condition, TagCondition) and self._tag_index is not None:
+            index, key, value = self._tag_index, condition.key, condition.value
+            return 'tags', (id(resource) for resource in index.find({key: value})), index.count(key, value)
+        return None
+
+    def _plan(self, condition: Condition) -> tuple[QueryPlan, Optional[Iterable[int]]]:
+        _validate_type(condition, Condition, 'condition should be of Condition type.')
+        plan = QueryPlan(condition=condition, candidates=len(self._resources), total=len(self._resources))
+        best = None
+        for part in condition.conditions if isinstance(condition, And) else (condition,):
+            found = self._lookup(part)
+            if found is not None and (best is None or found[2] < best[1][2]):
+                best = part, found
+        if best is None:
+            return plan, None
+        part, (index, keys, count) = best
+        plan.index, plan.index_condition, plan.candidates = index, part, count
+        return plan, keys
+
+    def add_resource(self, resource: Resource) -> None:
+        """
+        Adds a security group, role or user to the collection.
+
+        :param resource: The resource to add.
+        :type resource: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        key = id(resource)
+        if key in self._resources:
+            raise ValueError(f'resource {getattr(resource, "arn", None) or resource.id} is already in the collection.')
+        self._resources[key] = resource
+        self._positions[key] = self._counter
+        self._counter += 1
+        for field_name in self._hash:
+            self._hash_add(field_name, key, resource)
+        for field_name in self._ranges:
+            self._ranges[field_name] = None
+        if self._tag_index is not None:
+            self._tag_index.add_resource(resource)
+
+    def create_index(self, field_name: str) -> None:
+        """
+        Creates a hash index on a field, used for equality and membership conditions. Fields holding lists,
+        dictionaries or models, e.g. tags or ip_permissions, cannot be hashed and are queried through scans, e.g. with
+        field('ip_permissions').any(...), or through the tag index.
+
+        :param field_name: The name of the field.
+        :type field_name: str
+        """
+        _validate_type(field_name, str, 'field_name should be a string.')
+        if '.' in field_name:
+            raise ValueError('field_name should be the name of a field, not a path.')
+        for cls in (SecurityGroup, Role, User):
+            definition = cls.__dataclass_fields__.get(field_name)
+            if definition is not None and not _hashable(definition.type):
+                raise ValueError(
+                    f'{field_name} holds lists, dictionaries or models, which cannot be used in a hash index.'
+                )
+        if field_name not in self._hash:
+            self._listen(field_name)
+            self._hash[field_name] = {}
+            self._hash_entries[field_name] = {}
+            for key, resource in self._resources.items():
+                self._hash_add(field_name, key, resource)
+
+    def create_range_index(self, field_name: str) -> None:
+        """
+        Creates a range index on a field, used for ordering conditions such as datetime ranges. The index is sorted on
+        first use after a change.
+
+        :param field_name: The name of the field.
+        :type field_name: str
+        """
+        _validate_type(field_name, str, 'field_name should be a string.')
+        if '.' in field_name:
+            raise ValueError('field_name should be the name of a field, not a path.')
+        if field_name not in self._ranges:
+            self._listen(field_name)
+            self._ranges[field_name] = None
+
+    def create_tag_index(self) -> None:
+        """
+        Creates a tag index, used for tag conditions.
+        """
+        if self._tag_index is None:
+            self._tag_index = TagIndex(self._resources.values())
+
+    def explain(self, condition: Condition) -> QueryPlan:
+        """
+        Returns how a query would be executed, without executing it.
+
+        :param condition: The query condition.
+        :type condition: Condition
+        :return: The query plan.
+        :rtype: QueryPlan
+        """
+        return self._plan(condition)[0]
+
+    def extend(self, resources: Iterable[Resource]) -> None:
+        """
+        Adds security groups, roles and users to the collection.
+
+        :param resources: The resources to add.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        for resource in resources:
+            self.add_resource(resource)
+
+    def filter(self, condition: Condition) -> list[Resource]:
+        """
+        Returns the resources matching a condition.
+
+        :param condition: The query condition.
+        :type condition: Condition
+        :return: The matching resources, in collection order.
+        :rtype: list
+        """
+        plan, keys = self._plan(condition)
+        predicate = condition.predicate
+        if keys is None:
+            return [resource for resource in self._resources.values() if predicate(resource)]
+        resources = self._resources
+        matches = [key for key in keys if predicate(resources[key])]
+        matches.sort(key=self._positions.__getitem__)
+        return [resources[key] for key in matches]
+
+    def remove_resource(self, resource: Resource) -> None:
+        """
+        Removes a security group, role or user from the collection.
+
+        :param resource: The resource to remove.
+        :type resource: SecurityGroup | Role | User
+        """
+        if resource not in self:
+            raise KeyError(getattr(resource, 'arn', None) or getattr(resource, 'id', resource))
+        key = id(resource)
+        for field_name in self._hash:
+            self._hash_remove(field_name, key)
+        for field_name in self._ranges:
+            self._ranges[field_name] = None
+        if self._tag_index is not None:
+            self._tag_index.remove_resource(resource)
+        del self._resources[key]
+        del self._positions[key]
@@ -0,0 +1,311 @@
+from concurrent.futures import Executor
+from functools import reduce
+from typing import Any, Callable, Iterable, Optional
+
+from pyawsopstoolkit_models.__tracking__ import _listen
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.query import Condition, Resource, ResourceCollection
+
+ShardKey = tuple[str, Optional[str]]
+
+_MISSING = object()
+
+
+def shard_key(resource: Resource) -> ShardKey:
+    """
+    Returns the default shard key of a resource: the account number and the region of security groups, or None as
+    the region of global IAM roles and users.
+
+    :param resource: The resource.
+    :type resource: SecurityGroup | Role | User
+    :return: The account number and region.
+    :rtype: tuple
+    """
+    return resource.account.number, getattr(resource, 'region', None)
+
+
+class ShardedCollection:
+    """
+    A class representing security groups, roles and users partitioned into shards by account and region, each shard
+    being a ResourceCollection with the indexes created on the sharded collection. Queries skip the shards of other
+    accounts and regions, functions are mapped over the shards in a thread or process pool, and a shard is replaced
+    as a whole when one account and region is refreshed, without touching the other shards. A resource moves to
+    another shard when its account or region is reassigned.
+    """
+
+    def __init__(
+            self,
+            resources: Optional[Iterable[Resource]] = None,
+            key: Callable[[Resource], ShardKey] = shard_key
+    ) -> None:
+        """
+        Initializes a new ShardedCollection object, optionally populated with the given resources.
+
+        :param resources: The security groups, roles and users of the collection.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        :param key: The function returning the (account number, region) shard key of a resource, e.g. to shard IAM
+            roles by the region of their last use.
+        :type key: Callable
+        """
+        if not callable(key):
+            raise TypeError('key should be callable.')
+        self._key = key
+        self._shards: dict[ShardKey, ResourceCollection] = {}
+        self._keys: dict[int, ShardKey] = {}
+        self._indexes: list[tuple[str, tuple]] = []
+        for cls in (SecurityGroup, Role, User):
+            for field_name in ('account', 'region'):
+                if field_name in cls.__dataclass_fields__:
+                    _listen(cls, field_name, self._key_changed)
+        if resources is not None:
+            self.extend(resources)
+
+    def __contains__(self, resource: object) -> bool:
+        shard = self._shards.get(self._keys.get(id(resource)))
+        return shard is not None and resource in shard
+
+    def __iter__(self):
+        return iter([resource for shard in list(self._shards.values()) for resource in shard])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _new_shard(self) -> ResourceCollection:
+        shard = ResourceCollection()
+        for method, args in self._indexes:
+            getattr(shard, method)(*args)
+        return shard
+
+    def _create(self, method: str, *args) -> None:
+        for shard in self._shards.values():
+            getattr(shard, method)(*args)
+        if (method, args) not in self._indexes:
+            self._indexes.append((method, args))
+
+    def _shard_key(self, resource: Resource) -> ShardKey:
+        key = self._key(resource)
+        _validate_type(key, tuple, 'key should return an (account, region) tuple.')
+        return key
+
+    def _selected(self, accounts: Optional[Iterable[str]], regions: Optional[Iterable[Optional[str]]]) -> list:
+        accounts = None if accounts is None else set(accounts)
+        regions = None if regions is None else set(regions)
+        return [
+            (key, shard) for key, shard in self._shards.items()
+            if (accounts is None or key[0] in accounts) and (regions is None or key[1] in regions)
+        ]
+
+    def _key_changed(self, resource: Resource, field_name: str) -> None:
+        old = self._keys.get(id(resource))
+        if old is None or resource not in self._shards[old]:
+            return
+        # Invalid values are kept in their shard until the validation of the assignment raises.
+        try:
+            new = self._shard_key(resource)
+        except (AttributeError, TypeError):
+            return
+        if new != old:
+            self._discard(old, resource)
+            self._insert(new, resource)
+
+    def _insert(self, key: ShardKey, resource: Resource) -> None:
+        shard = self._shards.get(key)
+        if shard is None:
+            shard = self._shards[key] = self._new_shard()
+        shard.add_resource(resource)
+        self._keys[id(resource)] = key
+
+    def _discard(self, key: ShardKey, resource: Resource) -> None:
+        shard = self._shards[key]
+        shard.remove_resource(resource)
+        del self._keys[id(resource)]
+        if len(shard) == 0:
+            del self._shards[key]
+
+    def add_resource(self, resource: Resource) -> None:
+        """
+        Adds a security group, role or user to the shard of its account and region.
+
+        :param resource: The resource to add.
+        :type resource: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        if resource in self:
+            raise ValueError(f'resource {getattr(resource, "arn", None) or resource.id} is already in the collection.')
+        self._insert(self._shard_key(resource), resource)
+
+    def create_index(self, field_name: str) -> None:
+        """
+        Creates a hash index on a field in every shard, including the shards created later.
+
+        :param field_name: The name of the field.
+        :type field_name: str
+        """
+        self._create('create_index', field_name)
+
+    def create_range_index(self, field_name: str) -> None:
+        """
+        Creates a range index on a field in every shard, including the shards created later.
+
+        :param field_name: The name of the field.
+        :type field_name: str
+        """
+        self._create('create_range_index', field_name)
+
+    def create_tag_index(self) -> None:
+        """
+        Creates a tag index in every shard, including the shards created later.
+        """
+        self._create('create_tag_index')
+
+    def extend(self, resources: Iterable[Resource]) -> None:
+        """
+        Adds security groups, roles and users to the shards of their accounts and regions.
+
+        :param resources: The resources to add.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        for resource in resources:
+            self.add_resource(resource)
+
+    def filter(
+            self,
+            condition: Condition,
+            accounts: Optional[Iterable[str]] = None,
+            regions: Optional[Iterable[Optional[str]]] = None
+    ) -> list[Resource]:
+        """
+        Returns the resources matching a condition, using the indexes of each shard.
+
+        :param condition: The query condition.
+        :type condition: Condition
+        :param accounts: The account numbers of the shards to query, by default all accounts.
+        :type accounts: Iterable[str]
+        :param regions: The regions of the shards to query, by default all regions. None selects the global shards.
+        :type regions: Iterable[str]
+        :return: The matching resources, grouped by shard in shard creation order.
+        :rtype: list
+        """
+        _validate_type(condition, Condition, 'condition should be of Condition type.')
+        return [resource for _, shard in self._selected(accounts, regions) for resource in shard.filter(condition)]
+
+    def map(
+            self,
+            function: Callable[[list], Any],
+            executor: Optional[Executor] = None,
+            accounts: Optional[Iterable[str]] = None,
+            regions: Optional[Iterable[Optional[str]]] = None
+    ) -> dict[ShardKey, Any]:
+        """
+        Applies a function to the list of resources of each shard, e.g. to run an exposure check per account and
+        region. With a process pool, the function should be defined at module level and the resources are pickled to
+        the workers.
+
+        :param function: The function called with the resources of a shard.
+        :type function: Callable
+        :param executor: The thread or process pool running the function, by default the calling thread.
+        :type executor: Executor
+        :param accounts: The account numbers of the shards to map, by default all accounts.
+        :type accounts: Iterable[str]
+        :param regions: The regions of the shards to map, by default all regions.
+        :type regions: Iterable[str]
+        :return: The results of the function keyed by shard key, in shard creation order.
+        :rtype: dict
+        """
+        if not callable(function):
+            raise TypeError('function should be callable.')
+        _validate_type(executor, Optional[Executor], 'executor should be of Executor type.')
+        selected = self._selected(accounts, regions)
+        if executor is None:
+            return {key: function(list(shard)) for key, shard in selected}
+        futures = [(key, executor.submit(function, list(shard))) for key, shard in selected]
+        return {key: future.result() for key, future in futures}
+
+    def map_reduce(
+            self,
+            function: Callable[[list], Any],
+            combine: Callable[[Any, Any], Any],
+            initial: Any = _MISSING,
+            executor: Optional[Executor] = None
+    ) -> Any:
+        """
+        Applies a function to the resources of each shard and combines the results, e.g. to count the world-open rules
+        of an organisation.
+
+        :param function: The function called with the resources of a shard.
+        :type function: Callable
+        :param combine: The function combining two results.
+        :type combine: Callable
+        :param initial: The initial value of the combination, required if the collection may be empty.
+        :type initial: Any
+        :param executor: The thread or process pool running the function, by default the calling thread.
+        :type executor: Executor
+        :return: The combined result.
+        :rtype: Any
+        """
+        if not callable(combine):
+            raise TypeError('combine should be callable.')
+        results = self.map(function, executor).values()
+        return reduce(combine, results) if initial is _MISSING else reduce(combine, results, initial)
+
+    def remove_resource(self, resource: Resource) -> None:
+        """
+        Removes a security group, role or user from the collection.
+
+        :param resource: The resource to remove.
+        :type resource: SecurityGroup | Role | User
+        """
+        if resource not in self:
+            raise KeyError(getattr(resource, 'arn', None) or getattr(resource, 'id', resource))
+        self._discard(self._keys[id(resource)], resource)
+
+    def replace_shard(self, key: ShardKey, resources: Iterable[Resource]) -> None:
+        """
+        Replaces the resources of one account and region, e.g. after refreshing a region. The new shard is built and
+        indexed before it replaces the current one, and the other shards are not touched.
+
+        :param key: The (account number, region) shard key.
+        :type key: tuple
+        :param resources: The resources of the shard; an empty iterable drops the shard.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        _validate_type(key, tuple, 'key should be an (account, region) tuple.')
+        shard = self._new_shard()
+        for resource in resources:
+            _validate_type(resource, Resource, 'resources should be a list of SecurityGroup, Role or User objects.')
+            if self._shard_key(resource) != key:
+                raise ValueError(f'resource {getattr(resource, "arn", None) or resource.id} does not belong to {key}.')
+            if resource in self and self._keys[id(resource)] != key:
+                raise ValueError(f'resource {getattr(resource, "arn", None) or resource.id} is in another shard.')
+            shard.add_resource(resource)
+        old = self._shards.pop(key, None)
+        if old is not None:
+            for resource in old:
+                del self._keys[id(resource)]
+        if len(shard) > 0:
+            self._shards[key] = shard
+            for resource in shard:
+                self._keys[id(resource)] = key
+
+    def shard(self, key: ShardKey) -> ResourceCollection:
+        """
+        Returns the collection of one account and region, e.g. to explain a query on it.
+
+        :param key: The (account number, region) shard key.
+        :type key: tuple
+        :return: The shard.
+        :rtype: ResourceCollection
+        """
+        return self._shards[key]
+
+    def shard_keys(self) -> list[ShardKey]:
+        """
+        Returns the keys of the shards holding at least one resource.
+
+        :return: The (account number, region) shard keys, in shard creation order.
+        :rtype: list
+        """
+        return list(self._shards)
@@ -0,0 +1,545 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import (
+    IPPermission, IPRange, IPv6Range, PrefixList, SecurityGroup, UserIDGroupPair
+)
+from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+from pyawsopstoolkit_models.iam.user import AccessKey, LoginProfile, User
+
+_MAGIC = b'PYAWSSNP'
+_VERSION = 1
+_HEADER = struct.Struct('<8sBBxxI')
+_ENTRY = struct.Struct('<32ss7xQQ')
+_ALIGNMENT = 8
+# String index of a missing value
+_NONE = 0xFFFFFFFF
+# Encoded missing datetime; other datetimes are microseconds since the epoch, shifted left by one bit holding the
+# timezone awareness of the value
+_NO_DATE = -2 ** 63
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ALL_PROTOCOLS = '-1'
+_RANGE_KINDS = (
+    (IPRange, 'ip_ranges', 'cidr_ip'),
+    (IPv6Range, 'ipv6_ranges', 'cidr_ipv6'),
+    (PrefixList, 'prefix_lists', 'id')
+)
+_PAIR_FIELDS = ('id', 'name', 'status', 'user_id', 'vpc_id', 'description', 'vpc_peering_connection_id')
+
+# Columns of each table, with the array type code of their values; s columns hold indexes into the string table.
+# Flags hold -1 for None; the login_profile column holds -2 for a user without login profile, or else the password
+# reset flag.
+_TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    'groups': (
+        ('account', 's'), ('region', 's'), ('id', 's'), ('name', 's'), ('owner_id', 's'), ('vpc_id', 's'),
+        ('description', 's'), ('tags', 's'), ('in_use', 'b'), ('rule_start', 'I'), ('rule_count', 'I')
+    ),
+    'rules': (
+        ('group', 'I'), ('egress', 'B'), ('ip_protocol', 's'), ('from_port', 'i'), ('to_port', 'i'),
+        ('range_start', 'I'), ('range_count', 'I'), ('pair_start', 'I'), ('pair_count', 'I')
+    ),
+    'ranges': (('rule', 'I'), ('kind', 'B'), ('value', 's'), ('description', 's')),
+    'pairs': tuple((name, 's') for name in _PAIR_FIELDS),
+    'users': (
+        ('account', 's'), ('name', 's'), ('id', 's'), ('arn', 's'), ('path', 's'), ('created_date', 'q'),
+        ('password_last_used_date', 'q'), ('permissions_boundary_type', 's'), ('permissions_boundary_arn', 's'),
+        ('login_profile', 'b'), ('login_profile_created_date', 'q'), ('tags', 's'), ('key_start', 'I'),
+        ('key_count', 'I')
+    ),
+    'keys': (
+        ('user', 'I'), ('id', 's'), ('status', 's'), ('created_date', 'q'), ('last_used_date', 'q'),
+        ('last_used_service', 's'), ('last_used_region', 's')
+    )
+}
+
+
+def _encode_date(value: Optional[datetime]) -> int:
+    if value is None:
+        return _NO_DATE
+    if value.tzinfo is None:
+        return (value - _EPOCH) // timedelta(microseconds=1) << 1
+    return (value - _EPOCH_UTC) // timedelta(microseconds=1) << 1 | 1
+
+
+def _decode_date(value: int) -> Optional[datetime]:
+    if value == _NO_DATE:
+        return None
+    return (_EPOCH_UTC if value & 1 else _EPOCH) + timedelta(microseconds=value >> 1)
+
+
+def _flag(value: Optional[bool]) -> int:
+    return -1 if value is None else int(value)
+
+
+def _tags(value: Optional[list]) -> Optional[str]:
+    return None if value is None else json.dumps(value, separators=(',', ':'))
+
+
+def _rows(resources: Iterable[Union[SecurityGroup, User]]) -> dict[str, dict[str, list]]:
+    rows = {table: {name: [] for name, _ in columns} for table, columns in _TABLES.items()}
+    groups, rules, ranges, pairs = rows['groups'], rows['rules'], rows['ranges'], rows['pairs']
+    users, keys = rows['users'], rows['keys']
+    for resource in resources:
+        _validate_type(resource, (SecurityGroup, User), 'resources should be a list of SecurityGroup or User objects.')
+        if isinstance(resource, SecurityGroup):
+            group = len(groups['id'])
+            permissions = [
+                (egress, permission)
+                for egress, items in ((0, resource.ip_permissions), (1, resource.ip_permissions_egress))
+                for permission in items or []
+            ]
+            for name, value in (
+                    ('account', resource.account.number), ('region', resource.region), ('id', resource.id),
+                    ('name', resource.name), ('owner_id', resource.owner_id), ('vpc_id', resource.vpc_id),
+                    ('description', resource.description), ('tags', _tags(resource.tags)),
+                    ('in_use', _flag(resource.in_use)), ('rule_start', len(rules['group'])),
+                    ('rule_count', len(permissions))
+            ):
+                groups[name].append(value)
+            for egress, permission in permissions:
+                rule = len(rules['group'])
+                range_start, pair_start = len(ranges['rule']), len(pairs['id'])
+                for kind, (_, field_name, value_name) in enumerate(_RANGE_KINDS):
+                    for item in getattr(permission, field_name) or []:
+                        ranges['rule'].append(rule)
+                        ranges['kind'].append(kind)
+                        ranges['value'].append(getattr(item, value_name))
+                        ranges['description'].append(item.description)
+                for pair in permission.user_id_group_pairs or []:
+                    for name in _PAIR_FIELDS:
+                        pairs[name].append(getattr(pair, name))
+                for name, value in (
+                        ('group', group), ('egress', egress), ('ip_protocol', permission.ip_protocol),
+                        ('from_port', permission.from_port), ('to_port', permission.to_port),
+                        ('range_start', range_start), ('range_count', len(ranges['rule']) - range_start),
+                        ('pair_start', pair_start), ('pair_count', len(pairs['id']) - pair_start)
+                ):
+                    rules[name].append(value)
+        else:
+            user = len(users['id'])
+            boundary, login_profile = resource.permissions_boundary, resource.login_profile
+            access_keys = resource.access_keys or []
+            for name, value in (
+                    ('account', resource.account.number), ('name', resource.name), ('id', resource.id),
+                    ('arn', resource.arn), ('path', resource.path),
+                    ('created_date', _encode_date(resource.created_date)),
+                    ('password_last_used_date', _encode_date(resource.password_last_used_date)),
+                    ('permissions_boundary_type', boundary.type if boundary else None),
+                    ('permissions_boundary_arn', boundary.arn if boundary else None),
+                    ('login_profile', _flag(login_profile.password_reset_required) if login_profile else -2),
+                    ('login_profile_created_date', _encode_date(login_profile.created_date if login_profile else None)),
+                    ('tags', _tags(resource.tags)), ('key_start', len(keys['id'])), ('key_count', len(access_keys))
+            ):
+                users[name].append(value)
+            for key in access_keys:
+                for name, value in (
+                        ('user', user), ('id', key.id), ('status', key.status),
+                        ('created_date', _encode_date(key.created_date)),
+                        ('last_used_date', _encode_date(key.last_used_date)),
+                        ('last_used_service', key.last_used_service), ('last_used_region', key.last_used_region)
+                ):
+                    keys[name].append(value)
+    return rows
+
+
+def write_snapshot(path: str, resources: Iterable[Union[SecurityGroup, User]]) -> None:
+    """
+    Writes security groups and users to a binary snapshot file, made of a sorted table of distinct strings and one
+    fixed-width array per column of the groups, rules, ranges, group pairs, users and access keys. The file is loaded
+    with the Snapshot class without deserializing it.
+
+    :param path: The path of the snapshot file.
+    :type path: str
+    :param resources: The security groups and users.
+    :type resources: Iterable[SecurityGroup | User]
+    """
+    _validate_type(path, str, 'path should be a string.')
+    rows = _rows(resources)
+    strings = sorted({
+        value for table, columns in _TABLES.items() for name, code in columns if code == 's'
+        for value in rows[table][name] if value is not None
+    })
+    index = {value: position for position, value in enumerate(strings)}
+    data = bytearray()
+    offsets = array('Q', [0])
+    for value in strings:
+        data += value.encode()
+        offsets.append(len(data))
+    columns: list[tuple[str, str, Union[array, bytearray]]] = [
+        ('strings.offsets', 'Q', offsets), ('strings.data', 'B', data)
+    ]
+    for table, table_columns in _TABLES.items():
+        for name, code in table_columns:
+            values = rows[table][name]
+            if code == 's':
+                values = array('I', [_NONE if value is None else index[value] for value in values])
+            else:
+                values = array(code, values)
+            columns.append((f'{table}.{name}', code, values))
+    offset = _HEADER.size + _ENTRY.size * len(columns)
+    entries = []
+    for name, code, values in columns:
+        offset += -offset % _ALIGNMENT
+        entries.append(_ENTRY.pack(name.encode(), code.encode(), offset, len(values)))
+        offset += len(values) * (values.itemsize if isinstance(values, array) else 1)
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == 'big', len(columns)))
+        for entry in entries:
+            file.write(entry)
+        for name, code, values in columns:
+            file.write(b'\0' * (-file.tell() % _ALIGNMENT))
+            file.write(values)
+
+
+class Snapshot:
+    """
+    A class representing a binary snapshot file of security groups and users, memory-mapped so that loading only reads
+    its header. Queries scan the columns of the file, and security groups, rules and users are materialized as model
+    objects on demand.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes a new Snapshot object by memory-mapping a file written by write_snapshot.
+
+        :param path: The path of the snapshot file.
+        :type path: str
+        """
+        _validate_type(path, str, 'path should be a string.')
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, big_endian, count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f'{path} is not a snapshot file of version {_VERSION}.')
+        if big_endian != (sys.byteorder == 'big'):
+            self._map.close()
+            raise ValueError(f'{path} was written on a platform of another byte order.')
+        self._view = memoryview(self._map)
+        self._columns: dict[str, memoryview] = {}
+        self._spans: dict[str, tuple[int, int]] = {}
+        for position in range(count):
+            name, code, offset, length = _ENTRY.unpack_from(self._map, _HEADER.size + position * _ENTRY.size)
+            name, code = name.rstrip(b'\0').decode(), 'I' if code == b's' else code.decode()
+            end = offset + length * struct.calcsize(code)
+            self._columns[name] = self._view[offset:end].cast(code)
+            self._spans[name] = (offset, end)
+        self._accounts = {}
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _string(self, index: int) -> Optional[str]:
+        if index == _NONE:
+            return None
+        offsets = self._columns['strings.offsets']
+        return bytes(self._columns['strings.data'][offsets[index]:offsets[index + 1]]).decode()
+
+    def _string_index(self, value: str) -> Optional[int]:
+        # The strings are sorted, and the UTF-8 byte order matches the order of the code points.
+        target = value.encode()
+        offsets, data = self._columns['strings.offsets'], self._columns['strings.data']
+        low, high = 0, len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(data[offsets[middle]:offsets[middle + 1]]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(offsets) - 1 and bytes(data[offsets[low]:offsets[low + 1]]) == target:
+            return low
+        return None
+
+    def _scan(self, column_name: str, value: int) -> list[int]:
+        # Searches the raw bytes of the column, keeping the matches aligned on an item.
+        start, end = self._spans[column_name]
+        pattern = struct.pack('=I', value)
+        positions = []
+        position = self._map.find(pattern, start, end)
+        while position >= 0:
+            if (position - start) % 4 == 0:
+                positions.append((position - start) // 4)
+                position = self._map.find(pattern, position + 4, end)
+            else:
+                position = self._map.find(pattern, position + 1, end)
+        return positions
+
+    def _account(self, index: int):
+        from pyawsopstoolkit.account import Account
+
+        account = self._accounts.get(index)
+        if account is None:
+            account = self._accounts[index] = Account(self._string(index))
+        return account
+
+    def _tags(self, index: int) -> Optional[list]:
+        value = self._string(index)
+        return None if value is None else json.loads(value)
+
+    def _get(self, table: str, row: int, *names: str) -> list:
+        return [self._columns[f'{table}.{name}'][row] for name in names]
+
+    def close(self) -> None:
+        """
+        Closes the snapshot file. The objects materialized from the snapshot remain valid.
+        """
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+        self._view.release()
+        self._map.close()
+
+    def find_rules(
+            self,
+            cidr: Optional[str] = None,
+            port: Optional[int] = None,
+            ip_protocol: Optional[str] = None,
+            egress: Optional[bool] = False
+    ) -> list[int]:
+        """
+        Returns the positions of the rules matching all the given criteria, scanning the columns of the snapshot.
+
+        :param cidr: The IPv4 or IPv6 CIDR of a range of the rule, e.g. 0.0.0.0/0.
+        :type cidr: str
+        :param port: A port opened by the rule. Rules for all protocols (-1) open every port.
+        :type port: int
+        :param ip_protocol: The protocol of the rule, e.g. tcp.
+        :type ip_protocol: str
+        :param egress: Flag to match outbound rules, inbound rules, or both if None.
+        :type egress: bool
+        :return: The rule positions, in snapshot order.
+        :rtype: list
+        """
+        _validate_type(cidr, Optional[str], 'cidr should be a string.')
+        _validate_type(port, Optional[int], 'port should be an integer.')
+        _validate_type(ip_protocol, Optional[str], 'ip_protocol should be a string.')
+        _validate_type(egress, Optional[bool], 'egress should be a boolean.')
+        if cidr is not None:
+            value = self._string_index(cidr)
+            if value is None:
+                return []
+            kinds, owners = self._columns['ranges.kind'], self._columns['ranges.rule']
+            candidates = list(dict.fromkeys(owners[row] for row in self._scan('ranges.value', value) if kinds[row] < 2))
+        else:
+            candidates = range(len(self._columns['rules.group']))
+        protocols = self._columns['rules.ip_protocol']
+        if ip_protocol is not None:
+            protocol = self._string_index(ip_protocol)
+            if protocol is None:
+                return []
+            candidates = [rule for rule in candidates if protocols[rule] == protocol]
+        if egress is not None:
+            flags = self._columns['rules.egress']
+            candidates = [rule for rule in candidates if flags[rule] == egress]
+        if port is not None:
+            every = self._string_index(_ALL_PROTOCOLS)
+            from_port, to_port = self._columns['rules.from_port'], self._columns['rules.to_port']
+            candidates = [
+                rule for rule in candidates
+                if protocols[rule] == every or from_port[rule] <= port <= to_port[rule]
+            ]
+        return list(candidates)
+
+    def find_security_groups(
+            self,
+            cidr: Optional[str] = None,
+            port: Optional[int] = None,
+            ip_protocol: Optional[str] = None,
+            egress: Optional[bool] = False
+    ) -> list[int]:
+        """
+        Returns the positions of the security groups holding a rule matching all the given criteria, e.g. the groups
+        opening port 22 to 0.0.0.0/0.
+
+        :param cidr: The IPv4 or IPv6 CIDR of a range of the rule.
+        :type cidr: str
+        :param port: A port opened by the rule.
+        :type port: int
+        :param ip_protocol: The protocol of the rule.
+        :type ip_protocol: str
+        :param egress: Flag to match outbound rules, inbound rules, or both if None.
+        :type egress: bool
+        :return: The security group positions, in snapshot order.
+        :rtype: list
+        """
+        groups = self._columns['rules.group']
+        return list(dict.fromkeys(groups[rule] for rule in self.find_rules(cidr, port, ip_protocol, egress)))
+
+    def find_users(self, access_key_id: str) -> list[int]:
+        """
+        Returns the positions of the users holding an access key.
+
+        :param access_key_id: The ID of the access key.
+        :type access_key_id: str
+        :return: The user positions, in snapshot order.
+        :rtype: list
+        """
+        _validate_type(access_key_id, str, 'access_key_id should be a string.')
+        value = self._string_index(access_key_id)
+        if value is None:
+            return []
+        owners = self._columns['keys.user']
+        return list(dict.fromkeys(owners[row] for row in self._scan('keys.id', value)))
+
+    def permission(self, rule: int) -> IPPermission:
+        """
+        Materializes a rule of the snapshot.
+
+        :param rule: The position of the rule.
+        :type rule: int
+        :return: The IPPermission instance.
+        :rtype: IPPermission
+        """
+        protocol, from_port, to_port, range_start, range_count, pair_start, pair_count = self._get(
+            'rules', rule, 'ip_protocol', 'from_port', 'to_port', 'range_start', 'range_count', 'pair_start',
+            'pair_count'
+        )
+        ranges: dict[str, list] = {}
+        for row in range(range_start, range_start + range_count):
+            kind, value, description = self._get('ranges', row, 'kind', 'value', 'description')
+            cls, field_name, _ = _RANGE_KINDS[kind]
+            ranges.setdefault(field_name, []).append(cls(self._string(value), self._string(description)))
+        pairs = [
+            UserIDGroupPair(*(self._string(value) for value in self._get('pairs', row, *_PAIR_FIELDS)))
+            for row in range(pair_start, pair_start + pair_count)
+        ]
+        return IPPermission(
+            from_port=from_port,
+            to_port=to_port,
+            ip_protocol=self._string(protocol),
+            user_id_group_pairs=pairs or None,
+            **ranges
+        )
+
+    def security_group(self, position: int) -> SecurityGroup:
+        """
+        Materializes a security group of the snapshot with its rules.
+
+        :param position: The position of the security group.
+        :type position: int
+        :return: The SecurityGroup instance.
+        :rtype: SecurityGroup
+        """
+        account, region, group_id, name, owner_id, vpc_id, description, tags, in_use, rule_start, rule_count = (
+            self._get('groups', position, *(name for name, _ in _TABLES['groups']))
+        )
+        permissions: tuple[list, list] = ([], [])
+        for rule in range(rule_start, rule_start + rule_count):
+            permissions[self._columns['rules.egress'][rule]].append(self.permission(rule))
+        return SecurityGroup(
+            account=self._account(account),
+            region=self._string(region),
+            id=self._string(group_id),
+            name=self._string(name),
+            owner_id=self._string(owner_id),
+            vpc_id=self._string(vpc_id),
+            ip_permissions=permissions[0] or None,
+            ip_permissions_egress=permissions[1] or None,
+            description=self._string(description),
+            tags=self._tags(tags),
+            in_use=None if in_use < 0 else bool(in_use)
+        )
+
+    def security_groups(self) -> Iterator[SecurityGroup]:
+        """
+        Materializes the security groups of the snapshot one at a time.
+
+        :return: The SecurityGroup instances, in snapshot order.
+        :rtype: Iterator
+        """
+        for position in range(self.security_group_count):
+            yield self.security_group(position)
+
+    def user(self, position: int) -> User:
+        """
+        Materializes a user of the snapshot with its login profile and access keys.
+
+        :param position: The position of the user.
+        :type position: int
+        :return: The User object.
+        :rtype: User
+        """
+        (
+            account, name, user_id, arn, path, created_date, password_last_used_date, boundary_type, boundary_arn,
+            login_profile, login_profile_created_date, tags, key_start, key_count
+        ) = self._get('users', position, *(name for name, _ in _TABLES['users']))
+        access_keys = []
+        for row in range(key_start, key_start + key_count):
+            key_id, status, key_created_date, last_used_date, service, region = self._get(
+                'keys', row, 'id', 'status', 'created_date', 'last_used_date', 'last_used_service', 'last_used_region'
+            )
+            access_keys.append(AccessKey(
+                id=self._string(key_id),
+                status=self._string(status),
+                created_date=_decode_date(key_created_date),
+                last_used_date=_decode_date(last_used_date),
+                last_used_service=self._string(service),
+                last_used_region=self._string(region)
+            ))
+        return User(
+            account=self._account(account),
+            name=self._string(name),
+            id=self._string(user_id),
+            arn=self._string(arn),
+            path=self._string(path),
+            created_date=_decode_date(created_date),
+            password_last_used_date=_decode_date(password_last_used_date),
+            permissions_boundary=PermissionsBoundary(
+                self._string(boundary_type), self._string(boundary_arn)
+            ) if boundary_type != _NONE else None,
+            login_profile=LoginProfile(
+                _decode_date(login_profile_created_date), None if login_profile == -1 else bool(login_profile)
+            ) if login_profile != -2 else None,
+            access_keys=access_keys or None,
+            tags=self._tags(tags)
+        )
+
+    def users(self) -> Iterator[User]:
+        """
+        Materializes the users of the snapshot one at a time.
+
+        :return: The User objects, in snapshot order.
+        :rtype: Iterator
+        """
+        for position in range(self.user_count):
+            yield self.user(position)
+
+    @property
+    def rule_count(self) -> int:
+        """
+        Returns the number of rules of the snapshot.
+
+        :return: The number of rules.
+        :rtype: int
+        """
+        return len(self._columns['rules.group'])
+
+    @property
+    def security_group_count(self) -> int:
+        """
+        Returns the number of security groups of the snapshot.
+
+        :return: The number of security groups.
+        :rtype: int
+        """
+        return len(self._columns['groups.id'])
+
+    @property
+    def user_count(self) -> int:
+        """
+        Returns the number of users of the snapshot.
+
+        :return: The number of users.
+        :rtype: int
+        """
+        return len(self._columns['users.id'])
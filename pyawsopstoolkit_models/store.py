@@ -0,0 +1,529 @@
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import LastUsed, Role
+from pyawsopstoolkit_models.iam.user import User
+
+Resource = Union[SecurityGroup, Role, User]
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS security_groups (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    vpc_id TEXT NOT NULL,
+    description TEXT,
+    tags TEXT,
+    in_use INTEGER,
+    ip_permissions INTEGER NOT NULL,
+    ip_permissions_egress INTEGER NOT NULL,
+    PRIMARY KEY (account, region, id)
+);
+CREATE TABLE IF NOT EXISTS rules (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    egress INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    ip_protocol TEXT NOT NULL,
+    from_port INTEGER NOT NULL,
+    to_port INTEGER NOT NULL,
+    ip_ranges INTEGER NOT NULL,
+    ipv6_ranges INTEGER NOT NULL,
+    prefix_lists INTEGER NOT NULL,
+    user_id_group_pairs INTEGER NOT NULL,
+    PRIMARY KEY (account, region, group_id, egress, position)
+);
+CREATE TABLE IF NOT EXISTS ranges (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    egress INTEGER NOT NULL,
+    rule INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    description TEXT,
+    PRIMARY KEY (account, region, group_id, egress, rule, kind, position)
+);
+CREATE TABLE IF NOT EXISTS pairs (
+    account TEXT NOT NULL,
+    region TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    egress INTEGER NOT NULL,
+    rule INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    pair_group_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    vpc_id TEXT NOT NULL,
+    description TEXT,
+    vpc_peering_connection_id TEXT,
+    PRIMARY KEY (account, region, group_id, egress, rule, position)
+);
+CREATE TABLE IF NOT EXISTS roles (
+    arn TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    max_session_duration INTEGER NOT NULL,
+    created_date TEXT,
+    assume_role_policy_document TEXT,
+    description TEXT,
+    permissions_boundary_type TEXT,
+    permissions_boundary_arn TEXT,
+    last_used_date TEXT,
+    last_used_region TEXT,
+    tags TEXT,
+    last_used INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    arn TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_date TEXT,
+    password_last_used_date TEXT,
+    permissions_boundary_type TEXT,
+    permissions_boundary_arn TEXT,
+    login_profile INTEGER NOT NULL,
+    login_profile_created_date TEXT,
+    password_reset_required INTEGER,
+    tags TEXT,
+    access_keys INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (
+    user_arn TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_date TEXT,
+    last_used_date TEXT,
+    last_used_service TEXT,
+    last_used_region TEXT,
+    PRIMARY KEY (user_arn, position)
+);
+CREATE INDEX IF NOT EXISTS security_groups_vpc_id ON security_groups (vpc_id);
+CREATE INDEX IF NOT EXISTS security_groups_name ON security_groups (name);
+CREATE INDEX IF NOT EXISTS rules_ports ON rules (from_port, to_port);
+CREATE INDEX IF NOT EXISTS ranges_value ON ranges (value);
+CREATE INDEX IF NOT EXISTS pairs_pair_group_id ON pairs (pair_group_id);
+CREATE INDEX IF NOT EXISTS roles_account ON roles (account);
+CREATE INDEX IF NOT EXISTS roles_name ON roles (name);
+CREATE INDEX IF NOT EXISTS users_account ON users (account);
+CREATE INDEX IF NOT EXISTS users_name ON users (name);
+CREATE INDEX IF NOT EXISTS keys_id ON keys (id);
+'''
+
+# Columns of each model class usable as query criteria, and the table holding them
+_TABLES: dict[type, tuple[str, tuple]] = {
+    SecurityGroup: ('security_groups', ('account', 'region', 'id', 'name', 'owner_id', 'vpc_id', 'in_use')),
+    Role: ('roles', (
+        'account', 'name', 'id', 'arn', 'path', 'permissions_boundary_arn', 'last_used_region'
+    )),
+    User: ('users', ('account', 'name', 'id', 'arn', 'path', 'permissions_boundary_arn', 'login_profile'))
+}
+# Criteria on the child rows of a model, as the EXISTS clause matching them
+_CHILD_CRITERIA: dict[type, dict[str, str]] = {
+    SecurityGroup: {
+        'cidr': 'EXISTS (SELECT 1 FROM ranges r WHERE r.account = t.account AND r.region = t.region AND '
+                'r.group_id = t.id AND r.kind IN (\'ipv4\', \'ipv6\') AND r.value {})',
+        'referenced_group_id': 'EXISTS (SELECT 1 FROM pairs p WHERE p.account = t.account AND p.region = t.region AND '
+                               'p.group_id = t.id AND p.pair_group_id {})'
+    },
+    Role: {},
+    User: {
+        'access_key_id': 'EXISTS (SELECT 1 FROM keys k WHERE k.user_arn = t.arn AND k.id {})'
+    }
+}
+_RANGE_KINDS = (
+    ('ipv4', 'ip_ranges', 'cidr_ip', 'IpRanges', 'CidrIp'),
+    ('ipv6', 'ipv6_ranges', 'cidr_ipv6', 'Ipv6Ranges', 'CidrIpv6'),
+    ('prefix', 'prefix_lists', 'id', 'PrefixListIds', 'PrefixListId')
+)
+
+# List fields of a rule, with their key in the response
+_RULE_LISTS = (
+    *((field_name, response_key) for _, field_name, _, response_key, _ in _RANGE_KINDS),
+    ('user_id_group_pairs', 'UserIdGroupPairs')
+)
+
+
+def _column(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    if hasattr(value, 'number'):
+        return value.number
+    return value
+
+
+def _date(value: Optional[str]) -> Optional[datetime]:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def _json(value) -> Optional[str]:
+    return None if value is None else json.dumps(value, separators=(',', ':'))
+
+
+def _present(data: dict) -> dict:
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def _restore(obj, values: dict) -> None:
+    # The from_response methods read empty lists and nested objects as missing, so the stored ones are set back.
+    for name, value in values.items():
+        if value is not None:
+            setattr(obj, name, value)
+
+
+class ModelStore:
+    """
+    A class representing a persistent store of security groups, roles and users in a SQLite database. Models are
+    stored in normalized tables of groups, rules, ranges, group pairs, roles, users and access keys, written in bulk
+    in one transaction per call, and queried through secondary indexes on the commonly filtered columns. Queried
+    models are rebuilt one at a time through the from_response methods, so that their values are validated again, and
+    flags stored with them restore the empty lists and nested objects that responses would leave out.
+    """
+
+    def __init__(self, path: str = ':memory:') -> None:
+        """
+        Initializes a new ModelStore object, creating the tables and indexes of the database if needed.
+
+        :param path: The path of the database file, or :memory: for a store kept in memory.
+        :type path: str
+        """
+        _validate_type(path, str, 'path should be a string.')
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'ModelStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @staticmethod
+    def _account(accounts: dict, number: str):
+        from pyawsopstoolkit.account import Account
+
+        account = accounts.get(number)
+        if account is None:
+            account = accounts[number] = Account(number)
+        return account
+
+    def _delete(self, security_groups: list[tuple], roles: list[tuple], users: list[tuple]) -> None:
+        for table in ('rules', 'ranges', 'pairs'):
+            self._connection.executemany(
+                f'DELETE FROM {table} WHERE account = ? AND region = ? AND group_id = ?', security_groups
+            )
+        self._connection.executemany(
+            'DELETE FROM security_groups WHERE account = ? AND region = ? AND id = ?', security_groups
+        )
+        self._connection.executemany('DELETE FROM roles WHERE arn = ?', roles)
+        self._connection.executemany('DELETE FROM keys WHERE user_arn = ?', users)
+        self._connection.executemany('DELETE FROM users WHERE arn = ?', users)
+
+    def _where(self, cls: type, criteria: dict) -> tuple[str, list]:
+        table, columns = _TABLES[cls]
+        clauses, parameters = [], []
+        for name, value in criteria.items():
+            if name in columns:
+                template = f't.{name} {{}}'
+            elif name in _CHILD_CRITERIA[cls]:
+                template = _CHILD_CRITERIA[cls][name]
+            else:
+                raise ValueError(f'{name} is not a queryable field of {cls.__name__}.')
+            if value is None:
+                clauses.append(template.format('IS NULL'))
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                values = [_column(item) for item in value]
+                clauses.append(template.format(f'IN ({", ".join("?" * len(values))})'))
+                parameters.extend(values)
+            else:
+                clauses.append(template.format('= ?'))
+                parameters.append(_column(value))
+        return f'FROM {table} t' + (f' WHERE {" AND ".join(clauses)}' if clauses else ''), parameters
+
+    def _find(self, query: str, parameters: list, build, lazy: bool, chunk_size: int) -> Iterator[Resource]:
+        cursor = self._connection.execute(query, parameters)
+        accounts: dict[str, Any] = {}
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if len(rows) == 0:
+                return
+            for row in rows:
+                yield build(row, accounts, lazy)
+
+    def _security_group(self, row: tuple, accounts: dict, lazy: bool) -> SecurityGroup:
+        (
+            account, region, group_id, name, owner_id, vpc_id, description, tags, in_use, ip_permissions,
+            ip_permissions_egress
+        ) = row
+        key = (account, region, group_id)
+        rules: dict[tuple, dict] = {}
+        lists: dict[tuple, tuple] = {}
+        for egress, position, ip_protocol, from_port, to_port, *present in self._connection.execute(
+                'SELECT egress, position, ip_protocol, from_port, to_port, ip_ranges, ipv6_ranges, prefix_lists, '
+                'user_id_group_pairs FROM rules WHERE account = ? AND region = ? AND group_id = ? '
+                'ORDER BY egress, position', key
+        ):
+            rules[(egress, position)] = {'IpProtocol': ip_protocol, 'FromPort': from_port, 'ToPort': to_port}
+            lists[(egress, position)] = tuple(present)
+        kinds = {kind: (response_key, value_key) for kind, _, _, response_key, value_key in _RANGE_KINDS}
+        for egress, rule, kind, value, range_description in self._connection.execute(
+                'SELECT egress, rule, kind, value, description FROM ranges '
+                'WHERE account = ? AND region = ? AND group_id = ? ORDER BY egress, rule, kind, position', key
+        ):
+            response_key, value_key = kinds[kind]
+            rules[(egress, rule)].setdefault(response_key, []).append(
+                _present({value_key: value, 'Description': range_description})
+            )
+        for row_pair in self._connection.execute(
+                'SELECT egress, rule, pair_group_id, name, status, user_id, vpc_id, description, '
+                'vpc_peering_connection_id FROM pairs WHERE account = ? AND region = ? AND group_id = ? '
+                'ORDER BY egress, rule, position', key
+        ):
+            rules[(row_pair[0], row_pair[1])].setdefault('UserIdGroupPairs', []).append(_present(dict(zip(
+                ('GroupId', 'GroupName', 'PeeringStatus', 'UserId', 'VpcId', 'Description', 'VpcPeeringConnectionId'),
+                row_pair[2:]
+            ))))
+        data = {
+            'GroupId': group_id, 'GroupName': name, 'OwnerId': owner_id, 'VpcId': vpc_id, 'Description': description,
+            'Tags': json.loads(tags) if tags is not None else None,
+            'IpPermissions': [rule for (egress, _), rule in rules.items() if not egress],
+            'IpPermissionsEgress': [rule for (egress, _), rule in rules.items() if egress]
+        }
+        security_group = SecurityGroup.from_response(self._account(accounts, account), region, data, lazy=lazy)
+        _restore(security_group, {
+            'tags': [] if tags == '[]' else None,
+            'in_use': bool(in_use) if in_use is not None else None,
+            'ip_permissions': [] if ip_permissions and not data['IpPermissions'] else None,
+            'ip_permissions_egress': [] if ip_permissions_egress and not data['IpPermissionsEgress'] else None
+        })
+        for (egress, position), present in lists.items():
+            rule = rules[(egress, position)]
+            empty = {
+                field_name: [] for (field_name, response_key), is_present in zip(_RULE_LISTS, present)
+                if is_present and response_key not in rule
+            }
+            if empty:
+                # The rules are converted to set back their empty lists, even in lazy mode.
+                permissions = security_group.ip_permissions_egress if egress else security_group.ip_permissions
+                _restore(permissions[position], empty)
+        return security_group
+
+    def _role(self, row: tuple, accounts: dict, lazy: bool) -> Role:
+        (
+            arn, account, name, role_id, path, max_session_duration, created_date, document, description,
+            boundary_type, boundary_arn, last_used_date, last_used_region, tags, last_used
+        ) = row
+        data = {
+            'RoleName': name, 'RoleId': role_id, 'Arn': arn, 'Path': path, 'MaxSessionDuration': max_session_duration,
+            'CreateDate': _date(created_date),
+            'AssumeRolePolicyDocument': json.loads(document) if document is not None else None,
+            'Description': description, 'Tags': json.loads(tags) if tags is not None else None,
+            'PermissionsBoundary': _present({
+                'PermissionsBoundaryType': boundary_type, 'PermissionsBoundaryArn': boundary_arn
+            }),
+            'RoleLastUsed': _present({'LastUsedDate': _date(last_used_date), 'Region': last_used_region})
+        }
+        role = Role.from_response(self._account(accounts, account), data, lazy=lazy)
+        _restore(role, {
+            'tags': [] if tags == '[]' else None,
+            'last_used': LastUsed() if last_used and not data['RoleLastUsed'] else None
+        })
+        return role
+
+    def _user(self, row: tuple, accounts: dict, lazy: bool) -> User:
+        (
+            arn, account, name, user_id, path, created_date, password_last_used_date, boundary_type, boundary_arn,
+            login_profile, login_profile_created_date, password_reset_required, tags, access_keys
+        ) = row
+        keys = [
+            {
+                'AccessKeyId': key_id, 'Status': status, 'CreateDate': _date(key_created_date),
+                'AccessKeyLastUsed': _present({
+                    'LastUsedDate': _date(key_last_used_date), 'ServiceName': service, 'Region': region
+                })
+            } for key_id, status, key_created_date, key_last_used_date, service, region in self._connection.execute(
+                'SELECT id, status, created_date, last_used_date, last_used_service, last_used_region FROM keys '
+                'WHERE user_arn = ? ORDER BY position', (arn,)
+            )
+        ]
+        data = {
+            'UserName': name, 'UserId': user_id, 'Arn': arn, 'Path': path, 'CreateDate': _date(created_date),
+            'PasswordLastUsed': _date(password_last_used_date), 'Tags': json.loads(tags) if tags is not None else None,
+            'PermissionsBoundary': _present({
+                'PermissionsBoundaryType': boundary_type, 'PermissionsBoundaryArn': boundary_arn
+            }),
+            'LoginProfile': {
+                'CreateDate': _date(login_profile_created_date),
+                'PasswordResetRequired': bool(password_reset_required) if password_reset_required is not None else None
+            } if login_profile else None,
+            'AccessKeys': keys
+        }
+        user = User.from_response(self._account(accounts, account), data, lazy=lazy)
+        _restore(user, {
+            'tags': [] if tags == '[]' else None,
+            'access_keys': [] if access_keys and not keys else None
+        })
+        return user
+
+    @staticmethod
+    def _security_group_rows(security_group: SecurityGroup, rows: dict[str, list[tuple]]) -> None:
+        key = (security_group.account.number, security_group.region, security_group.id)
+        rows['security_groups'].append((
+            *key, security_group.name, security_group.owner_id, security_group.vpc_id, security_group.description,
+            _json(security_group.tags), _column(security_group.in_use), int(security_group.ip_permissions is not None),
+            int(security_group.ip_permissions_egress is not None)
+        ))
+        for egress, permissions in ((0, security_group.ip_permissions), (1, security_group.ip_permissions_egress)):
+            for position, permission in enumerate(permissions or []):
+                rows['rules'].append((
+                    *key, egress, position, permission.ip_protocol, permission.from_port, permission.to_port,
+                    *(int(getattr(permission, field_name) is not None) for field_name, _ in _RULE_LISTS)
+                ))
+                for kind, field_name, value_name, _, _ in _RANGE_KINDS:
+                    for index, item in enumerate(getattr(permission, field_name) or []):
+                        rows['ranges'].append((
+                            *key, egress, position, kind, index, getattr(item, value_name), item.description
+                        ))
+                for index, pair in enumerate(permission.user_id_group_pairs or []):
+                    rows['pairs'].append((
+                        *key, egress, position, index, pair.id, pair.name, pair.status, pair.user_id, pair.vpc_id,
+                        pair.description, pair.vpc_peering_connection_id
+                    ))
+
+    @staticmethod
+    def _role_row(role: Role) -> tuple:
+        boundary, last_used = role.permissions_boundary, role.last_used
+        return (
+            role.arn, role.account.number, role.name, role.id, role.path, role.max_session_duration,
+            _column(role.created_date), _json(role.assume_role_policy_document), role.description,
+            boundary.type if boundary else None, boundary.arn if boundary else None,
+            _column(last_used.used_date) if last_used else None, last_used.region if last_used else None,
+            _json(role.tags), int(last_used is not None)
+        )
+
+    @staticmethod
+    def _user_rows(user: User, rows: dict[str, list[tuple]]) -> None:
+        boundary, login_profile = user.permissions_boundary, user.login_profile
+        rows['users'].append((
+            user.arn, user.account.number, user.name, user.id, user.path, _column(user.created_date),
+            _column(user.password_last_used_date), boundary.type if boundary else None,
+            boundary.arn if boundary else None, int(login_profile is not None),
+            _column(login_profile.created_date) if login_profile else None,
+            _column(login_profile.password_reset_required) if login_profile else None, _json(user.tags),
+            int(user.access_keys is not None)
+        ))
+        for position, key in enumerate(user.access_keys or []):
+            rows['keys'].append((
+                user.arn, position, key.id, key.status, _column(key.created_date), _column(key.last_used_date),
+                key.last_used_service, key.last_used_region
+            ))
+
+    def close(self) -> None:
+        """
+        Closes the database connection of the store.
+        """
+        self._connection.close()
+
+    def count(self, cls: type, **criteria) -> int:
+        """
+        Returns the number of stored models of a class matching the criteria, without rebuilding them.
+
+        :param cls: The model class, i.e. SecurityGroup, Role or User.
+        :type cls: type
+        :param criteria: The criteria, as for find.
+        :return: The number of matching models.
+        :rtype: int
+        """
+        if cls not in _TABLES:
+            raise TypeError('cls should be SecurityGroup, Role or User.')
+        clause, parameters = self._where(cls, criteria)
+        return self._connection.execute(f'SELECT COUNT(*) {clause}', parameters).fetchone()[0]
+
+    def delete(self, resources: Iterable[Resource]) -> None:
+        """
+        Deletes security groups, roles and users from the store, with their rules, ranges, group pairs and access keys.
+        Resources that are not stored are ignored.
+
+        :param resources: The resources to delete.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        security_groups, roles, users = [], [], []
+        for resource in resources:
+            _validate_type(resource, Resource, 'resources should be a list of SecurityGroup, Role or User objects.')
+            if isinstance(resource, SecurityGroup):
+                security_groups.append((resource.account.number, resource.region, resource.id))
+            else:
+                (roles if isinstance(resource, Role) else users).append((resource.arn,))
+        with self._connection:
+            self._delete(security_groups, roles, users)
+
+    def find(self, cls: type, lazy: bool = False, chunk_size: int = 500, **criteria) -> Iterator[Resource]:
+        """
+        Returns the stored models of a class matching the criteria, rebuilt one at a time as the iterator advances.
+        Each criterion is a column of the model, e.g. account, region, vpc_id or name, matched against a value, a list
+        of values, or None for missing values. Security groups can also be matched by the CIDR of a rule (cidr) or a
+        referenced group (referenced_group_id), and users by the ID of an access key (access_key_id).
+
+        :param cls: The model class, i.e. SecurityGroup, Role or User.
+        :type cls: type
+        :param lazy: Flag to convert the nested objects of the rebuilt models on first access.
+        :type lazy: bool
+        :param chunk_size: The number of rows read from the database at a time.
+        :type chunk_size: int
+        :param criteria: The values of the columns to match.
+        :return: The matching models, in storage order.
+        :rtype: Iterator
+        """
+        if cls not in _TABLES:
+            raise TypeError('cls should be SecurityGroup, Role or User.')
+        _validate_type(lazy, bool, 'lazy should be a boolean.')
+        _validate_type(chunk_size, int, 'chunk_size should be an integer.')
+        clause, parameters = self._where(cls, criteria)
+        build = {SecurityGroup: self._security_group, Role: self._role, User: self._user}[cls]
+        return self._find(f'SELECT t.* {clause} ORDER BY t.rowid', parameters, build, lazy, chunk_size)
+
+    def save(self, resources: Iterable[Resource]) -> None:
+        """
+        Inserts or replaces security groups, roles and users in one transaction, writing each table with one batch
+        statement. Stored models are identified by account, region and ID for security groups, and by ARN for roles
+        and users; the rules and access keys of a replaced model are replaced as well.
+
+        :param resources: The resources to save.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        rows: dict[str, list[tuple]] = {
+            table: [] for table in ('security_groups', 'rules', 'ranges', 'pairs', 'roles', 'users', 'keys')
+        }
+        for resource in resources:
+            _validate_type(resource, Resource, 'resources should be a list of SecurityGroup, Role or User objects.')
+            if isinstance(resource, SecurityGroup):
+                self._security_group_rows(resource, rows)
+            elif isinstance(resource, Role):
+                rows['roles'].append(self._role_row(resource))
+            else:
+                self._user_rows(resource, rows)
+        with self._connection:
+            self._delete(
+                [row[:3] for row in rows['security_groups']], [row[:1] for row in rows['roles']],
+                [row[:1] for row in rows['users']]
+            )
+            for table, table_rows in rows.items():
+                if table_rows:
+                    self._connection.executemany(
+                        f'INSERT OR REPLACE INTO {table} VALUES ({", ".join("?" * len(table_rows[0]))})', table_rows
+                    )
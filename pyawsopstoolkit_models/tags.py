@@ -0,0 +1,206 @@
+from types import MappingProxyType
+from typing import Iterable, Optional, Union
+
+from pyawsopstoolkit_models.__interning__ import _SharedList
+from pyawsopstoolkit_models.__tracking__ import _listen
+from pyawsopstoolkit_models.__validation__ import _validate_type
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+Resource = Union[SecurityGroup, Role, User]
+
+_EMPTY = MappingProxyType({})
+
+
+def tag_map(tags: Optional[list]) -> MappingProxyType:
+    """
+    Returns the read-only mapping of tag keys to values of a list of tags in the {'Key': ..., 'Value': ...} format of
+    AWS responses. Items without a key are ignored, and the last value wins for repeated keys. The mapping of a shared
+    tag list is computed once for all the resources holding it.
+
+    :param tags: The list of tags.
+    :type tags: list
+    :return: The tag values keyed by tag key.
+    :rtype: MappingProxyType
+    """
+    if not tags:
+        return _EMPTY
+    shared = isinstance(tags, _SharedList)
+    if shared and '_tag_map' in tags.__dict__:
+        return tags.__dict__['_tag_map']
+    mapping = MappingProxyType({
+        tag['Key']: tag.get('Value') for tag in tags if isinstance(tag, dict) and 'Key' in tag
+    })
+    if shared:
+        tags.__dict__['_tag_map'] = mapping
+    return mapping
+
+
+class TagIndex:
+    """
+    A class representing an inverted index from tag keys and key/value pairs to the security groups, roles and users
+    holding them, answering conjunctive tag queries by intersecting the smallest posting first. The index is updated
+    when the tags of an indexed resource are reassigned or changed in place through a tracked list.
+    """
+
+    def __init__(self, resources: Optional[Iterable[Resource]] = None) -> None:
+        """
+        Initializes a new TagIndex object, optionally populated with the given resources.
+
+        :param resources: The security groups, roles and users to add to the index.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        self._resources: dict[int, Resource] = {}
+        self._positions: dict[int, int] = {}
+        self._entries: dict[int, MappingProxyType] = {}
+        self._by_key: dict[str, dict[int, Resource]] = {}
+        self._by_pair: dict[tuple, dict[int, Resource]] = {}
+        self._counter = 0
+        for cls in (SecurityGroup, Role, User):
+            _listen(cls, 'tags', self._tags_changed)
+        if resources is not None:
+            self.extend(resources)
+
+    def __contains__(self, resource: object) -> bool:
+        return self._resources.get(id(resource)) is resource
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def _add(self, key: int, resource: Resource) -> None:
+        # Invalid values are indexed as untagged until the validation of the assignment raises.
+        tags = resource.tags
+        mapping = resource.tag_map if isinstance(tags, (list, type(None))) else _EMPTY
+        self._entries[key] = mapping
+        for tag_key, value in mapping.items():
+            self._by_key.setdefault(tag_key, {})[key] = resource
+            self._by_pair.setdefault((tag_key, value), {})[key] = resource
+
+    def _remove(self, key: int) -> None:
+        for tag_key, value in self._entries.pop(key).items():
+            for postings, posting_key in ((self._by_key, tag_key), (self._by_pair, (tag_key, value))):
+                group = postings[posting_key]
+                del group[key]
+                if len(group) == 0:
+                    del postings[posting_key]
+
+    def _tags_changed(self, resource: Resource, field_name: str) -> None:
+        key = id(resource)
+        if self._resources.get(key) is resource:
+            self._remove(key)
+            self._add(key, resource)
+
+    def add_resource(self, resource: Resource) -> None:
+        """
+        Adds a security group, role or user to the index.
+
+        :param resource: The resource to add.
+        :type resource: SecurityGroup | Role | User
+        """
+        _validate_type(resource, Resource, 'resource should be of SecurityGroup, Role or User type.')
+        key = id(resource)
+        if key in self._resources:
+            raise ValueError(f'resource {getattr(resource, "arn", None) or resource.id} is already indexed.')
+        self._add(key, resource)
+        self._resources[key] = resource
+        self._positions[key] = self._counter
+        self._counter += 1
+
+    def extend(self, resources: Iterable[Resource]) -> None:
+        """
+        Adds security groups, roles and users to the index.
+
+        :param resources: The resources to add.
+        :type resources: Iterable[SecurityGroup | Role | User]
+        """
+        for resource in resources:
+            self.add_resource(resource)
+
+    def remove_resource(self, resource: Resource) -> None:
+        """
+        Removes a security group, role or user from the index.
+
+        :param resource: The resource to remove.
+        :type resource: SecurityGroup | Role | User
+        """
+        if resource not in self:
+            raise KeyError(getattr(resource, 'arn', None) or getattr(resource, 'id', resource))
+        key = id(resource)
+        self._remove(key)
+        del self._resources[key]
+        del self._positions[key]
+
+    def count(self, tag_key: str, value: Optional[str] = None) -> int:
+        """
+        Returns the number of resources holding a tag key, or a tag key with the given value, without building the
+        list of resources.
+
+        :param tag_key: The tag key.
+        :type tag_key: str
+        :param value: The tag value, or None for any value.
+        :type value: str
+        :return: The number of matching resources.
+        :rtype: int
+        """
+        posting = self._by_key.get(tag_key) if value is None else self._by_pair.get((tag_key, value))
+        return len(posting) if posting is not None else 0
+
+    def find(self, tags: dict[str, Optional[str]]) -> list[Resource]:
+        """
+        Returns the resources holding all the given tags. A tag given with the value None matches any value of the key.
+
+        :param tags: The tag values keyed by tag key, or None for any value.
+        :type tags: dict
+        :return: The matching resources, in index order. All indexed resources are returned for an empty query.
+        :rtype: list
+        """
+        _validate_type(tags, dict, 'tags should be of dict type.')
+        if len(tags) == 0:
+            return list(self._resources.values())
+        postings = []
+        for tag_key, value in tags.items():
+            posting = self._by_key.get(tag_key) if value is None else self._by_pair.get((tag_key, value))
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        first, others = postings[0], postings[1:]
+        keys = [key for key in first if all(key in other for other in others)]
+        keys.sort(key=self._positions.__getitem__)
+        return [first[key] for key in keys]
+
+    def find_missing(self, tag_key: str) -> list[Resource]:
+        """
+        Returns the resources without the given tag key, e.g. to find resources missing a mandatory tag.
+
+        :param tag_key: The tag key.
+        :type tag_key: str
+        :return: The resources, in index order.
+        :rtype: list
+        """
+        posting = self._by_key.get(tag_key, {})
+        return [resource for key, resource in self._resources.items() if key not in posting]
+
+    def keys(self) -> list[str]:
+        """
+        Returns the tag keys held by at least one indexed resource.
+
+        :return: The tag keys.
+        :rtype: list
+        """
+        return list(self._by_key)
+
+    def values(self, tag_key: str) -> dict[Optional[str], int]:
+        """
+        Returns the values of a tag key with the number of resources holding each value.
+
+        :param tag_key: The tag key.
+        :type tag_key: str
+        :return: The number of resources keyed by tag value.
+        :rtype: dict
+        """
+        return {
+            value: len(self._by_pair[(tag_key, value)])
+            for value in dict.fromkeys(self._entries[key][tag_key] for key in self._by_key.get(tag_key, {}))
+        }
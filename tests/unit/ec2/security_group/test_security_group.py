@@ -277,6 +277,176 @@ class TestSecurityGroup(unittest.TestCase):
         }
         self.assertDictEqual(self.security_group.to_dict(), expected_dict)
 
+    def test_shared_tags(self):
+        self.assertIs(self.security_group_with_tags.tags, self.security_group_full.tags)
+        self.assertIsNot(self.security_group_full.tags, self.params['tags'])
+        with self.assertRaises(TypeError):
+            self.security_group_full.tags.append({'Key': 'other_key', 'Value': 'other_value'})
+        tags = self.security_group_full.to_dict()['tags']
+        tags.append({'Key': 'other_key', 'Value': 'other_value'})
+        tags[0]['Value'] = 'other_value'
+        self.assertEqual(self.security_group_full.tags, self.params['tags'])
+
+    def test_fingerprint(self):
+        from pyawsopstoolkit_models.ec2.security_group import IPRange
+
+        fingerprint = self.security_group_full.fingerprint
+        self.assertEqual(self.security_group_full.fingerprint, fingerprint)
+        self.assertEqual(self.create_security_group(
+            ip_permissions=[IPPermission(80, 80, 'tcp')],
+            ip_permissions_egress=[IPPermission(443, 443, 'tcp')],
+            description=self.params['description'],
+            tags=self.params['tags'],
+            in_use=self.params['in_use']
+        ).fingerprint, fingerprint)
+        self.assertNotEqual(self.security_group.fingerprint, fingerprint)
+
+        self.security_group_full.in_use = False
+        self.assertNotEqual(self.security_group_full.fingerprint, fingerprint)
+        self.security_group_full.in_use = True
+        self.assertEqual(self.security_group_full.fingerprint, fingerprint)
+
+        permission = self.security_group_full.ip_permissions[0]
+        permission_fingerprint = permission.fingerprint
+        egress_fingerprint = self.security_group_full.ip_permissions_egress[0].fingerprint
+        permission.ip_ranges = [IPRange('10.0.0.0/8')]
+        self.assertNotEqual(permission.fingerprint, permission_fingerprint)
+        self.assertNotEqual(self.security_group_full.fingerprint, fingerprint)
+        self.assertEqual(self.security_group_full.ip_permissions_egress[0].fingerprint, egress_fingerprint)
+
+        permission.ip_ranges[0].cidr_ip = '10.0.0.0/16'
+        changed = self.security_group_full.fingerprint
+        permission.ip_ranges[0].cidr_ip = '10.0.0.0/8'
+        self.assertNotEqual(self.security_group_full.fingerprint, changed)
+
+    def test_fingerprint_in_place(self):
+        from pyawsopstoolkit_models.ec2.security_group import IPRange
+
+        ip_permissions = [IPPermission(80, 80, 'tcp', ip_ranges=[])]
+        security_group = self.create_security_group(ip_permissions=ip_permissions)
+        fingerprint = security_group.fingerprint
+        self.assertIs(security_group.ip_permissions, ip_permissions)
+        ip_permissions.append(IPPermission(22, 22, 'tcp'))
+        appended = security_group.fingerprint
+        self.assertNotEqual(appended, fingerprint)
+        security_group.ip_permissions[0].ip_ranges.append(IPRange('0.0.0.0/0'))
+        self.assertNotEqual(security_group.fingerprint, appended)
+        del security_group.ip_permissions[1]
+        security_group.ip_permissions[0].ip_ranges.clear()
+        self.assertEqual(security_group.fingerprint, fingerprint)
+
+    def test_fingerprint_ignores_order(self):
+        first, second = IPPermission(80, 80, 'tcp'), IPPermission(443, 443, 'tcp')
+        self.assertEqual(
+            self.create_security_group(ip_permissions=[first, second]).fingerprint,
+            self.create_security_group(ip_permissions=[second, first]).fingerprint
+        )
+        self.assertNotEqual(
+            self.create_security_group(ip_permissions=[first, second]).fingerprint,
+            self.create_security_group(ip_permissions_egress=[first, second]).fingerprint
+        )
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+
+        fingerprint = self.security_group_full.fingerprint
+        for security_group in (
+                copy.copy(self.security_group_full),
+                copy.deepcopy(self.security_group_full),
+                pickle.loads(pickle.dumps(self.security_group_full))
+        ):
+            with self.subTest(security_group=security_group):
+                self.assertEqual(security_group, self.security_group_full)
+                self.assertEqual(security_group.fingerprint, fingerprint)
+                security_group.name = 'copy'
+                self.assertNotEqual(security_group.fingerprint, fingerprint)
+                self.assertEqual(self.security_group_full.fingerprint, fingerprint)
+
+    def test_cache_dict(self):
+        import copy
+        import json
+
+        from pyawsopstoolkit_models.ec2.security_group import IPRange
+
+        expected_dict = self.security_group_full.to_dict()
+        self.security_group_full.cache_dict()
+        cached = self.security_group_full.to_dict()
+        self.assertEqual(cached['id'], expected_dict['id'])
+        self.assertEqual(list(cached), list(expected_dict))
+        self.assertEqual(cached['ip_permissions'][0]['from_port'], 80)
+        self.assertIsNone(cached['ip_permissions'][0]['ip_ranges'])
+        self.assertIs(self.security_group_full.to_dict(), cached)
+        with self.assertRaises(TypeError):
+            cached['id'] = 'sg-87654321'
+        with self.assertRaises(TypeError):
+            cached['ip_permissions'][0]['from_port'] = 22
+        self.assertIsInstance(cached, dict)
+        self.assertEqual(json.loads(json.dumps(cached)), json.loads(json.dumps(expected_dict)))
+        duplicate = copy.deepcopy(cached)
+        duplicate['ip_permissions'][0]['from_port'] = 22
+        self.assertEqual(cached['ip_permissions'][0]['from_port'], 80)
+
+        egress = cached['ip_permissions_egress']
+        self.security_group_full.name = 'load-balancers-sg'
+        updated = self.security_group_full.to_dict()
+        self.assertIsNot(updated, cached)
+        self.assertEqual(updated['name'], 'load-balancers-sg')
+        self.assertIs(updated['ip_permissions_egress'], egress)
+
+        self.security_group_full.ip_permissions[0].ip_ranges = [IPRange('10.0.0.0/8')]
+        ip_permissions = self.security_group_full.to_dict()['ip_permissions']
+        self.assertEqual(ip_permissions[0]['ip_ranges'][0]['cidr_ip'], '10.0.0.0/8')
+        self.security_group_full.ip_permissions_egress.append(IPPermission(22, 22, 'tcp'))
+        self.assertEqual(len(self.security_group_full.to_dict()['ip_permissions_egress']), 2)
+        self.assertEqual(len(self.params['ip_permissions_egress']), 1)
+        with self.assertRaises(TypeError):
+            self.security_group_full.ip_permissions_egress[0] = 'rule'
+        self.security_group_full.ip_permissions_egress[0] = IPPermission(443, 443, 'tcp')
+
+        self.security_group_full.cache_dict(False)
+        self.assertIsInstance(self.security_group_full.to_dict(), dict)
+
+    def test_from_response(self):
+        response = {
+            'GroupId': self.params['id'],
+            'GroupName': self.params['name'],
+            'OwnerId': self.params['owner_id'],
+            'VpcId': self.params['vpc_id'],
+            'Description': self.params['description'],
+            'Tags': self.params['tags'],
+            'IpPermissions': [{
+                'IpProtocol': 'tcp', 'FromPort': 80, 'ToPort': 80, 'IpRanges': [{'CidrIp': '0.0.0.0/0'}],
+                'Ipv6Ranges': [], 'PrefixListIds': [{'PrefixListId': 'pl-12345678'}],
+                'UserIdGroupPairs': [{'GroupId': 'sg-87654321', 'UserId': '123456789012'}]
+            }],
+            'IpPermissionsEgress': [{'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0', 'Description': 'all'}]}]
+        }
+        account, region = self.params['account'], self.params['region']
+        security_group = SecurityGroup.from_response(account, region, response)
+        lazy = SecurityGroup.from_response(account, region, response, lazy=True)
+        self.assertNotIn('ip_permissions', vars(lazy))
+        self.assertEqual(lazy.vpc_id, self.params['vpc_id'])
+        self.assertEqual(lazy, security_group)
+        self.assertIsNone(security_group.ip_permissions[0].ipv6_ranges)
+        self.assertEqual(security_group.ip_permissions[0].user_id_group_pairs[0].name, '')
+        self.assertEqual(security_group.ip_permissions_egress[0].from_port, -1)
+        self.assertEqual(lazy.ip_permissions_egress[0].ip_ranges[0].description, 'all')
+
+        lazy = SecurityGroup.from_response(account, region, response, lazy=True)
+        permissions = lazy.ip_permissions
+        self.assertIs(lazy.ip_permissions, permissions)
+        self.assertNotIn('ip_ranges', vars(permissions[0]))
+        self.assertEqual(lazy.to_dict(), security_group.to_dict())
+        lazy = SecurityGroup.from_response(account, region, response, lazy=True)
+        lazy.ip_permissions = None
+        self.assertIsNone(lazy.ip_permissions)
+        empty = SecurityGroup.from_response(account, region, {**response, 'IpPermissions': []})
+        self.assertIsNone(empty.ip_permissions)
+        invalid = SecurityGroup.from_response(account, region, {**response, 'IpPermissions': [{'IpProtocol': 6}]}, True)
+        with self.assertRaises(TypeError):
+            invalid.ip_permissions
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from pyawsopstoolkit_models.ec2.exposure import SecurityGroupRuleTable, find_world_open_ingress
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, IPRange, IPv6Range, SecurityGroup
+
+
+class TestSecurityGroupRuleTable(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.ssh = IPPermission(22, 22, 'tcp', ip_ranges=[IPRange('0.0.0.0/0'), IPRange('10.0.0.0/8')])
+        self.https = IPPermission(443, 443, 'tcp', ip_ranges=[IPRange('0.0.0.0/0')], ipv6_ranges=[IPv6Range('::/0')])
+        self.database = IPPermission(3000, 4000, 'tcp', ipv6_ranges=[IPv6Range('::/0')])
+        self.everything = IPPermission(-1, -1, '-1', ip_ranges=[IPRange('0.0.0.0/0')])
+        self.icmp = IPPermission(8, -1, 'icmp', ip_ranges=[IPRange('0.0.0.0/0')])
+        self.egress = IPPermission(22, 22, 'tcp', ip_ranges=[IPRange('0.0.0.0/0')])
+        self.params = {
+            'account': Account('123456789012'),
+            'region': 'eu-west-1',
+            'name': 'web-servers-sg',
+            'owner_id': '123456789012',
+            'vpc_id': 'vpc-abcdefgh'
+        }
+        self.web = SecurityGroup(
+            id='sg-web', ip_permissions=[self.ssh, self.https, self.icmp], ip_permissions_egress=[self.egress],
+            **self.params
+        )
+        self.db = SecurityGroup(id='sg-db', ip_permissions=[self.database, self.everything], **self.params)
+        self.empty = SecurityGroup(id='sg-empty', **self.params)
+        self.table = SecurityGroupRuleTable([self.web, self.db, self.empty])
+
+    def test_initialization(self):
+        self.assertEqual(len(self.table), 8)
+        self.assertEqual(self.table.security_groups, [self.web, self.db, self.empty])
+        self.assertEqual(len(self.table.permissions), 6)
+        self.assertEqual(list(self.table.from_port), [22, 22, 443, 443, 8, 22, 3000, -1])
+        self.assertEqual(self.table.cidr[:3], ['0.0.0.0/0', '10.0.0.0/8', '0.0.0.0/0'])
+
+    def test_initialization_empty(self):
+        table = SecurityGroupRuleTable()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.find_world_open(), [])
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            SecurityGroupRuleTable(['sg-web'])
+
+    def test_find_world_open(self):
+        findings = self.table.find_world_open()
+        self.assertEqual(
+            [(f.security_group.id, f.from_port, f.to_port, f.cidr) for f in findings],
+            [('sg-web', 22, 22, '0.0.0.0/0'), ('sg-db', 3000, 4000, '::/0'), ('sg-db', -1, -1, '0.0.0.0/0')]
+        )
+        self.assertIs(findings[0].permission, self.ssh)
+        self.assertFalse(findings[0].egress)
+
+    def test_find_world_open_with_ports(self):
+        findings = self.table.find_world_open([443])
+        self.assertEqual(
+            [(f.security_group.id, f.ip_protocol, f.cidr) for f in findings],
+            [('sg-web', 'tcp', '0.0.0.0/0'), ('sg-web', 'tcp', '::/0'), ('sg-db', '-1', '0.0.0.0/0')]
+        )
+        self.assertEqual(len(self.table.find_world_open(None)), 6)
+
+    def test_find_world_open_egress(self):
+        findings = self.table.find_world_open(egress=True)
+        self.assertEqual(len(findings), 1)
+        self.assertIs(findings[0].permission, self.egress)
+        self.assertTrue(findings[0].egress)
+
+    def test_find_world_open_ingress(self):
+        expected = [(f.permission, f.cidr) for f in self.table.find_world_open()]
+        self.assertEqual([(f.permission, f.cidr) for f in find_world_open_ingress(self.table)], expected)
+        self.assertEqual([(f.permission, f.cidr) for f in find_world_open_ingress([self.web, self.db])], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
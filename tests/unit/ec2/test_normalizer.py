@@ -0,0 +1,130 @@
+import unittest
+
+from pyawsopstoolkit_models.ec2.normalizer import normalize_permissions, normalize_security_group
+from pyawsopstoolkit_models.ec2.security_group import (
+    IPPermission, IPRange, IPv6Range, PrefixList, SecurityGroup, UserIDGroupPair
+)
+
+
+class TestNormalizer(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.pair = UserIDGroupPair('sg-lb', 'lb', 'active', '123456789012', 'vpc-abcdefgh')
+        self.params = {
+            'account': Account('123456789012'),
+            'region': 'eu-west-1',
+            'id': 'sg-12345678',
+            'name': 'web-servers-sg',
+            'owner_id': '123456789012',
+            'vpc_id': 'vpc-abcdefgh'
+        }
+
+    @staticmethod
+    def summarize(permissions):
+        return [
+            (
+                permission.ip_protocol, permission.from_port, permission.to_port,
+                [ip_range.cidr_ip for ip_range in permission.ip_ranges or []],
+                [ip_range.cidr_ipv6 for ip_range in permission.ipv6_ranges or []],
+                [prefix_list.id for prefix_list in permission.prefix_lists or []],
+                [pair.id for pair in permission.user_id_group_pairs or []]
+            ) for permission in permissions
+        ]
+
+    def test_empty(self):
+        self.assertEqual(normalize_permissions(None), ([], []))
+        normalized, redundant = normalize_permissions([IPPermission(80, 80, 'tcp')])
+        self.assertEqual(normalized, [])
+        self.assertEqual([(rule.source, rule.reason) for rule in redundant], [(None, 'empty')])
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            normalize_permissions(['rule'])
+        with self.assertRaises(TypeError):
+            normalize_security_group('sg-12345678')
+
+    def test_port_merging(self):
+        normalized, redundant = normalize_permissions([
+            IPPermission(80, 80, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')]),
+            IPPermission(81, 90, '6', ip_ranges=[IPRange('10.0.0.0/8')]),
+            IPPermission(85, 100, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')]),
+            IPPermission(200, 300, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')]),
+            IPPermission(80, 80, 'udp', ip_ranges=[IPRange('10.0.0.0/8')])
+        ])
+        self.assertEqual(
+            self.summarize(normalized),
+            [
+                ('tcp', 80, 100, ['10.0.0.0/8'], [], [], []),
+                ('tcp', 200, 300, ['10.0.0.0/8'], [], [], []),
+                ('udp', 80, 80, ['10.0.0.0/8'], [], [], [])
+            ]
+        )
+        self.assertEqual(redundant, [])
+
+    def test_cidr_aggregation(self):
+        normalized, redundant = normalize_permissions([
+            IPPermission(443, 443, 'tcp', ip_ranges=[IPRange('10.0.0.0/25', 'a'), IPRange('10.0.0.128/25')]),
+            IPPermission(443, 443, 'tcp', ip_ranges=[IPRange('192.168.1.0/24', 'office')]),
+            IPPermission(443, 443, 'tcp', ipv6_ranges=[IPv6Range('2001:db8::/33'), IPv6Range('2001:db8:8000::/33')])
+        ])
+        self.assertEqual(
+            self.summarize(normalized),
+            [('tcp', 443, 443, ['10.0.0.0/24', '192.168.1.0/24'], ['2001:db8::/32'], [], [])]
+        )
+        self.assertEqual(
+            [(ip_range.cidr_ip, ip_range.description) for ip_range in normalized[0].ip_ranges],
+            [('10.0.0.0/24', None), ('192.168.1.0/24', 'office')]
+        )
+        self.assertEqual(redundant, [])
+
+    def test_redundant_rules(self):
+        duplicate = IPRange('10.0.0.0/8')
+        narrow = IPRange('10.1.0.0/16')
+        icmp = IPRange('10.2.0.0/16')
+        pair = UserIDGroupPair('sg-lb', 'lb', 'active', '123456789012', 'vpc-abcdefgh')
+        permissions = [
+            IPPermission(22, 22, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')], user_id_group_pairs=[self.pair]),
+            IPPermission(22, 22, 'tcp', ip_ranges=[duplicate], user_id_group_pairs=[pair]),
+            IPPermission(20, 30, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')], prefix_lists=[PrefixList('pl-1')]),
+            IPPermission(25, 25, 'tcp', ip_ranges=[narrow]),
+            IPPermission(-1, -1, '-1', ip_ranges=[IPRange('10.2.0.0/15')]),
+            IPPermission(8, -1, 'icmp', ip_ranges=[icmp])
+        ]
+        normalized, redundant = normalize_permissions(permissions, egress=True)
+        self.assertEqual(
+            [(rule.permission, rule.source, rule.reason, rule.egress) for rule in redundant],
+            [
+                (permissions[0], permissions[0].ip_ranges[0], 'covered', True),
+                (permissions[1], duplicate, 'duplicate', True),
+                (permissions[1], pair, 'duplicate', True),
+                (permissions[3], narrow, 'covered', True),
+                (permissions[5], icmp, 'covered', True)
+            ]
+        )
+        self.assertEqual(
+            self.summarize(normalized),
+            [
+                ('-1', -1, -1, ['10.2.0.0/15'], [], [], []),
+                ('tcp', 20, 30, ['10.0.0.0/8'], [], ['pl-1'], []),
+                ('tcp', 22, 22, [], [], [], ['sg-lb'])
+            ]
+        )
+
+    def test_normalize_security_group(self):
+        ingress = [
+            IPPermission(80, 80, 'tcp', ip_ranges=[IPRange('0.0.0.0/0')]),
+            IPPermission(80, 80, 'tcp', ip_ranges=[IPRange('0.0.0.0/0')])
+        ]
+        egress = [IPPermission(-1, -1, '-1', ip_ranges=[IPRange('0.0.0.0/0')])]
+        security_group = SecurityGroup(ip_permissions=ingress, ip_permissions_egress=egress, **self.params)
+        result = normalize_security_group(security_group)
+        self.assertEqual(self.summarize(result.ip_permissions), [('tcp', 80, 80, ['0.0.0.0/0'], [], [], [])])
+        self.assertEqual(self.summarize(result.ip_permissions_egress), [('-1', -1, -1, ['0.0.0.0/0'], [], [], [])])
+        self.assertEqual([(rule.reason, rule.egress) for rule in result.redundant], [('duplicate', False)])
+        self.assertIs(security_group.ip_permissions, ingress)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, SecurityGroup, UserIDGroupPair
+from pyawsopstoolkit_models.ec2.security_group_graph import SecurityGroupGraph
+
+
+class TestSecurityGroupGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.web = self.create_security_group('sg-web', ingress=['sg-lb'], egress=['sg-app'])
+        self.app = self.create_security_group('sg-app', ingress=['sg-web', 'sg-db'])
+        self.db = self.create_security_group('sg-db', ingress=['sg-app'])
+        self.lb = self.create_security_group(
+            'sg-lb', ingress=['sg-partner'], user_id='210987654321', peering='pcx-11223344'
+        )
+        self.graph = SecurityGroupGraph([self.web, self.app, self.db, self.lb])
+
+    def create_pair(self, group_id, user_id='123456789012', peering=None):
+        return UserIDGroupPair(
+            id=group_id, name=group_id, status='active', user_id=user_id, vpc_id='vpc-abcdefgh',
+            vpc_peering_connection_id=peering
+        )
+
+    def create_security_group(self, group_id, ingress=None, egress=None, user_id='123456789012', peering=None):
+        return SecurityGroup(
+            account=self.account,
+            region='eu-west-1',
+            id=group_id,
+            name=group_id,
+            owner_id='123456789012',
+            vpc_id='vpc-abcdefgh',
+            ip_permissions=[
+                IPPermission(443, 443, 'tcp', user_id_group_pairs=[self.create_pair(ref, user_id, peering)])
+                for ref in ingress or []
+            ],
+            ip_permissions_egress=[
+                IPPermission(8080, 8080, 'tcp', user_id_group_pairs=[self.create_pair(ref)]) for ref in egress or []
+            ]
+        )
+
+    def test_initialization(self):
+        self.assertEqual(self.graph.node_count, 5)
+        self.assertEqual(self.graph.edge_count, 6)
+        self.assertEqual(len(self.graph), 5)
+        self.assertIn('sg-partner', self.graph)
+        self.assertIs(self.graph.get_security_group('sg-web'), self.web)
+        self.assertIsNone(self.graph.get_security_group('sg-partner'))
+        self.assertEqual(self.graph.nodes(), ['sg-web', 'sg-lb', 'sg-app', 'sg-db', 'sg-partner'])
+
+    def test_initialization_empty(self):
+        graph = SecurityGroupGraph()
+        self.assertEqual(graph.node_count, 0)
+        self.assertEqual(graph.edge_count, 0)
+        self.assertEqual(graph.strongly_connected_components(), [])
+        self.assertEqual(graph.transitive_closure(), {})
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            SecurityGroupGraph(['sg-web'])
+        with self.assertRaises(ValueError):
+            self.graph.add_security_group(self.web)
+        with self.assertRaises(KeyError):
+            self.graph.successors('sg-unknown')
+
+    def test_neighbours(self):
+        self.assertEqual(self.graph.successors('sg-web'), ['sg-app'])
+        self.assertEqual(self.graph.predecessors('sg-web'), ['sg-lb'])
+        self.assertEqual(sorted(self.graph.predecessors('sg-app')), ['sg-db', 'sg-web'])
+        self.assertEqual(self.graph.successors('sg-partner'), ['sg-lb'])
+
+    def test_edges(self):
+        edges = list(self.graph.edges('sg-lb', reverse=True))
+        self.assertEqual(len(edges), 1)
+        self.assertEqual(edges[0].source_id, 'sg-partner')
+        self.assertEqual(edges[0].target_id, 'sg-lb')
+        self.assertEqual(edges[0].direction, 'ingress')
+        self.assertTrue(edges[0].cross_account)
+        self.assertTrue(edges[0].peered)
+
+        egress = [edge for edge in self.graph.edges() if edge.direction == 'egress']
+        self.assertEqual([(edge.source_id, edge.target_id) for edge in egress], [('sg-web', 'sg-app')])
+        self.assertFalse(egress[0].cross_account)
+        self.assertFalse(egress[0].peered)
+
+    def test_reachable(self):
+        self.assertEqual(self.graph.reachable('sg-partner'), {'sg-lb', 'sg-web', 'sg-app', 'sg-db'})
+        self.assertEqual(self.graph.reachable('sg-db'), {'sg-app', 'sg-db'})
+        self.assertEqual(self.graph.reachable('sg-web', reverse=True), {'sg-lb', 'sg-partner'})
+        self.assertEqual(self.graph.reachable('sg-partner', reverse=True), set())
+        self.assertTrue(self.graph.is_reachable('sg-partner', 'sg-db'))
+        self.assertFalse(self.graph.is_reachable('sg-db', 'sg-web'))
+
+    def test_strongly_connected_components(self):
+        components = [sorted(component) for component in self.graph.strongly_connected_components()]
+        self.assertEqual(components, [['sg-app', 'sg-db'], ['sg-web'], ['sg-lb'], ['sg-partner']])
+
+    def test_transitive_closure(self):
+        closure = self.graph.transitive_closure()
+        self.assertEqual(closure['sg-partner'], {'sg-lb', 'sg-web', 'sg-app', 'sg-db'})
+        self.assertEqual(closure['sg-web'], {'sg-app', 'sg-db'})
+        self.assertEqual(closure['sg-app'], {'sg-app', 'sg-db'})
+        self.assertIs(closure['sg-app'], closure['sg-db'])
+        for group_id in self.graph.nodes():
+            with self.subTest(group_id=group_id):
+                self.assertEqual(closure[group_id], self.graph.reachable(group_id))
+
+    def test_deep_chain(self):
+        groups = [self.create_security_group('sg-0')]
+        groups.extend(self.create_security_group(f'sg-{i}', ingress=[f'sg-{i - 1}']) for i in range(1, 1000))
+        graph = SecurityGroupGraph(groups)
+        self.assertEqual(len(graph.strongly_connected_components()), 1000)
+        self.assertEqual(len(graph.reachable('sg-0')), 999)
+        self.assertEqual(len(graph.transitive_closure()['sg-990']), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -347,6 +347,103 @@ class TestRole(unittest.TestCase):
         }
         self.assertDictEqual(self.role.to_dict(), expected_dict)
 
+    def test_fingerprint(self):
+        fingerprint = self.role_full.fingerprint
+        self.assertEqual(self.role_full.fingerprint, fingerprint)
+        self.assertNotEqual(self.role.fingerprint, fingerprint)
+
+        self.role_full.max_session_duration += 1
+        self.assertNotEqual(self.role_full.fingerprint, fingerprint)
+        self.role_full.max_session_duration -= 1
+        self.assertEqual(self.role_full.fingerprint, fingerprint)
+
+        self.role_full.last_used.region = 'us-east-1'
+        self.assertNotEqual(self.role_full.fingerprint, fingerprint)
+
+    def test_shared_documents(self):
+        import copy
+        import pickle
+        from unittest import mock
+
+        document = self.role_full.assume_role_policy_document
+        self.assertIsNot(document, self.params['policy'])
+        self.assertEqual(document, self.params['policy'])
+        self.assertIs(self.role_with_policy.assume_role_policy_document, document)
+        self.assertIs(self.role_with_tags.tags, self.role_full.tags)
+        self.assertIs(self.create_role(tags=[{'Key': 'test_key', 'Value': 'test_value'}]).tags, self.role_full.tags)
+        with self.assertRaises(TypeError):
+            document['Version'] = '2008-10-17'
+        with self.assertRaises(TypeError):
+            document['Statement']['Principal'].update({'AWS': '*'})
+        with self.assertRaises(TypeError):
+            self.role_full.tags.append({'Key': 'other_key', 'Value': 'other_value'})
+        data = self.role_full.to_dict()
+        data['assume_role_policy_document']['Version'] = '2008-10-17'
+        data['tags'].append({'Key': 'other_key', 'Value': 'other_value'})
+        self.assertEqual(document, self.params['policy'])
+        self.assertEqual(self.role_full.tags, self.params['tags'])
+
+        self.role_full.cache_dict()
+        self.assertIs(self.role_full.tags, self.role_with_tags.tags)
+        self.role_full.tags = self.role_full.tags + [{'Key': 'other_key', 'Value': 'other_value'}]
+        self.assertEqual(len(self.role_full.tags), 2)
+        self.assertEqual(len(self.role_with_tags.tags), 1)
+
+        copied = copy.deepcopy(document)
+        copied['Version'] = '2008-10-17'
+        self.assertIs(pickle.loads(pickle.dumps(self.role_with_tags.tags)), self.role_with_tags.tags)
+        self.assertIs(pickle.loads(pickle.dumps(self.role_with_tags)).tags, self.role_with_tags.tags)
+        with mock.patch('pyawsopstoolkit_models.__interning__.json.dumps') as dumps:
+            self.role_full.tags = self.role_with_tags.tags
+            self.role_full.assume_role_policy_document = document
+            self.assertIs(pickle.loads(pickle.dumps(self.role_with_tags.tags)), self.role_with_tags.tags)
+            dumps.assert_not_called()
+        self.assertIs(self.role_full.tags, self.role_with_tags.tags)
+        string_keys = self.create_role(assume_role_policy_document={'1': 'a'})
+        integer_keys = self.create_role(assume_role_policy_document={1: 'a'})
+        self.assertEqual(integer_keys.assume_role_policy_document, {1: 'a'})
+        self.assertEqual(string_keys.assume_role_policy_document, {'1': 'a'})
+
+    def test_from_response(self):
+        response = {
+            'RoleName': self.params['name'],
+            'RoleId': self.params['id'],
+            'Arn': self.params['arn'],
+            'MaxSessionDuration': self.params['max_session_duration'],
+            'Path': self.params['path'],
+            'CreateDate': self.params['created_date'],
+            'AssumeRolePolicyDocument': self.params['policy'],
+            'Description': self.params['description'],
+            'PermissionsBoundary': {
+                'PermissionsBoundaryType': 'Policy',
+                'PermissionsBoundaryArn': 'arn:aws:iam::123456789012:policy/ExamplePolicy'
+            },
+            'RoleLastUsed': {'LastUsedDate': datetime(2023, 6, 18), 'Region': 'eu-west-1'},
+            'Tags': self.params['tags']
+        }
+        role = Role.from_response(self.params['account'], response)
+        self.assertEqual(role, self.role_full)
+        lazy = Role.from_response(self.params['account'], response, lazy=True)
+        self.assertNotIn('last_used', vars(lazy))
+        self.assertEqual(lazy.last_used, self.params['last_used'])
+        self.assertEqual(lazy, self.role_full)
+
+        invalid = Role.from_response(
+            self.params['account'], {**response, 'RoleLastUsed': {'LastUsedDate': '2023'}}, lazy=True
+        )
+        for _ in range(2):
+            with self.assertRaises(TypeError):
+                getattr(invalid, 'last_used')
+
+        encoded = '%7B%22Version%22%3A%20%222012-10-17%22%2C%20%22Statement%22%3A%20%5B%5D%7D'
+        role = Role.from_response(
+            self.params['account'],
+            {**response, 'AssumeRolePolicyDocument': encoded, 'RoleLastUsed': {}, 'PermissionsBoundary': None}
+        )
+        self.assertEqual(role.assume_role_policy_document, {'Version': '2012-10-17', 'Statement': []})
+        self.assertIsNone(role.last_used)
+        self.assertIsNone(role.permissions_boundary)
+
 
 if __name__ == "__main__":
     unittest.main()
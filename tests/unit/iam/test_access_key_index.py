@@ -0,0 +1,104 @@
+import unittest
+
+from pyawsopstoolkit_models.iam.access_key_index import AccessKeyIndex
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+
+
+class TestAccessKeyIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.other_account = Account('210987654321')
+        self.alice = self.create_user('alice', self.account, 'AKIA1', 'AKIA2')
+        self.bob = self.create_user('bob', self.other_account, 'AKIA3')
+        self.index = AccessKeyIndex([self.alice, self.bob])
+
+    @staticmethod
+    def create_user(name, account, *key_ids):
+        return User(
+            account=account, name=name, id=f'AIDA{name.upper()}', arn=f'arn:aws:iam::{account.number}:user/{name}',
+            access_keys=[AccessKey(key_id, 'Active') for key_id in key_ids] or None
+        )
+
+    def test_lookup(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.user_count, 2)
+        self.assertIn('AKIA3', self.index)
+        self.assertIs(self.index.get_user('AKIA2'), self.alice)
+        self.assertIs(self.index.get_account('AKIA3'), self.other_account)
+        self.assertIs(self.index.get_access_key('AKIA1'), self.alice.access_keys[0])
+        self.assertIsNone(self.index.get_user('AKIA9'))
+        self.assertIsNone(self.index.get_account('AKIA9'))
+        self.assertIsNone(self.index.get_access_key('AKIA9'))
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            self.index.add_user('alice')
+        with self.assertRaises(ValueError):
+            self.index.add_user(self.alice)
+        with self.assertRaises(ValueError):
+            self.index.add_user(self.create_user('carol', self.account, 'AKIA4', 'AKIA1'))
+        with self.assertRaises(ValueError):
+            AccessKeyIndex([self.create_user('carol', self.account, 'AKIA4', 'AKIA4')])
+        self.assertNotIn('AKIA4', self.index)
+        with self.assertRaises(KeyError):
+            self.index.remove_user(self.create_user('carol', self.account))
+
+    def test_incremental_maintenance(self):
+        self.alice.access_keys.append(AccessKey('AKIA4', 'Active'))
+        self.assertIs(self.index.get_user('AKIA4'), self.alice)
+        self.alice.access_keys.pop(0)
+        self.assertNotIn('AKIA1', self.index)
+        self.bob.access_keys = [AccessKey('AKIA5', 'Active')]
+        self.assertNotIn('AKIA3', self.index)
+        self.assertIs(self.index.get_user('AKIA5'), self.bob)
+        self.bob.access_keys.append(AccessKey('AKIA6', 'Active'))
+        self.assertIs(self.index.get_user('AKIA6'), self.bob)
+        self.bob.access_keys[0].id = 'AKIA7'
+        self.assertNotIn('AKIA5', self.index)
+        self.assertIs(self.index.get_user('AKIA7'), self.bob)
+        with self.assertRaises(ValueError):
+            self.bob.access_keys = [AccessKey('AKIA2', 'Active')]
+        self.assertIs(self.index.get_user('AKIA2'), self.alice)
+        self.bob.access_keys = None
+        self.assertEqual(len(self.index), 2)
+
+    def test_rejected_changes(self):
+        keys = list(self.bob.access_keys)
+        with self.assertRaises(ValueError):
+            self.bob.access_keys = [AccessKey('AKIA2', 'Active')]
+        with self.assertRaises(ValueError):
+            self.bob.access_keys.append(AccessKey('AKIA1', 'Active'))
+        with self.assertRaises(ValueError):
+            self.bob.access_keys[0].id = 'AKIA2'
+        with self.assertRaises(ValueError):
+            self.alice.access_keys[1] = AccessKey('AKIA1', 'Active')
+        self.assertEqual(self.bob.access_keys, keys)
+        self.assertEqual(self.bob.access_keys[0].id, 'AKIA3')
+        self.assertEqual([key.id for key in self.alice.access_keys], ['AKIA1', 'AKIA2'])
+        self.assertIs(self.index.get_user('AKIA3'), self.bob)
+        with self.assertRaises(TypeError):
+            self.bob.access_keys = [AccessKey('AKIA4', 'Active'), 'AKIA5']
+        self.assertNotIn('AKIA4', self.index)
+        self.assertIs(self.index.get_user('AKIA3'), self.bob)
+
+    def test_remove_user(self):
+        self.index.remove_user(self.alice)
+        self.assertEqual(len(self.index), 1)
+        self.assertEqual(self.index.user_count, 1)
+        self.alice.access_keys.append(AccessKey('AKIA4', 'Active'))
+        self.assertNotIn('AKIA4', self.index)
+        self.index.add_user(self.alice)
+        self.assertIs(self.index.get_user('AKIA4'), self.alice)
+
+    def test_bulk_build(self):
+        users = [self.create_user(f'user{number}', self.account, f'AKIAA{number}', f'AKIAB{number}')
+                 for number in range(1000)]
+        index = AccessKeyIndex(users)
+        self.assertEqual(len(index), 2000)
+        self.assertIs(index.get_user('AKIAB999'), users[999])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from pyawsopstoolkit_models.iam.credentials import CredentialTable, find_stale_credentials
+from pyawsopstoolkit_models.iam.user import AccessKey, LoginProfile, User
+
+
+class TestCredentialTable(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        old = datetime(2024, 1, 1)
+        recent = datetime(2024, 5, 20)
+        self.unused_key = AccessKey('AKIA1', 'Active', created_date=old, last_used_date=old)
+        self.never_used_key = AccessKey('AKIA2', 'Active', created_date=old)
+        self.new_key = AccessKey('AKIA3', 'Active', created_date=recent)
+        self.inactive_key = AccessKey('AKIA4', 'Inactive', created_date=old, last_used_date=old)
+        self.used_key = AccessKey('AKIA5', 'Active', created_date=old, last_used_date=recent)
+        self.alice = self.create_user(
+            'alice', access_keys=[self.unused_key, self.never_used_key, self.new_key],
+            login_profile=LoginProfile(old), password_last_used_date=old
+        )
+        self.bob = self.create_user(
+            'bob', access_keys=[self.inactive_key, self.used_key], login_profile=LoginProfile()
+        )
+        self.carol = self.create_user(
+            'carol', login_profile=LoginProfile(recent),
+            password_last_used_date=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        self.dave = self.create_user('dave', password_last_used_date=old)
+        self.table = CredentialTable([self.alice, self.bob, self.carol, self.dave])
+
+    def create_user(self, name, **kwargs):
+        return User(
+            account=self.account, name=name, id=f'AIDA{name.upper()}', arn=f'arn:aws:iam::123456789012:user/{name}',
+            **kwargs
+        )
+
+    def test_initialization(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(len(self.table.access_keys), 5)
+        self.assertEqual(list(self.table.key_user), [0, 0, 0, 1, 1])
+        self.assertEqual(list(self.table.key_active), [1, 1, 1, 0, 1])
+        self.assertEqual(list(self.table.login_profile), [1, 1, 1, 0])
+        self.assertEqual(self.table.key_last_used[0], datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+        self.assertNotEqual(self.table.key_last_used[1], self.table.key_last_used[1])
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            CredentialTable(['alice'])
+        with self.assertRaises(TypeError):
+            self.table.find_stale('90')
+        with self.assertRaises(TypeError):
+            self.table.find_stale(now='2024-06-01')
+
+    def test_find_stale(self):
+        findings = self.table.find_stale(90, self.now)
+        self.assertEqual(
+            [(finding.user.name, finding.reason, finding.access_key) for finding in findings],
+            [
+                ('alice', 'access_key_unused', self.unused_key),
+                ('alice', 'access_key_never_used', self.never_used_key),
+                ('alice', 'password_unused', None),
+                ('bob', 'password_never_used', None),
+                ('carol', 'password_unused', None)
+            ]
+        )
+        self.assertEqual(findings[0].last_used_date, datetime(2024, 1, 1))
+        self.assertIsNone(findings[1].last_used_date)
+
+    def test_find_stale_with_days(self):
+        findings = self.table.find_stale(5, self.now)
+        self.assertIn((self.used_key, 'access_key_unused'), [(f.access_key, f.reason) for f in findings])
+        self.assertIn((self.new_key, 'access_key_never_used'), [(f.access_key, f.reason) for f in findings])
+        self.assertEqual(len(self.table.find_stale(365, self.now)), 1)
+        self.assertEqual(len(self.table.find_stale(365, self.now + timedelta(days=300))), 5)
+
+    def test_find_stale_credentials(self):
+        expected = [(f.user, f.reason) for f in self.table.find_stale(90, self.now)]
+        self.assertEqual([(f.user, f.reason) for f in find_stale_credentials(self.table, 90, self.now)], expected)
+        self.assertEqual(
+            [(f.user, f.reason) for f in find_stale_credentials([self.alice, self.bob, self.carol], 90, self.now)],
+            expected
+        )
+        self.assertEqual(CredentialTable().find_stale(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
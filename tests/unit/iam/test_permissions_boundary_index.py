@@ -0,0 +1,114 @@
+import copy
+import unittest
+from dataclasses import FrozenInstanceError
+
+from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary, intern_permissions_boundary
+from pyawsopstoolkit_models.iam.permissions_boundary_index import PermissionsBoundaryIndex
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+
+class TestPermissionsBoundaryIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.first, self.second = Account('123456789012'), Account('210987654321')
+        self.guardrail = 'arn:aws:iam::123456789012:policy/Guardrail'
+        self.developer = 'arn:aws:iam::123456789012:policy/Developer'
+        self.alice = self.create_user(self.first, 'alice', self.guardrail)
+        self.bob = self.create_user(self.first, 'bob')
+        self.deploy = self.create_role(self.first, 'deploy', self.guardrail)
+        self.admin = self.create_role(self.second, 'admin')
+        self.build = self.create_role(self.second, 'build', self.developer)
+        self.index = PermissionsBoundaryIndex([self.alice, self.bob, self.deploy, self.admin, self.build])
+
+    @staticmethod
+    def create_user(account, name, boundary=None):
+        return User(
+            account=account, name=name, id=f'AIDA{name.upper()}', arn=f'arn:aws:iam::{account.number}:user/{name}',
+            permissions_boundary=PermissionsBoundary('Policy', boundary) if boundary else None
+        )
+
+    @staticmethod
+    def create_role(account, name, boundary=None):
+        return Role(
+            account=account, name=name, id=f'AROA{name.upper()}', arn=f'arn:aws:iam::{account.number}:role/{name}',
+            max_session_duration=3600,
+            permissions_boundary=PermissionsBoundary('Policy', boundary) if boundary else None
+        )
+
+    def test_intern_permissions_boundary(self):
+        boundary = PermissionsBoundary('Policy', 'arn:aws:iam::123456789012:policy/Interned')
+        interned = intern_permissions_boundary(boundary)
+        self.assertIsNot(interned, boundary)
+        self.assertEqual(interned, boundary)
+        self.assertIs(intern_permissions_boundary(interned), interned)
+        self.assertIs(intern_permissions_boundary(PermissionsBoundary('Policy', boundary.arn)), interned)
+        with self.assertRaises(FrozenInstanceError):
+            interned.arn = 'arn:aws:iam::123456789012:policy/Modified'
+        self.assertEqual(interned.arn, 'arn:aws:iam::123456789012:policy/Interned')
+        boundary.arn = 'arn:aws:iam::123456789012:policy/Modified'
+        self.assertEqual(boundary.arn, 'arn:aws:iam::123456789012:policy/Modified')
+        duplicate = copy.copy(interned)
+        duplicate.type = 'Other'
+        self.assertEqual(intern_permissions_boundary(duplicate), duplicate)
+        with self.assertRaises(TypeError):
+            intern_permissions_boundary('Policy')
+
+    def test_lookup(self):
+        self.assertEqual(len(self.index), 5)
+        self.assertIn(self.alice, self.index)
+        self.assertEqual(self.index.boundary_arns(), [self.guardrail, self.developer])
+        self.assertEqual(self.index.get_principals(self.guardrail), [self.alice, self.deploy])
+        self.assertEqual(self.index.get_principals('arn:aws:iam::123456789012:policy/Missing'), [])
+        self.assertEqual(self.index.get_unbounded(), [self.bob, self.admin])
+        self.assertEqual(self.index.get_unbounded('210987654321'), [self.admin])
+        self.assertEqual(self.index.get_unbounded('111111111111'), [])
+        self.assertIs(self.alice.permissions_boundary, self.deploy.permissions_boundary)
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            self.index.add_principal('alice')
+        with self.assertRaises(ValueError):
+            self.index.add_principal(self.alice)
+        with self.assertRaises(KeyError):
+            self.index.remove_principal(self.create_user(self.first, 'carol'))
+
+    def test_coverage(self):
+        coverage = self.index.coverage()
+        self.assertEqual(list(coverage), ['123456789012', '210987654321'])
+        first = coverage['123456789012']
+        self.assertEqual((first.principal_count, first.bounded_count, first.unbounded_count), (3, 2, 1))
+        self.assertEqual(first.boundaries, {self.guardrail: 2})
+        self.assertAlmostEqual(first.ratio, 2 / 3)
+        self.assertEqual(coverage['210987654321'].boundaries, {self.developer: 1})
+        self.assertEqual(PermissionsBoundaryIndex().coverage(), {})
+
+    def test_incremental_maintenance(self):
+        self.bob.permissions_boundary = PermissionsBoundary('Policy', self.guardrail)
+        self.assertIs(self.bob.permissions_boundary, self.alice.permissions_boundary)
+        self.assertEqual(self.index.get_principals(self.guardrail), [self.alice, self.deploy, self.bob])
+        self.assertEqual(self.index.get_unbounded('123456789012'), [])
+        self.alice.permissions_boundary = None
+        self.assertEqual(self.index.get_unbounded('123456789012'), [self.alice])
+        self.admin.account = self.first
+        self.assertEqual(self.index.get_unbounded('123456789012'), [self.alice, self.admin])
+        self.assertEqual(self.index.get_unbounded('210987654321'), [])
+        self.admin.account = self.second
+        self.build.account = self.first
+        self.assertEqual(self.index.coverage()['123456789012'].boundaries, {self.guardrail: 2, self.developer: 1})
+        with self.assertRaises(FrozenInstanceError):
+            self.bob.permissions_boundary.arn = self.developer
+        self.assertEqual(self.deploy.permissions_boundary.arn, self.guardrail)
+        self.bob.permissions_boundary = PermissionsBoundary('Policy', self.developer)
+        self.assertIs(self.bob.permissions_boundary, self.build.permissions_boundary)
+        self.assertEqual(self.index.get_principals(self.guardrail), [self.deploy])
+        self.assertEqual(self.index.get_principals(self.developer), [self.build, self.bob])
+        self.index.remove_principal(self.bob)
+        self.assertNotIn(self.bob, self.index)
+        self.assertEqual(self.index.coverage()['123456789012'].principal_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
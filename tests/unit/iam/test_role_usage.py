@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timezone
+
+from pyawsopstoolkit_models.iam.role import LastUsed, Role
+from pyawsopstoolkit_models.iam.role_usage import RoleUsageSummary, RoleUsageTable, summarize_role_usage
+
+
+class TestRoleUsageTable(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+        first, second = Account('123456789012'), Account('210987654321')
+        self.old = self.create_role(first, 'old', LastUsed(datetime(2024, 1, 1), 'eu-west-1'))
+        self.recent = self.create_role(first, 'recent', LastUsed(datetime(2024, 5, 30), 'eu-west-1'))
+        self.never = self.create_role(first, 'never', path='/service/')
+        self.empty = self.create_role(second, 'empty', LastUsed())
+        self.other = self.create_role(second, 'other', LastUsed(datetime(2024, 5, 30), 'us-east-1'), '/service/')
+        self.another = self.create_role(second, 'another', LastUsed(datetime(2023, 5, 30), 'eu-west-1'))
+        self.table = RoleUsageTable([self.old, self.recent, self.never, self.empty, self.other, self.another])
+
+    @staticmethod
+    def create_role(account, name, last_used=None, path='/'):
+        return Role(
+            account=account, name=name, id=f'AROA{name.upper()}', arn=f'arn:aws:iam::{account.number}:role/{name}',
+            max_session_duration=3600, path=path, last_used=last_used
+        )
+
+    def test_initialization(self):
+        self.assertEqual(len(self.table), 6)
+        self.assertEqual(list(self.table.account), [0, 0, 0, 1, 1, 1])
+        self.assertEqual(self.table.values['region'], ['eu-west-1', None, 'us-east-1'])
+        self.assertEqual(self.table.values['path'], ['/', '/service/'])
+
+    def test_invalid_types(self):
+        with self.assertRaises(TypeError):
+            RoleUsageTable(['role'])
+        with self.assertRaises(TypeError):
+            self.table.find_unused('90')
+        with self.assertRaises(ValueError):
+            self.table.summarize(['name'])
+
+    def test_find(self):
+        self.assertEqual(self.table.find_never_used(), [self.never, self.empty])
+        self.assertEqual(self.table.find_unused(90, self.now), [self.old, self.another])
+        self.assertEqual(self.table.find_unused(365, self.now), [self.another])
+
+    def test_summarize(self):
+        self.assertEqual(
+            self.table.summarize(days=90, now=self.now),
+            {
+                ('123456789012',): RoleUsageSummary(3, 1, 1, ('eu-west-1',)),
+                ('210987654321',): RoleUsageSummary(3, 1, 1, ('eu-west-1', 'us-east-1'))
+            }
+        )
+        summary = self.table.summarize(['account', 'path'], 90, self.now)
+        self.assertEqual(list(summary), [
+            ('123456789012', '/'), ('123456789012', '/service/'), ('210987654321', '/'), ('210987654321', '/service/')
+        ])
+        self.assertTrue(summary[('210987654321', '/')].single_region)
+        self.assertFalse(summary[('123456789012', '/service/')].single_region)
+        self.assertEqual(self.table.summarize(['region'], 90, self.now)[(None,)], RoleUsageSummary(2, 2, 0, ()))
+        self.assertEqual(
+            self.table.summarize([], 90, self.now), {(): RoleUsageSummary(6, 2, 2, ('eu-west-1', 'us-east-1'))}
+        )
+
+    def test_summarize_role_usage(self):
+        roles = [self.old, self.recent, self.never, self.empty, self.other, self.another]
+        expected = self.table.summarize(['region'], 30, self.now)
+        self.assertEqual(summarize_role_usage(self.table, ['region'], 30, self.now), expected)
+        self.assertEqual(summarize_role_usage(roles, ['region'], 30, self.now), expected)
+        self.assertEqual(RoleUsageTable().summarize(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.trust_graph import TrustGraph
+from pyawsopstoolkit_models.iam.trust_policy import TrustPrincipal
+
+
+def policy(*principals):
+    return {
+        'Version': '2012-10-17',
+        'Statement': [
+            {'Effect': 'Allow', 'Principal': principal, 'Action': 'sts:AssumeRole'} for principal in principals
+        ]
+    }
+
+
+class TestTrustGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.first, self.second = Account('123456789012'), Account('210987654321')
+        self.deployer = self.create_role(self.first, 'deployer', policy({'AWS': '999988887777'}))
+        self.deploy = self.create_role(
+            self.second, 'deploy', policy({'AWS': 'arn:aws:iam::123456789012:role/deployer'})
+        )
+        self.admin = self.create_role(self.second, 'admin', policy({'AWS': '210987654321'}))
+        self.ec2 = self.create_role(self.first, 'ec2', policy({'Service': 'ec2.amazonaws.com'}))
+        self.public = self.create_role(self.first, 'public', policy('*'))
+        self.graph = TrustGraph([self.deployer, self.deploy, self.admin, self.ec2, self.public])
+
+    @staticmethod
+    def create_role(account, name, document):
+        return Role(
+            account=account, name=name, id=f'AROA{name.upper()}', arn=f'arn:aws:iam::{account.number}:role/{name}',
+            max_session_duration=3600, assume_role_policy_document=document
+        )
+
+    def test_structure(self):
+        # 5 roles, 2 accounts, the service and the wildcard
+        self.assertEqual(self.graph.node_count, 9)
+        # 5 trust edges and the links of deploy and admin to their trusted account
+        self.assertEqual(self.graph.edge_count, 7)
+        self.assertIn('999988887777', self.graph)
+        self.assertNotIn('111122223333', self.graph)
+        self.assertIs(self.graph.get_role(self.admin.arn), self.admin)
+        self.assertIsNone(self.graph.get_role('210987654321'))
+        self.assertEqual(
+            self.graph.successors(self.deploy.arn),
+            [TrustPrincipal('Account', '210987654321')]
+        )
+        self.assertEqual(
+            self.graph.predecessors(self.deploy.arn), [TrustPrincipal('AWS', 'arn:aws:iam::123456789012:role/deployer')]
+        )
+        with self.assertRaises(KeyError):
+            self.graph.successors('111122223333')
+        with self.assertRaises(TypeError):
+            TrustGraph(['role'])
+        with self.assertRaises(ValueError):
+            TrustGraph([self.admin, self.create_role(self.second, 'admin', None)])
+
+    def test_reachable_roles(self):
+        self.assertEqual(self.graph.reachable_roles('999988887777'), [self.deployer, self.deploy, self.admin])
+        self.assertEqual(self.graph.reachable_roles(TrustPrincipal('Service', 'ec2.amazonaws.com')), [self.ec2])
+        self.assertEqual(
+            self.graph.reachable_roles(TrustPrincipal('Service', 'ec2.amazonaws.com'), include_wildcard=True),
+            [self.ec2, self.public]
+        )
+        self.assertEqual(
+            self.graph.principals_reaching(self.admin.arn),
+            [
+                TrustPrincipal('AWS', self.deployer.arn), TrustPrincipal('Account', '999988887777'),
+                TrustPrincipal('AWS', self.deploy.arn), TrustPrincipal('Account', '210987654321')
+            ]
+        )
+
+    def test_shortest_chain(self):
+        self.assertEqual(
+            self.graph.shortest_chain('arn:aws:iam::999988887777:user/mallory', self.admin.arn),
+            [
+                TrustPrincipal('AWS', 'arn:aws:iam::999988887777:user/mallory'),
+                TrustPrincipal('Account', '999988887777'),
+                TrustPrincipal('AWS', self.deployer.arn),
+                TrustPrincipal('AWS', self.deploy.arn),
+                TrustPrincipal('Account', '210987654321'),
+                TrustPrincipal('AWS', self.admin.arn)
+            ]
+        )
+        self.assertEqual(
+            self.graph.shortest_chain(self.deployer.arn, self.deploy.arn),
+            [TrustPrincipal('AWS', self.deployer.arn), TrustPrincipal('AWS', self.deploy.arn)]
+        )
+        self.assertIsNone(self.graph.shortest_chain('999988887777', self.public.arn))
+        self.assertEqual(
+            self.graph.shortest_chain('999988887777', self.public.arn, include_wildcard=True),
+            [
+                TrustPrincipal('Account', '999988887777'), TrustPrincipal('*', '*'),
+                TrustPrincipal('AWS', self.public.arn)
+            ]
+        )
+        with self.assertRaises(KeyError):
+            self.graph.shortest_chain('arn:aws:iam::111122223333:user/eve', self.admin.arn)
+
+
+if __name__ == "__main__":
+    unittest.main()
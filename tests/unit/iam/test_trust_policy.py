@@ -0,0 +1,135 @@
+import unittest
+
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.trust_policy import (
+    TrustPolicy, TrustPolicyIndex, TrustPrincipal, parse_trust_policy
+)
+
+
+def policy(*statements):
+    return {'Version': '2012-10-17', 'Statement': list(statements)}
+
+
+def statement(principal, action='sts:AssumeRole', effect='Allow', **kwargs):
+    return {'Effect': effect, 'Principal': principal, 'Action': action, **kwargs}
+
+
+class TestTrustPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.cross_account = self.create_role('cross-account', policy(
+            statement({'AWS': ['arn:aws:iam::111122223333:root', '444455556666']}),
+            statement({'AWS': '444455556666'}, effect='Deny')
+        ))
+        self.ec2 = self.create_role('ec2', policy(statement({'Service': 'ec2.amazonaws.com'})))
+        self.deploy = self.create_role('deploy', policy(
+            statement({'AWS': 'arn:aws:iam::111122223333:role/deployer'}, ['sts:AssumeRole', 'sts:TagSession'])
+        ))
+        self.saml = self.create_role('saml', policy(statement(
+            {'Federated': 'arn:aws:iam::123456789012:saml-provider/corp'}, 'sts:AssumeRoleWithSAML',
+            Condition={'StringEquals': {'SAML:aud': 'https://signin.aws.amazon.com/saml'}}
+        )))
+        self.public = self.create_role('public', policy(statement('*', 'sts:*')))
+        self.none = self.create_role('none', None)
+        self.index = TrustPolicyIndex([self.cross_account, self.ec2, self.deploy, self.saml, self.public, self.none])
+
+    def create_role(self, name, document):
+        return Role(
+            account=self.account, name=name, id=f'AROA{name.upper()}', arn=f'arn:aws:iam::123456789012:role/{name}',
+            max_session_duration=3600, assume_role_policy_document=document
+        )
+
+    def test_parse_trust_policy(self):
+        parsed = parse_trust_policy(self.saml.assume_role_policy_document)
+        self.assertEqual(len(parsed.statements), 1)
+        self.assertEqual(parsed.statements[0].actions, ('sts:assumerolewithsaml',))
+        conditions = parsed.statements[0].conditions
+        self.assertEqual(conditions['StringEquals']['SAML:aud'], 'https://signin.aws.amazon.com/saml')
+        self.assertTrue(parsed.statements[0].assume_role)
+        self.assertEqual(parse_trust_policy(None), TrustPolicy())
+        self.assertIs(parse_trust_policy(policy(statement('*'))), parse_trust_policy(policy(statement('*'))))
+        with self.assertRaises(TypeError):
+            parse_trust_policy('{}')
+        with self.assertRaises(ValueError):
+            parse_trust_policy(policy(statement(['*'])))
+        with self.assertRaises(ValueError):
+            parse_trust_policy(policy({'Principal': '*', 'Action': 'sts:AssumeRole'}))
+        with self.assertRaises(ValueError):
+            parse_trust_policy(policy(statement('*', effect='allow')))
+
+    def test_trusted_principals(self):
+        self.assertEqual(
+            self.cross_account.trust_policy.trusted_principals, frozenset([TrustPrincipal('Account', '111122223333')])
+        )
+        self.assertEqual(self.public.trust_policy.trusted_principals, frozenset([TrustPrincipal('*', '*')]))
+        self.assertEqual(
+            parse_trust_policy(policy(statement('*'), statement('*', effect='Deny'))).trusted_principals, frozenset()
+        )
+        guardrail = statement(
+            '*', effect='Deny', Condition={'StringNotEquals': {'aws:PrincipalOrgID': 'o-a1b2c3d4e5'}}
+        )
+        self.assertEqual(
+            parse_trust_policy(policy(statement({'AWS': '111122223333'}), guardrail)).trusted_principals,
+            frozenset([TrustPrincipal('Account', '111122223333')])
+        )
+        self.assertEqual(
+            parse_trust_policy(policy(statement({'AWS': '111122223333'}, 's3:GetObject'))).trusted_principals,
+            frozenset()
+        )
+        allowed = statement({
+            'AWS': ['arn:aws:iam::111122223333:role/deployer', 'arn:aws:iam::444455556666:user/alice'],
+            'Service': 'ec2.amazonaws.com'
+        })
+        for denied in ('111122223333', 'arn:aws:iam::111122223333:root'):
+            with self.subTest(denied=denied):
+                self.assertEqual(
+                    parse_trust_policy(policy(allowed, statement({'AWS': denied}, effect='Deny'))).trusted_principals,
+                    frozenset([
+                        TrustPrincipal('AWS', 'arn:aws:iam::444455556666:user/alice'),
+                        TrustPrincipal('Service', 'ec2.amazonaws.com')
+                    ])
+                )
+        self.assertEqual(TrustPrincipal('AWS', 'arn:aws:iam::111122223333:role/deployer').account, '111122223333')
+        self.assertIsNone(TrustPrincipal('Service', 'ec2.amazonaws.com').account)
+
+    def test_role_trust_policy_cache(self):
+        parsed = self.ec2.trust_policy
+        self.assertIs(self.ec2.trust_policy, parsed)
+        self.ec2.assume_role_policy_document = policy(statement({'Service': 'lambda.amazonaws.com'}))
+        self.assertEqual(
+            self.ec2.trust_policy.trusted_principals, frozenset([TrustPrincipal('Service', 'lambda.amazonaws.com')])
+        )
+
+    def test_index_lookup(self):
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(self.index.get_roles('Service', 'ec2.amazonaws.com'), [self.ec2])
+        self.assertEqual(self.index.get_roles('AWS', '111122223333'), [self.cross_account])
+        self.assertEqual(self.index.get_roles('AWS', '444455556666'), [])
+        self.assertEqual(self.index.get_roles('Federated', 'arn:aws:iam::123456789012:saml-provider/corp'), [self.saml])
+        self.assertEqual(self.index.get_roles_for_account('111122223333'), [self.cross_account, self.deploy])
+        self.assertEqual(
+            self.index.get_roles_for_account('111122223333', include_wildcard=True),
+            [self.cross_account, self.deploy, self.public]
+        )
+        self.assertEqual(self.index.get_roles_for_account('999999999999'), [])
+        self.assertEqual(len(self.index.principals()), 5)
+
+    def test_index_maintenance(self):
+        with self.assertRaises(TypeError):
+            self.index.add_role('role')
+        with self.assertRaises(ValueError):
+            self.index.add_role(self.ec2)
+        self.deploy.assume_role_policy_document = policy(statement({'AWS': '777788889999'}))
+        self.assertEqual(self.index.get_roles_for_account('111122223333'), [self.cross_account])
+        self.assertEqual(self.index.get_roles_for_account('777788889999'), [self.deploy])
+        self.index.remove_role(self.cross_account)
+        self.assertEqual(self.index.get_roles_for_account('111122223333'), [])
+        with self.assertRaises(KeyError):
+            self.index.remove_role(self.cross_account)
+
+
+if __name__ == "__main__":
+    unittest.main()
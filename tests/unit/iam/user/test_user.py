@@ -300,6 +300,65 @@ class TestUser(unittest.TestCase):
         }
         self.assertDictEqual(self.user.to_dict(), expected_dict)
 
+    def test_shared_tags(self):
+        self.assertIs(self.user_with_tags.tags, self.user_full.tags)
+        self.assertIsNot(self.user_full.tags, self.params['tags'])
+        with self.assertRaises(TypeError):
+            self.user_full.tags.append({'Key': 'other_key', 'Value': 'other_value'})
+        self.user_full.to_dict()['tags'].append({'Key': 'other_key', 'Value': 'other_value'})
+        self.assertEqual(self.user_full.tags, self.params['tags'])
+
+    def test_fingerprint(self):
+        fingerprint = self.user_full.fingerprint
+        self.assertEqual(self.user_full.fingerprint, fingerprint)
+        self.assertNotEqual(self.user.fingerprint, fingerprint)
+
+        self.user_full.access_keys[0].status = 'Inactive'
+        self.assertNotEqual(self.user_full.fingerprint, fingerprint)
+
+    def test_cache_dict(self):
+        self.user_full.cache_dict()
+        cached = self.user_full.to_dict()
+        self.assertEqual(cached['created_date'], self.params['created_date'].isoformat())
+        self.assertIs(self.user_full.to_dict(), cached)
+
+        self.user_full.access_keys.append(AccessKey('ID2', 'Active'))
+        self.assertEqual([key['id'] for key in self.user_full.to_dict()['access_keys']], ['ID', 'ID2'])
+        self.user_full.access_keys.clear()
+        self.assertIsNone(self.user_full.to_dict()['access_keys'])
+
+    def test_from_response(self):
+        response = {
+            'UserName': self.params['name'],
+            'UserId': self.params['id'],
+            'Arn': self.params['arn'],
+            'Path': self.params['path'],
+            'CreateDate': self.params['created_date'],
+            'PasswordLastUsed': self.params['pwd_used_date'],
+            'PermissionsBoundary': {
+                'PermissionsBoundaryType': 'Policy',
+                'PermissionsBoundaryArn': 'arn:aws:iam::123456789012:policy/ExamplePolicy'
+            },
+            'LoginProfile': {'CreateDate': datetime(2023, 5, 18), 'PasswordResetRequired': False},
+            'AccessKeys': [{
+                'AccessKeyId': 'ID', 'Status': 'Active',
+                'AccessKeyLastUsed': {'ServiceName': 'N/A', 'Region': 'N/A'}
+            }],
+            'Tags': self.params['tags']
+        }
+        user = User.from_response(self.params['account'], response)
+        self.assertEqual(user, self.user_full)
+        lazy = User.from_response(self.params['account'], response, lazy=True)
+        self.assertNotIn('access_keys', vars(lazy))
+        self.assertEqual(lazy.name, self.params['name'])
+        self.assertEqual(lazy.access_keys, self.params['access_keys'])
+        self.assertIs(lazy.access_keys, lazy.access_keys)
+        self.assertEqual(lazy, self.user_full)
+
+        user = User.from_response(self.params['account'], {**response, 'AccessKeys': [], 'LoginProfile': None})
+        self.assertIsNone(user.access_keys)
+        self.assertIsNone(user.login_profile)
+
 
 if __name__ == "__main__":
     unittest.main()
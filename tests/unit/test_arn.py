@@ -0,0 +1,66 @@
+import unittest
+
+from pyawsopstoolkit_models.arn import ARN, parse_arn, parse_arns
+from pyawsopstoolkit_models.iam.permissions_boundary import PermissionsBoundary
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+
+class TestARN(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.role_arn = 'arn:aws:iam::123456789012:role/service-role/deploy'
+
+    def test_parse_arn(self):
+        parsed = parse_arn(self.role_arn)
+        self.assertEqual(parsed, ARN('aws', 'iam', '', '123456789012', 'role/service-role/deploy'))
+        self.assertEqual(
+            (parsed.resource_type, parsed.resource_id, parsed.name, parsed.path),
+            ('role', 'service-role/deploy', 'deploy', '/service-role/')
+        )
+        self.assertEqual(str(parsed), self.role_arn)
+        self.assertIs(parse_arn(self.role_arn), parsed)
+
+        bucket = parse_arn('arn:aws:s3:::my-bucket')
+        self.assertEqual((bucket.resource_type, bucket.resource_id, bucket.path), (None, 'my-bucket', None))
+        log_group = parse_arn('arn:aws:logs:eu-west-1:123456789012:log-group:/aws/lambda/deploy:*')
+        self.assertEqual((log_group.resource_type, log_group.resource_id), ('log-group', '/aws/lambda/deploy:*'))
+
+        with self.assertRaises(TypeError):
+            parse_arn(None)
+        with self.assertRaises(ValueError):
+            parse_arn('arn:aws:iam::123456789012')
+
+    def test_parse_arns(self):
+        values = [self.role_arn, 'arn:aws:iam::210987654321:user/alice', self.role_arn]
+        parsed = parse_arns(values)
+        self.assertEqual([item.account for item in parsed], ['123456789012', '210987654321', '123456789012'])
+        self.assertIs(parsed[0], parsed[2])
+        self.assertEqual(parse_arns([]), [])
+        with self.assertRaises(ValueError):
+            parse_arns(['role/deploy'])
+        self.assertEqual(parse_arns(['role/deploy', self.role_arn], strict=False)[0], None)
+        with self.assertRaises(TypeError):
+            parse_arns([1])
+        with self.assertRaises(TypeError):
+            parse_arns([[self.role_arn]])
+        self.assertEqual(parse_arns([1, [self.role_arn], self.role_arn], strict=False)[:2], [None, None])
+
+    def test_models(self):
+        role = Role(account=self.account, name='deploy', id='AROADEPLOY', arn=self.role_arn, max_session_duration=3600)
+        parsed = role.parsed_arn
+        self.assertEqual(parsed.name, 'deploy')
+        self.assertIs(role.parsed_arn, parsed)
+        role.arn = 'arn:aws:iam::123456789012:role/admin'
+        self.assertEqual(role.parsed_arn.name, 'admin')
+
+        user = User(account=self.account, name='alice', id='AIDAALICE', arn='arn:aws:iam::123456789012:user/alice')
+        self.assertEqual(user.parsed_arn.resource_type, 'user')
+        boundary = PermissionsBoundary('Policy', 'arn:aws:iam::123456789012:policy/Guardrail')
+        self.assertEqual((boundary.parsed_arn.account, boundary.parsed_arn.name), ('123456789012', 'Guardrail'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from pyawsopstoolkit_models.bulk import build_models, map_models
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, SecurityGroup
+
+
+def count_rules(security_groups):
+    return sum(len(security_group.ip_permissions or []) for security_group in security_groups)
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.payloads = [
+            {
+                'GroupId': f'sg-{index}', 'GroupName': f'group-{index}', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+                'IpPermissions': [
+                    {'IpProtocol': 'tcp', 'FromPort': port, 'ToPort': port, 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}
+                    for port in range(index % 3)
+                ],
+                'Tags': [{'Key': 'Owner', 'Value': 'team-x'}]
+            } for index in range(10)
+        ]
+
+    def test_build_models(self):
+        expected = [SecurityGroup.from_response(self.account, 'eu-west-1', data) for data in self.payloads]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                security_groups = build_models(
+                    SecurityGroup, self.payloads, (self.account, 'eu-west-1'), workers=workers, chunk_size=3
+                )
+                self.assertEqual(security_groups, expected)
+                self.assertIs(security_groups[0].tags, security_groups[9].tags)
+        lazy = build_models(SecurityGroup, self.payloads, (self.account, 'eu-west-1'), workers=1, lazy=True)
+        self.assertEqual(lazy, expected)
+        self.assertEqual(build_models(IPPermission, self.payloads[2]['IpPermissions']), expected[2].ip_permissions)
+        self.assertEqual(build_models(IPPermission, [], workers=2), [])
+
+    def test_map_models(self):
+        counts = map_models(
+            SecurityGroup, self.payloads, count_rules, (self.account, 'eu-west-1'), workers=2, chunk_size=4
+        )
+        self.assertEqual(counts, [3, 4, 2])
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            build_models(dict, self.payloads)
+        with self.assertRaises(ValueError):
+            build_models(SecurityGroup, self.payloads, (self.account, 'eu-west-1'), chunk_size=0)
+        with self.assertRaises(TypeError):
+            map_models(SecurityGroup, self.payloads, 'count', (self.account, 'eu-west-1'))
+        with self.assertRaises(TypeError):
+            build_models(SecurityGroup, [{**self.payloads[0], 'GroupName': 1}], (self.account, 'eu-west-1'), workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
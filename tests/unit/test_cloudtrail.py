@@ -0,0 +1,229 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from pyawsopstoolkit_models.cloudtrail import EventApplier, read_events
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.access_key_index import AccessKeyIndex
+from pyawsopstoolkit_models.iam.permissions_boundary_index import PermissionsBoundaryIndex
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.trust_policy import TrustPolicyIndex
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.query import ResourceCollection, field, tag
+from pyawsopstoolkit_models.tags import TagIndex
+
+
+def _record(event_name: str, parameters: dict, response: dict = None, **values) -> dict:
+    record = {
+        'eventTime': '2024-05-01T10:00:00Z', 'eventName': event_name, 'awsRegion': 'eu-west-1',
+        'recipientAccountId': '123456789012', 'requestParameters': parameters, 'responseElements': response
+    }
+    record.update(values)
+    return record
+
+
+class TestEventApplier(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.security_group = SecurityGroup.from_response(self.account, 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+            'IpPermissions': [
+                {'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443, 'IpRanges': [{'CidrIp': '10.0.0.0/8'}]}
+            ]
+        })
+        self.role = Role.from_response(self.account, {
+            'RoleName': 'deploy', 'RoleId': 'AROA1', 'Arn': 'arn:aws:iam::123456789012:role/deploy',
+            'AssumeRolePolicyDocument': {
+                'Version': '2012-10-17',
+                'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '210987654321'}, 'Action': 'sts:AssumeRole'}]
+            }
+        })
+        self.user = User.from_response(self.account, {
+            'UserName': 'alice', 'UserId': 'AIDA1', 'Arn': 'arn:aws:iam::123456789012:user/alice',
+            'AccessKeys': [{'AccessKeyId': 'AKIA1', 'Status': 'Active'}]
+        })
+        self.collection = ResourceCollection([self.security_group, self.role, self.user])
+        self.collection.create_index('name')
+        self.applier = EventApplier([self.security_group, self.role, self.user], [self.collection])
+
+    def test_security_group_rules(self):
+        self.security_group.cache_dict()
+        self.assertIsNotNone(self.security_group.to_dict())
+        previous = self.security_group.fingerprint
+        records = [
+            _record('AuthorizeSecurityGroupIngress', {'groupId': 'sg-1', 'ipPermissions': {'items': [
+                {'ipProtocol': 'tcp', 'fromPort': 443, 'toPort': 443, 'ipRanges': {'items': [
+                    {'cidrIp': '10.0.0.0/8'}, {'cidrIp': '0.0.0.0/0', 'description': 'Public'}
+                ]}, 'ipv6Ranges': {}, 'prefixListIds': {}, 'groups': {}},
+                {'ipProtocol': 'tcp', 'fromPort': 22, 'toPort': 22, 'groups': {'items': [{'groupId': 'sg-2'}]}}
+            ]}}),
+            _record('AuthorizeSecurityGroupEgress', {'groupId': 'sg-1', 'ipPermissions': {'items': [
+                {'ipProtocol': '-1', 'prefixListIds': {'items': [{'prefixListId': 'pl-1'}]}}
+            ]}}),
+            _record('RevokeSecurityGroupIngress', {'groupId': 'sg-1', 'ipPermissions': {'items': [
+                {'ipProtocol': 'tcp', 'fromPort': 443, 'toPort': 443, 'ipRanges': {'items': [{'cidrIp': '10.0.0.0/8'}]}}
+            ]}})
+        ]
+        self.assertEqual(self.applier.apply(records), {'applied': 3, 'failed': 0, 'ignored': 0, 'missing': 0})
+        expected = SecurityGroup.from_response(self.account, 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+            'IpPermissions': [
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 22, 'ToPort': 22,
+                    'UserIdGroupPairs': [{'GroupId': 'sg-2', 'UserId': '123456789012'}]
+                },
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443,
+                    'IpRanges': [{'CidrIp': '0.0.0.0/0', 'Description': 'Public'}]
+                }
+            ],
+            'IpPermissionsEgress': [{'IpProtocol': '-1', 'PrefixListIds': [{'PrefixListId': 'pl-1'}]}]
+        })
+        self.assertNotEqual(self.security_group.fingerprint, previous)
+        self.assertEqual(self.security_group.fingerprint, expected.fingerprint)
+        self.assertEqual(self.security_group.to_dict()['ip_permissions'][0]['ip_ranges'][0]['cidr_ip'], '0.0.0.0/0')
+        self.applier.apply_record(_record('RevokeSecurityGroupIngress', {'groupId': 'sg-1', 'ipPermissions': {'items': [
+            {'ipProtocol': 'tcp', 'fromPort': 443, 'toPort': 443, 'ipRanges': {'items': [{'cidrIp': '0.0.0.0/0'}]}},
+            {'ipProtocol': 'tcp', 'fromPort': 22, 'toPort': 22, 'groups': {'items': [{'groupId': 'sg-2'}]}}
+        ]}}))
+        self.assertIsNone(self.security_group.ip_permissions)
+
+    def test_security_group_lifecycle(self):
+        tag_index = TagIndex([self.security_group])
+        applier = EventApplier([self.security_group], [self.collection, tag_index])
+        self.assertEqual(applier.apply([
+            _record('CreateSecurityGroup', {
+                'groupName': 'db', 'groupDescription': 'Databases', 'vpcId': 'vpc-1',
+                'tagSpecificationSet': {'items': [{'resourceType': 'security-group', 'tags': [
+                    {'key': 'Owner', 'value': 'team-a'}
+                ]}]}
+            }, {'groupId': 'sg-3'}),
+            _record('CreateTags', {
+                'resourcesSet': {'items': [{'resourceId': 'sg-1'}, {'resourceId': 'i-1'}]},
+                'tagSet': {'items': [{'key': 'Owner', 'value': 'team-b'}]}
+            })
+        ]), {'applied': 2, 'failed': 0, 'ignored': 0, 'missing': 0})
+        created = applier.get_resource(SecurityGroup, '123456789012', 'sg-3', 'eu-west-1')
+        self.assertIs(created.account, self.account)
+        self.assertEqual(created.ip_permissions_egress[0].ip_ranges[0].cidr_ip, '0.0.0.0/0')
+        self.assertEqual(self.collection.filter(field('name') == 'db'), [created])
+        self.assertEqual(tag_index.find({'Owner': 'team-a'}), [created])
+        self.assertEqual(tag_index.find({'Owner': 'team-b'}), [self.security_group])
+        applier.apply([
+            _record('DeleteTags', {
+                'resourcesSet': {'items': [{'resourceId': 'sg-1'}]}, 'tagSet': {'items': [{'key': 'Owner'}]}
+            }),
+            _record('DeleteSecurityGroup', {'groupId': 'sg-3'})
+        ])
+        self.assertIsNone(self.security_group.tags)
+        self.assertEqual(tag_index.find_missing('Owner'), [self.security_group])
+        self.assertEqual(self.collection.filter(field('name') == 'db'), [])
+        self.assertIsNone(applier.get_resource(SecurityGroup, '123456789012', 'sg-3', 'eu-west-1'))
+
+    def test_users(self):
+        access_keys = AccessKeyIndex([self.user])
+        boundaries = PermissionsBoundaryIndex([self.user])
+        boundary = 'arn:aws:iam::123456789012:policy/Boundary'
+        self.assertEqual(self.applier.apply([
+            _record('CreateAccessKey', {}, {'accessKey': {
+                'accessKeyId': 'AKIA2', 'status': 'Active', 'userName': 'alice', 'createDate': 'May 1, 2024 10:00:00 AM'
+            }}, userIdentity={'type': 'IAMUser', 'userName': 'alice'}),
+            _record('UpdateAccessKey', {'userName': 'alice', 'accessKeyId': 'AKIA1', 'status': 'Inactive'}),
+            _record('DeleteAccessKey', {'accessKeyId': 'AKIA3'}, userIdentity={'type': 'IAMUser', 'userName': 'alice'}),
+            _record('PutUserPermissionsBoundary', {'userName': 'alice', 'permissionsBoundary': boundary}),
+            _record('TagUser', {'userName': 'alice', 'tags': [{'key': 'Team', 'value': 'a'}]})
+        ]), {'applied': 5, 'failed': 0, 'ignored': 0, 'missing': 0})
+        self.assertIs(access_keys.get_user('AKIA2'), self.user)
+        self.assertEqual(self.user.access_keys[1].created_date, datetime(2024, 5, 1, 10, tzinfo=timezone.utc))
+        self.assertEqual(self.user.access_keys[0].status, 'Inactive')
+        self.assertEqual(boundaries.get_principals(boundary), [self.user])
+        self.assertEqual(self.user.get_tag('Team'), 'a')
+        self.applier.apply([
+            _record('DeleteAccessKey', {'userName': 'alice', 'accessKeyId': 'AKIA2'}),
+            _record('DeleteUserPermissionsBoundary', {'userName': 'alice'}),
+            _record('UntagUser', {'userName': 'alice', 'tagKeys': ['Team']})
+        ])
+        self.assertIsNone(access_keys.get_user('AKIA2'))
+        self.assertEqual(boundaries.get_principals(boundary), [])
+        self.assertIsNone(self.user.tags)
+        self.applier.apply([
+            _record('CreateUser', {'userName': 'bob', 'tags': [{'key': 'Team', 'value': 'b'}]}, {'user': {
+                'userName': 'bob', 'userId': 'AIDA2', 'arn': 'arn:aws:iam::123456789012:user/bob', 'path': '/'
+            }}),
+            _record('DeleteUser', {'userName': 'alice'})
+        ])
+        bob = self.applier.get_resource(User, '123456789012', 'bob')
+        self.assertEqual(self.collection.filter(tag('Team', 'b')), [bob])
+        self.assertNotIn(self.user, self.collection)
+        self.assertEqual(len(self.applier), 3)
+
+    def test_roles(self):
+        trust = TrustPolicyIndex([self.role])
+        document = {
+            'Version': '2012-10-17',
+            'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '111122223333'}, 'Action': 'sts:AssumeRole'}]
+        }
+        self.applier.apply([
+            _record('UpdateAssumeRolePolicy', {'roleName': 'deploy', 'policyDocument': json.dumps(document)}),
+            _record('UpdateRole', {'roleName': 'deploy', 'description': 'Deployments', 'maxSessionDuration': 7200}),
+            _record('PutRolePermissionsBoundary', {
+                'roleName': 'deploy', 'permissionsBoundary': 'arn:aws:iam::123456789012:policy/Boundary'
+            }),
+            _record('TagRole', {'roleName': 'deploy', 'tags': [{'key': 'Owner', 'value': 'team-a'}]}),
+            _record('CreateRole', {'roleName': 'ci', 'maxSessionDuration': 3600}, {'role': {
+                'roleName': 'ci', 'roleId': 'AROA2', 'arn': 'arn:aws:iam::123456789012:role/ci', 'path': '/',
+                'assumeRolePolicyDocument': quote(json.dumps(document))
+            }})
+        ])
+        self.assertEqual(trust.get_roles_for_account('111122223333'), [self.role])
+        self.assertEqual(trust.get_roles_for_account('210987654321'), [])
+        self.assertEqual((self.role.description, self.role.max_session_duration), ('Deployments', 7200))
+        self.assertEqual(self.role.permissions_boundary.type, 'PermissionsBoundaryPolicy')
+        self.assertEqual(self.role.get_tag('Owner'), 'team-a')
+        created = self.applier.get_resource(Role, '123456789012', 'ci')
+        self.assertEqual(created.assume_role_policy_document, document)
+        self.assertEqual(created.created_date, datetime(2024, 5, 1, 10, tzinfo=timezone.utc))
+        self.assertIn(created, self.collection)
+
+    def test_outcomes(self):
+        self.assertEqual(self.applier.apply([
+            _record('AuthorizeSecurityGroupIngress', {'groupId': 'sg-1'}, errorCode='InvalidPermission.Duplicate'),
+            _record('DescribeSecurityGroups', {}),
+            _record('DeleteRole', {'roleName': 'missing'}),
+            _record('DeleteSecurityGroup', {'groupId': 'sg-1'}, awsRegion='us-east-1'),
+            _record('UpdateAccessKey', {'userName': 'alice', 'accessKeyId': 'AKIA9', 'status': 'Inactive'})
+        ]), {'applied': 0, 'failed': 1, 'ignored': 1, 'missing': 3})
+        self.assertEqual(len(self.applier), 3)
+        with self.assertRaises(ValueError):
+            self.applier.add_resource(self.user)
+        with self.assertRaises(TypeError):
+            self.applier.apply_record('AuthorizeSecurityGroupIngress')
+        with self.assertRaises(TypeError):
+            EventApplier(collections=[[]])
+        with self.assertRaises(TypeError):
+            self.applier.get_resource(dict, '123456789012', 'alice')
+
+    def test_read_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first, second = os.path.join(directory, 'first.json.gz'), os.path.join(directory, 'second.json')
+            with gzip.open(first, 'wt', encoding='utf-8') as file:
+                json.dump({'Records': [
+                    _record('TagUser', {}, eventTime='2024-05-01T10:05:00Z'),
+                    _record('CreateUser', {}, eventTime='2024-05-01T10:00:00Z')
+                ]}, file)
+            with open(second, 'w', encoding='utf-8') as file:
+                json.dump({'Records': [_record('UntagUser', {}, eventTime='2024-05-01T10:02:00Z')]}, file)
+            self.assertEqual(
+                [record['eventName'] for record in read_events([first, second])], ['CreateUser', 'UntagUser', 'TagUser']
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
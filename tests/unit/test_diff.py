@@ -0,0 +1,116 @@
+import unittest
+from datetime import datetime
+
+from pyawsopstoolkit_models.diff import diff_resource, diff_snapshots, resource_key
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, IPRange, SecurityGroup
+from pyawsopstoolkit_models.iam.role import LastUsed, Role
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+
+
+class TestDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+
+    def create_security_group(self, group_id='sg-12345678', cidrs=('10.0.0.0/8',), tags=None):
+        return SecurityGroup(
+            account=self.account, region='eu-west-1', id=group_id, name='web-servers-sg', owner_id='123456789012',
+            vpc_id='vpc-abcdefgh', tags=tags,
+            ip_permissions=[IPPermission(443, 443, 'tcp', ip_ranges=[IPRange(cidr) for cidr in cidrs])]
+        )
+
+    def create_role(self, name='role', max_session_duration=3600, region='eu-west-1'):
+        return Role(
+            account=self.account, name=name, id='AROA', arn=f'arn:aws:iam::123456789012:role/{name}',
+            max_session_duration=max_session_duration, last_used=LastUsed(datetime(2024, 1, 1), region)
+        )
+
+    def create_user(self, keys=(('AKIA1', 'Active'),)):
+        return User(
+            account=self.account, name='user', id='AIDA', arn='arn:aws:iam::123456789012:user/user',
+            access_keys=[AccessKey(key_id, status) for key_id, status in keys]
+        )
+
+    def test_resource_key(self):
+        self.assertEqual(resource_key(self.create_security_group()),
+                         ('SecurityGroup', ('123456789012', 'eu-west-1', 'sg-12345678')))
+        self.assertEqual(resource_key(self.create_role()), ('Role', 'arn:aws:iam::123456789012:role/role'))
+        self.assertEqual(resource_key(self.create_user()), ('User', 'arn:aws:iam::123456789012:user/user'))
+        with self.assertRaises(TypeError):
+            resource_key(self.account)
+
+    def test_invalid_snapshots(self):
+        with self.assertRaises(ValueError):
+            diff_snapshots([self.create_role(), self.create_role()], [])
+        with self.assertRaises(ValueError):
+            diff_resource(self.create_role('a'), self.create_role('b'))
+
+    def test_added_removed_unchanged(self):
+        old = [self.create_security_group('sg-1'), self.create_role('a'), self.create_user()]
+        new = [self.create_security_group('sg-2'), self.create_role('a'), old[2]]
+        diff = diff_snapshots(old, new)
+        self.assertEqual(diff.added, [new[0]])
+        self.assertEqual(diff.removed, [old[0]])
+        self.assertEqual(diff.changed, [])
+        self.assertEqual(diff.unchanged, 2)
+
+    def test_accounts(self):
+        from pyawsopstoolkit.account import Account
+
+        other = SecurityGroup(
+            account=Account('210987654321'), region='eu-west-1', id='sg-12345678', name='web-servers-sg',
+            owner_id='210987654321', vpc_id='vpc-abcdefgh'
+        )
+        old = [self.create_security_group(), other]
+        diff = diff_snapshots(old, [other, self.create_security_group()])
+        self.assertEqual((diff.added, diff.removed, diff.changed, diff.unchanged), ([], [], [], 2))
+
+    def test_rule_changes(self):
+        old = self.create_security_group(cidrs=('10.0.0.0/8', '192.168.0.0/16'))
+        new = self.create_security_group(cidrs=('192.168.0.0/16', '172.16.0.0/12'), tags=[{'Key': 'a', 'Value': 'b'}])
+        diff = diff_snapshots([old], [new])
+        self.assertEqual(len(diff.changed), 1)
+        delta = diff.changed[0]
+        self.assertEqual(delta.key, ('SecurityGroup', ('123456789012', 'eu-west-1', 'sg-12345678')))
+        self.assertEqual([(change.field, change.old, change.new) for change in delta.field_changes],
+                         [('tags', None, [{'Key': 'a', 'Value': 'b'}])])
+        self.assertEqual(len(delta.item_changes), 1)
+        change = delta.item_changes[0]
+        self.assertEqual(change.field, 'ip_permissions')
+        self.assertEqual([item.ip_ranges[0].cidr_ip for item in change.added], ['172.16.0.0/12'])
+        self.assertEqual([item.ip_ranges[0].cidr_ip for item in change.removed], ['10.0.0.0/8'])
+        self.assertEqual(change.added[0].from_port, 443)
+
+    def test_reordered_rules(self):
+        old = self.create_security_group(cidrs=('10.0.0.0/8', '192.168.0.0/16'))
+        new = self.create_security_group(cidrs=('192.168.0.0/16', '10.0.0.0/8'))
+        diff = diff_snapshots([old], [new])
+        self.assertEqual(diff.changed, [])
+        self.assertEqual(diff.unchanged, 1)
+
+    def test_role_changes(self):
+        diff = diff_snapshots([self.create_role()], [self.create_role(max_session_duration=7200, region='us-east-1')])
+        self.assertEqual(
+            [(change.field, change.old, change.new) for change in diff.changed[0].field_changes],
+            [('max_session_duration', 3600, 7200), ('last_used.region', 'eu-west-1', 'us-east-1')]
+        )
+
+    def test_access_key_changes(self):
+        old = self.create_user(keys=(('AKIA1', 'Active'), ('AKIA2', 'Active')))
+        new = self.create_user(keys=(('AKIA2', 'Inactive'), ('AKIA3', 'Active')))
+        delta = diff_snapshots([old], [new]).changed[0]
+        self.assertEqual(
+            [(change.field, change.old, change.new) for change in delta.field_changes],
+            [('access_keys[AKIA2].status', 'Active', 'Inactive')]
+        )
+        self.assertEqual(
+            [(change.field, [key.id for key in change.added], [key.id for key in change.removed])
+             for change in delta.item_changes],
+            [('access_keys', ['AKIA3'], ['AKIA1'])]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.history import HistoryStore, RuleLifetime
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.security_group = SecurityGroup.from_response(self.account, 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+            'Description': 'Web servers', 'Tags': [{'Key': 'Owner', 'Value': 'team-a'}],
+            'IpPermissions': [
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443,
+                    'IpRanges': [{'CidrIp': '0.0.0.0/0', 'Description': 'Public'}],
+                    'UserIdGroupPairs': [{'GroupId': 'sg-2', 'UserId': '123456789012', 'Description': 'Admin'}]
+                }
+            ],
+            'IpPermissionsEgress': [{'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}]
+        })
+        self.role = Role.from_response(self.account, {
+            'RoleName': 'deploy', 'RoleId': 'AROA1', 'Arn': 'arn:aws:iam::123456789012:role/deploy',
+            'CreateDate': datetime(2023, 1, 1, tzinfo=timezone.utc), 'Tags': [{'Key': 'Owner', 'Value': 'team-a'}]
+        })
+        self.user = User.from_response(self.account, {
+            'UserName': 'alice', 'UserId': 'AIDA1', 'Arn': 'arn:aws:iam::123456789012:user/alice',
+            'CreateDate': datetime(2023, 2, 1, tzinfo=timezone.utc),
+            'AccessKeys': [{'AccessKeyId': 'AKIA1', 'Status': 'Active'}]
+        })
+        self.group = ('123456789012', 'eu-west-1', 'sg-1')
+        self.store = HistoryStore()
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def _open_ssh(self) -> SecurityGroup:
+        return SecurityGroup.from_response(self.account, 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+            'IpPermissions': [
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443, 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]
+                },
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 22, 'ToPort': 22, 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]
+                }
+            ]
+        })
+
+    def test_delta(self):
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-01', [self.security_group, self.role, self.user]),
+            {'added': 3, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        )
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-02', [self.security_group, self.role, self.user]),
+            {'added': 0, 'changed': 0, 'removed': 0, 'unchanged': 3}
+        )
+        changed = self._open_ssh()
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-03', [changed, self.user]),
+            {'added': 0, 'changed': 1, 'removed': 1, 'unchanged': 1}
+        )
+        self.assertEqual(self.store.snapshots(), ['2024-01-01', '2024-01-02', '2024-01-03'])
+        self.assertEqual(self.store.get_snapshot('2024-01-01'), [self.security_group, self.role, self.user])
+        self.assertEqual(self.store.get_snapshot('2024-01-02', Role), [self.role])
+        self.assertEqual(self.store.get_snapshot('2024-01-03'), [self.user, changed])
+        self.assertEqual(self.store.get_snapshot('2024-01-03', SecurityGroup), [changed])
+        self.assertEqual(self.store.get_snapshot('2024-01-03', Role), [])
+        self.assertEqual(self.store.history(changed), [
+            ('2024-01-01', '2024-01-03', self.security_group), ('2024-01-03', None, changed)
+        ])
+        self.assertEqual(self.store.history(self.role), [('2024-01-01', '2024-01-03', self.role)])
+        with self.assertRaises(ValueError):
+            self.store.add_snapshot('2024-01-03', [])
+        with self.assertRaises(ValueError):
+            self.store.add_snapshot('2024-01-04', [self.user, self.user])
+        with self.assertRaises(KeyError):
+            self.store.get_snapshot('2024-01-04')
+        with self.assertRaises(TypeError):
+            self.store.get_snapshot('2024-01-01', dict)
+        self.assertEqual(self.store.snapshots(), ['2024-01-01', '2024-01-02', '2024-01-03'])
+
+    def test_rule_lifetimes(self):
+        self.store.add_snapshot('2024-01-01', [self.security_group])
+        self.store.add_snapshot('2024-01-02', [self._open_ssh()])
+        self.store.add_snapshot('2024-01-03', [])
+        self.assertEqual(self.store.rule_lifetimes(source='0.0.0.0/0', port=22), [
+            RuleLifetime(*self.group, True, '-1', -1, -1, '0.0.0.0/0', '2024-01-01', '2024-01-02'),
+            RuleLifetime(*self.group, False, 'tcp', 22, 22, '0.0.0.0/0', '2024-01-02', '2024-01-03')
+        ])
+        self.assertEqual(self.store.rule_lifetimes(source='0.0.0.0/0', port=443, egress=False), [
+            RuleLifetime(*self.group, False, 'tcp', 443, 443, '0.0.0.0/0', '2024-01-01', '2024-01-03')
+        ])
+        self.assertEqual(self.store.rule_lifetimes(security_group_id='sg-1', source='sg-2'), [
+            RuleLifetime(*self.group, False, 'tcp', 443, 443, 'sg-2', '2024-01-01', '2024-01-02')
+        ])
+        self.assertEqual(self.store.rule_lifetimes(security_group_id='sg-2'), [])
+        with self.assertRaises(TypeError):
+            self.store.rule_lifetimes(port='22')
+
+    def test_accounts(self):
+        from pyawsopstoolkit.account import Account
+
+        other = SecurityGroup.from_response(Account('210987654321'), 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '210987654321', 'VpcId': 'vpc-1',
+            'IpPermissions': [
+                {'IpProtocol': 'tcp', 'FromPort': 22, 'ToPort': 22, 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}
+            ]
+        })
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-01', [self._open_ssh(), other]),
+            {'added': 2, 'changed': 0, 'removed': 0, 'unchanged': 0}
+        )
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-02', [self._open_ssh()]),
+            {'added': 0, 'changed': 0, 'removed': 1, 'unchanged': 1}
+        )
+        self.assertEqual(self.store.rule_lifetimes(source='0.0.0.0/0', port=22), [
+            RuleLifetime(*self.group, False, 'tcp', 22, 22, '0.0.0.0/0', '2024-01-01', None),
+            RuleLifetime('210987654321', 'eu-west-1', 'sg-1', False, 'tcp', 22, 22, '0.0.0.0/0', '2024-01-01',
+                         '2024-01-02')
+        ])
+        self.assertEqual(self.store.rule_lifetimes(account='210987654321', region='eu-west-1', port=443), [])
+        self.assertEqual([name for name, _, _ in self.store.history(other)], ['2024-01-01'])
+        self.assertEqual(self.store.get_snapshot('2024-01-01', SecurityGroup), [self._open_ssh(), other])
+
+    def test_in_place_change(self):
+        from pyawsopstoolkit_models.ec2.security_group import IPRange
+
+        security_group = self._open_ssh()
+        self.store.add_snapshot('2024-01-01', [security_group])
+        security_group.ip_permissions[1].ip_ranges.append(IPRange('10.0.0.0/8'))
+        security_group.ip_permissions.append(security_group.ip_permissions.pop(0))
+        self.assertEqual(
+            self.store.add_snapshot('2024-01-02', [security_group]),
+            {'added': 0, 'changed': 1, 'removed': 0, 'unchanged': 0}
+        )
+        security_group.ip_permissions[0].ip_ranges[0] = IPRange('192.168.0.0/16')
+        self.store.add_snapshot('2024-01-03', [security_group])
+        self.assertEqual(self.store.rule_lifetimes(source='10.0.0.0/8'), [
+            RuleLifetime(*self.group, False, 'tcp', 22, 22, '10.0.0.0/8', '2024-01-02', None)
+        ])
+        self.assertEqual(self.store.rule_lifetimes(source='0.0.0.0/0', port=22), [
+            RuleLifetime(*self.group, False, 'tcp', 22, 22, '0.0.0.0/0', '2024-01-01', '2024-01-03')
+        ])
+        self.assertEqual(self.store.get_snapshot('2024-01-03'), [security_group])
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.db')
+            with HistoryStore(path) as store:
+                store.add_snapshot('2024-01-01', [self.security_group, self.role])
+            with HistoryStore(path) as store:
+                self.assertEqual(
+                    store.add_snapshot('2024-01-02', [self.security_group, self.role, self.user]),
+                    {'added': 1, 'changed': 0, 'removed': 0, 'unchanged': 2}
+                )
+                self.assertEqual(store.get_snapshot('2024-01-01'), [self.security_group, self.role])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import copy
+import gc
+import pickle
+import unittest
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.access_key_index import AccessKeyIndex
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+from pyawsopstoolkit_models.identity import IdentityMap
+from pyawsopstoolkit_models.query import ResourceCollection, field
+
+
+class TestIdentityMap(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.identity_map = IdentityMap()
+
+    def _security_group(self, vpc_id: str = 'vpc-1', lazy: bool = False) -> SecurityGroup:
+        return SecurityGroup.from_response(self.account, 'eu-west-1', {
+            'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': vpc_id,
+            'IpPermissions': [
+                {
+                    'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443,
+                    'IpRanges': [{'CidrIp': f'10.0.0.0/{len(vpc_id)}'}]
+                }
+            ]
+        }, lazy=lazy)
+
+    def _user(self, key_id: str) -> User:
+        return User.from_response(self.account, {
+            'UserName': 'alice', 'UserId': 'AIDA1', 'Arn': 'arn:aws:iam::123456789012:user/alice',
+            'AccessKeys': [{'AccessKeyId': key_id, 'Status': 'Active'}]
+        })
+
+    def test_one_instance(self):
+        with self.identity_map:
+            first = self._security_group()
+            collection = ResourceCollection([first])
+            collection.create_index('vpc_id')
+            fingerprint = first.fingerprint
+            second = self._security_group('vpc-22')
+            self.assertIs(second, first)
+            self.assertEqual(first.vpc_id, 'vpc-22')
+            self.assertEqual(first.ip_permissions[0].ip_ranges[0].cidr_ip, '10.0.0.0/6')
+            self.assertNotEqual(first.fingerprint, fingerprint)
+            self.assertEqual(collection.filter(field('vpc_id') == 'vpc-22'), [first])
+            self.assertEqual(collection.filter(field('vpc_id') == 'vpc-1'), [])
+            user = self._user('AKIA1')
+            access_keys = AccessKeyIndex([user])
+            self.assertIs(self._user('AKIA2'), user)
+            self.assertIs(access_keys.get_user('AKIA2'), user)
+            self.assertIsNone(access_keys.get_user('AKIA1'))
+            self.assertIs(self.identity_map.get(SecurityGroup, '123456789012', 'sg-1', 'eu-west-1'), first)
+            self.assertIsNone(self.identity_map.get(SecurityGroup, '123456789012', 'sg-1', 'us-east-1'))
+            self.assertIs(self.identity_map.get(User, '123456789012', user.arn), user)
+            self.assertIsNone(self.identity_map.get(Role, '123456789012', 'arn:aws:iam::123456789012:role/deploy'))
+            self.assertIn(user, self.identity_map)
+            self.assertEqual(len(self.identity_map), 2)
+        self.assertIsNot(self._security_group(), first)
+        with self.assertRaises(TypeError):
+            self.identity_map.get(dict, '123456789012', 'sg-1')
+
+    def test_lazy(self):
+        with self.identity_map:
+            first = self._security_group(lazy=True)
+            self.assertIn('_lazy', first.__dict__)
+            self.assertIs(self._security_group(lazy=True), first)
+            second = self._security_group('vpc-333', lazy=True)
+            self.assertIs(second, first)
+            self.assertNotIn('_lazy', first.__dict__)
+            self.assertEqual(first.ip_permissions[0].ip_ranges[0].cidr_ip, '10.0.0.0/7')
+
+    def test_regions(self):
+        with self.identity_map:
+            first = self._security_group()
+            second = SecurityGroup(self.account, 'us-east-1', 'sg-1', 'web', '123456789012', 'vpc-1')
+            self.assertIsNot(second, first)
+            self.assertIs(self.identity_map.get(SecurityGroup, '123456789012', 'sg-1', 'us-east-1'), second)
+            self.assertIs(self.identity_map.get(SecurityGroup, '123456789012', 'sg-1', 'eu-west-1'), first)
+
+    def test_invalid_update(self):
+        with self.identity_map:
+            security_group = self._security_group()
+            fingerprint = security_group.fingerprint
+            with self.assertRaises(TypeError):
+                SecurityGroup(self.account, 'eu-west-1', 'sg-1', 'n2', '123456789012', 'vpc-9', description=5)
+            self.assertEqual(security_group.name, 'web')
+            self.assertEqual(security_group.vpc_id, 'vpc-1')
+            self.assertIsNone(security_group.description)
+            self.assertEqual(security_group.fingerprint, fingerprint)
+            self.assertIs(self.identity_map.get(SecurityGroup, '123456789012', 'sg-1', 'eu-west-1'), security_group)
+        with self.identity_map:
+            with self.assertRaises(TypeError):
+                SecurityGroup(self.account, 'eu-west-1', 'sg-2', 'web', '123456789012', 'vpc-1', description=5)
+            self.assertIsNone(self.identity_map.get(SecurityGroup, '123456789012', 'sg-2', 'eu-west-1'))
+            user = self._user('AKIA1')
+            access_keys = AccessKeyIndex([user, User(
+                self.account, 'bob', 'AIDA2', 'arn:aws:iam::123456789012:user/bob',
+                access_keys=[AccessKey('AKIA2', 'Active')]
+            )])
+            with self.assertRaises(ValueError):
+                self._user('AKIA2')
+            self.assertEqual(user.access_keys[0].id, 'AKIA1')
+            self.assertIs(access_keys.get_user('AKIA1'), user)
+
+    def test_weak_references(self):
+        with self.identity_map:
+            security_group = self._security_group()
+            self.assertEqual(len(self.identity_map), 1)
+            del security_group
+            gc.collect()
+            self.assertEqual(len(self.identity_map), 0)
+
+    def test_copies(self):
+        with self.identity_map:
+            security_group = self._security_group()
+            for duplicate in (copy.copy(security_group), copy.deepcopy(security_group),
+                              pickle.loads(pickle.dumps(security_group))):
+                self.assertIsNot(duplicate, security_group)
+                self.assertEqual(duplicate, security_group)
+                self.assertNotIn(duplicate, self.identity_map)
+            duplicate.vpc_id = 'vpc-4'
+            self.assertIs(self.identity_map.resolve(duplicate), security_group)
+            self.assertEqual(security_group.vpc_id, 'vpc-4')
+        role = Role.from_response(self.account, {
+            'RoleName': 'deploy', 'RoleId': 'AROA1', 'Arn': 'arn:aws:iam::123456789012:role/deploy'
+        })
+        self.assertIs(self.identity_map.resolve(role), role)
+        self.assertIs(self.identity_map.resolve(copy.copy(role)), role)
+        with self.assertRaises(TypeError):
+            self.identity_map.resolve('sg-1')
+
+
+if __name__ == "__main__":
+    unittest.main()
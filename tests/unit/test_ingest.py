@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest import mock
+
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.ingest import PageSource, ingest
+from pyawsopstoolkit_models.tags import TagIndex
+
+
+async def paginate(key: str, items: list, page_size: int, log: list = None):
+    for start in range(0, len(items), page_size):
+        await asyncio.sleep(0)
+        if log is not None:
+            log.append(('page', start))
+        page = {key: items[start:start + page_size]}
+        if start + page_size < len(items):
+            page['NextToken'] = str(start + page_size)
+        yield page
+
+
+async def failing_pages():
+    yield {'SecurityGroups': []}
+    raise RuntimeError('throttled')
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.security_groups = [
+            {
+                'GroupId': f'sg-{index}', 'GroupName': f'group-{index}', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+                'Tags': [{'Key': 'Owner', 'Value': f'team-{index % 2}'}]
+            } for index in range(7)
+        ]
+        self.roles = [
+            {
+                'RoleName': f'role-{index}', 'RoleId': f'AROA{index}', 'Path': '/',
+                'Arn': f'arn:aws:iam::123456789012:role/role-{index}', 'CreateDate': datetime(2024, 1, 1),
+                'Tags': [{'Key': 'Owner', 'Value': 'team-0'}]
+            } for index in range(5)
+        ]
+
+    def sources(self, log: list = None) -> list:
+        return [
+            PageSource(
+                SecurityGroup, paginate('SecurityGroups', self.security_groups, 3, log), (self.account, 'eu-west-1')
+            ),
+            PageSource(Role, paginate('Roles', self.roles, 2, log), (self.account,))
+        ]
+
+    def test_ingest(self):
+        for executor in (None, ThreadPoolExecutor(2)):
+            with self.subTest(executor=executor):
+                index = TagIndex()
+                written = []
+
+                async def write(model):
+                    await asyncio.sleep(0)
+                    written.append(model)
+
+                count = asyncio.run(ingest(self.sources(), [index.add_resource, write], executor=executor))
+                self.assertEqual(count, 12)
+                self.assertEqual(len(index), 12)
+                self.assertEqual(
+                    sorted(model.id for model in written if isinstance(model, SecurityGroup)),
+                    sorted(data['GroupId'] for data in self.security_groups)
+                )
+                self.assertEqual(
+                    sorted(model.name for model in written if isinstance(model, Role)),
+                    sorted(data['RoleName'] for data in self.roles)
+                )
+                self.assertEqual(len(index.find({'Owner': 'team-0'})), 9)
+                roles = {model.name: model for model in written if isinstance(model, Role)}
+                self.assertEqual(roles['role-3'], Role.from_response(self.account, self.roles[3]))
+                if executor is not None:
+                    executor.shutdown()
+        self.assertEqual(asyncio.run(ingest([], [print])), 0)
+
+    def test_default_executor(self):
+        from pyawsopstoolkit_models.identity import IdentityMap
+
+        threads = set()
+        build = SecurityGroup.from_response
+
+        def from_response(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return build(*args, **kwargs)
+
+        models = []
+        with IdentityMap() as identity_map, mock.patch.object(SecurityGroup, 'from_response', from_response):
+            asyncio.run(ingest(self.sources(), [models.append]))
+            security_group = identity_map.get(SecurityGroup, '123456789012', 'sg-0', 'eu-west-1')
+            self.assertIn(security_group, models)
+        self.assertEqual(len(models), 12)
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_overlap(self):
+        log = []
+
+        def sink(model):
+            log.append(('model', model.id if isinstance(model, SecurityGroup) else model.name))
+
+        asyncio.run(ingest(self.sources(log), [sink], queue_size=1, converters=1))
+        self.assertEqual(len([entry for entry in log if entry[0] == 'page']), 6)
+        self.assertLess(log.index(('model', 'sg-0')), max(i for i, entry in enumerate(log) if entry[0] == 'page'))
+
+    def test_backpressure(self):
+        fetched = []
+
+        async def pages():
+            for index in range(20):
+                fetched.append(index)
+                yield {'SecurityGroups': [self.security_groups[index % 7]]}
+
+        async def run():
+            blocked = asyncio.Event()
+
+            async def sink(model):
+                await blocked.wait()
+
+            task = asyncio.ensure_future(
+                ingest([PageSource(SecurityGroup, pages(), (self.account, 'eu-west-1'))], [sink], 2, 1)
+            )
+            for _ in range(50):
+                await asyncio.sleep(0)
+            in_flight = len(fetched)
+            blocked.set()
+            self.assertEqual(await task, 20)
+            return in_flight
+
+        self.assertLessEqual(asyncio.run(run()), 7)
+
+    def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            asyncio.run(ingest([PageSource(SecurityGroup, failing_pages(), (self.account, 'eu-west-1'))], [print]))
+        invalid = [{**self.security_groups[0], 'GroupName': 1}]
+        with self.assertRaises(TypeError):
+            asyncio.run(ingest(
+                [PageSource(SecurityGroup, paginate('SecurityGroups', invalid, 1), (self.account, 'eu-west-1'))],
+                [print]
+            ))
+
+        def sink(model):
+            raise ValueError(model.id)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(ingest(self.sources(), [sink]))
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            PageSource(SecurityGroup, [], (self.account, 'eu-west-1'))
+        with self.assertRaises(TypeError):
+            PageSource(dict, paginate('Items', [], 1))
+        with self.assertRaises(ValueError):
+            PageSource(IPPermission, paginate('IpPermissions', [], 1))
+        with self.assertRaises(TypeError):
+            asyncio.run(ingest([{}], [print]))
+        with self.assertRaises(TypeError):
+            asyncio.run(ingest([], ['sink']))
+        with self.assertRaises(ValueError):
+            asyncio.run(ingest([], [print], converters=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
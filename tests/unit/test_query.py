@@ -0,0 +1,119 @@
+import unittest
+from datetime import datetime, timezone
+
+from pyawsopstoolkit_models.ec2.security_group import IPPermission, IPRange, SecurityGroup
+from pyawsopstoolkit_models.iam.role import LastUsed, Role
+from pyawsopstoolkit_models.iam.user import AccessKey, User
+from pyawsopstoolkit_models.query import Condition, ResourceCollection, field, tag
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.web = SecurityGroup(
+            account=self.account, region='eu-west-1', id='sg-web', name='web', owner_id='123456789012',
+            vpc_id='vpc-1', ip_permissions=[IPPermission(22, 22, 'tcp', ip_ranges=[IPRange('0.0.0.0/0')])],
+            tags=[{'Key': 'Owner', 'Value': 'team-x'}]
+        )
+        self.db = SecurityGroup(
+            account=self.account, region='us-east-1', id='sg-db', name='db', owner_id='123456789012',
+            vpc_id='vpc-1', ip_permissions=[IPPermission(5432, 5432, 'tcp', ip_ranges=[IPRange('10.0.0.0/8')])]
+        )
+        self.deploy = Role(
+            account=self.account, name='deploy', id='AROADEPLOY', arn='arn:aws:iam::123456789012:role/deploy',
+            max_session_duration=3600, created_date=datetime(2023, 1, 10),
+            last_used=LastUsed(datetime(2024, 3, 1, tzinfo=timezone.utc), 'eu-west-1'),
+            tags=[{'Key': 'Owner', 'Value': 'team-x'}]
+        )
+        self.alice = User(
+            account=self.account, name='alice', id='AIDAALICE', arn='arn:aws:iam::123456789012:user/alice',
+            created_date=datetime(2022, 6, 1),
+            access_keys=[AccessKey('AKIA1', 'Active'), AccessKey('AKIA2', 'Inactive')]
+        )
+        self.bob = User(
+            account=self.account, name='bob', id='AIDABOB', arn='arn:aws:iam::123456789012:user/bob',
+            created_date=datetime(2024, 2, 1, tzinfo=timezone.utc), access_keys=[AccessKey('AKIA3', 'Inactive')],
+            tags=[{'Key': 'Owner', 'Value': 'team-y'}]
+        )
+        self.collection = ResourceCollection([self.web, self.db, self.deploy, self.alice, self.bob])
+
+    def test_conditions(self):
+        condition = field('ip_permissions').any(
+            field('ip_ranges').any(field('cidr_ip') == '0.0.0.0/0') & (field('from_port') <= 22)
+        )
+        self.assertTrue(condition(self.web))
+        self.assertFalse(condition(self.db))
+        self.assertEqual(
+            str(condition), "any(ip_permissions: (any(ip_ranges: cidr_ip == '0.0.0.0/0') and from_port <= 22))"
+        )
+        self.assertTrue(field('access_keys').all(field('status') == 'Inactive')(self.bob))
+        self.assertFalse(field('access_keys').all(field('status') == 'Inactive')(self.alice))
+        self.assertTrue(field('access_keys').all(field('status') == 'Active')(self.deploy))
+        self.assertFalse(field('access_keys').any(field('status') == 'Active')(self.deploy))
+        self.assertTrue(field('last_used.region').isin(['eu-west-1', 'eu-west-2'])(self.deploy))
+        self.assertTrue((field('last_used.used_date') >= datetime(2024, 1, 1))(self.deploy))
+        self.assertFalse((field('created_date') > datetime(2020, 1, 1))(self.web))
+        self.assertTrue(field('name').startswith('al')(self.alice))
+        self.assertTrue((~tag('Owner'))(self.alice))
+        self.assertTrue((tag('Owner', 'team-y') | tag('Owner', 'team-z'))(self.bob))
+        with self.assertRaises(TypeError):
+            field('name') & 'alice'
+        with self.assertRaises(TypeError):
+            field('access_keys').any('Active')
+
+    def test_filter_without_indexes(self):
+        self.assertEqual(
+            self.collection.filter(field('created_date').between(datetime(2022, 1, 1), datetime(2023, 12, 31))),
+            [self.deploy, self.alice]
+        )
+        self.assertEqual(self.collection.filter(tag('Owner') & ~field('name').isin(['web'])), [self.deploy, self.bob])
+        plan = self.collection.explain(tag('Owner'))
+        self.assertIsNone(plan.index)
+        self.assertEqual((plan.candidates, plan.total), (5, 5))
+        self.assertEqual(str(plan), "scan 5 objects for tag 'Owner' exists")
+
+    def test_filter_with_indexes(self):
+        self.collection.create_index('name')
+        self.collection.create_range_index('created_date')
+        self.collection.create_tag_index()
+
+        condition = tag('Owner', 'team-x') & (field('name') == 'deploy')
+        plan = self.collection.explain(condition)
+        self.assertEqual((plan.index, plan.candidates), ('hash(name)', 1))
+        self.assertEqual(self.collection.filter(condition), [self.deploy])
+
+        condition = (field('created_date') >= datetime(2023, 1, 1)) & tag('Owner')
+        plan = self.collection.explain(condition)
+        self.assertEqual(
+            (plan.index, plan.index_condition, plan.candidates), ('range(created_date)', condition.conditions[0], 2)
+        )
+        self.assertEqual(self.collection.filter(condition), [self.deploy, self.bob])
+        self.assertEqual(self.collection.explain(tag('Owner', 'team-y')).index, 'tags')
+        self.assertEqual(self.collection.filter(field('name').isin(['bob', 'web', 'eve'])), [self.web, self.bob])
+        self.assertEqual(self.collection.filter(field('created_date') < datetime(2023, 1, 10)), [self.alice])
+
+        self.alice.name = 'alicia'
+        self.alice.created_date = datetime(2025, 1, 1)
+        self.assertEqual(self.collection.filter(field('name') == 'alicia'), [self.alice])
+        self.assertEqual(self.collection.filter(field('created_date') > datetime(2024, 6, 1)), [self.alice])
+        self.collection.remove_resource(self.alice)
+        self.assertEqual(self.collection.filter(field('name') == 'alicia'), [])
+        self.assertEqual(len(self.collection), 4)
+        with self.assertRaises(KeyError):
+            self.collection.remove_resource(self.alice)
+        with self.assertRaises(ValueError):
+            self.collection.add_resource(self.web)
+        with self.assertRaises(ValueError):
+            self.collection.create_index('last_used.region')
+        for field_name in ('tags', 'ip_permissions', 'assume_role_policy_document', 'account'):
+            with self.assertRaises(ValueError):
+                self.collection.create_index(field_name)
+        with self.assertRaises(TypeError):
+            Condition()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.query import field, tag
+from pyawsopstoolkit_models.shards import ShardedCollection, shard_key
+
+
+def count(resources):
+    return len(resources)
+
+
+class TestShardedCollection(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.accounts = [Account('123456789012'), Account('210987654321')]
+        self.security_groups = [
+            SecurityGroup(
+                account=self.accounts[index % 2], region=('eu-west-1', 'us-east-1')[index % 3 == 0],
+                id=f'sg-{index}', name=f'group-{index}', owner_id=self.accounts[index % 2].number, vpc_id='vpc-1',
+                tags=[{'Key': 'Owner', 'Value': f'team-{index % 2}'}]
+            ) for index in range(12)
+        ]
+        self.role = Role(
+            account=self.accounts[0], name='role', id='AROA1', arn='arn:aws:iam::123456789012:role/role',
+            max_session_duration=3600, path='/', created_date=datetime(2024, 1, 1)
+        )
+        self.collection = ShardedCollection([*self.security_groups, self.role])
+
+    def test_shards(self):
+        self.assertEqual(len(self.collection), 13)
+        self.assertEqual(self.collection.shard_keys(), [
+            ('123456789012', 'us-east-1'), ('210987654321', 'eu-west-1'), ('123456789012', 'eu-west-1'),
+            ('210987654321', 'us-east-1'), ('123456789012', None)
+        ])
+        self.assertEqual(shard_key(self.role), ('123456789012', None))
+        self.assertEqual(list(self.collection.shard(('123456789012', None))), [self.role])
+        self.assertIn(self.role, self.collection)
+        self.assertEqual(sorted(map(id, self.collection)), sorted(map(id, [*self.security_groups, self.role])))
+        with self.assertRaises(KeyError):
+            self.collection.shard(('123456789012', 'ap-south-1'))
+
+    def test_filter(self):
+        self.collection.create_index('vpc_id')
+        self.collection.create_tag_index()
+        condition = (field('vpc_id') == 'vpc-1') & tag('Owner', 'team-0')
+        self.assertEqual(self.collection.filter(condition), [
+            self.security_groups[0], self.security_groups[6], self.security_groups[2], self.security_groups[4],
+            self.security_groups[8], self.security_groups[10]
+        ])
+        self.assertEqual(
+            self.collection.filter(condition, regions=['us-east-1']), [self.security_groups[0], self.security_groups[6]]
+        )
+        self.assertEqual(self.collection.filter(field('name') == 'role', accounts=['123456789012']), [self.role])
+        self.assertEqual(self.collection.filter(field('name') == 'role', accounts=['210987654321']), [])
+        self.assertEqual(self.collection.shard(('123456789012', 'us-east-1')).explain(condition).candidates, 2)
+
+    def test_map(self):
+        expected = {key: len(self.collection.shard(key)) for key in self.collection.shard_keys()}
+        self.assertEqual(self.collection.map(count), expected)
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(self.collection.map(count, executor), expected)
+            self.assertEqual(self.collection.map_reduce(count, int.__add__, executor=executor), 13)
+        with ProcessPoolExecutor(2) as executor:
+            self.assertEqual(self.collection.map(count, executor), expected)
+        self.assertEqual(self.collection.map(count, regions=[None]), {('123456789012', None): 1})
+        self.assertEqual(ShardedCollection().map_reduce(count, int.__add__, 0), 0)
+
+    def test_replace_shard(self):
+        self.collection.create_index('vpc_id')
+        key = ('123456789012', 'eu-west-1')
+        others = {other: list(self.collection.shard(other)) for other in self.collection.shard_keys() if other != key}
+        old = list(self.collection.shard(key))
+        new = [
+            SecurityGroup(
+                account=self.accounts[0], region='eu-west-1', id='sg-new', name='new', owner_id='123456789012',
+                vpc_id='vpc-2'
+            ),
+            old[0]
+        ]
+        self.collection.replace_shard(key, new)
+        self.assertEqual(list(self.collection.shard(key)), new)
+        self.assertEqual(len(self.collection), 13 - len(old) + 2)
+        self.assertNotIn(old[1], self.collection)
+        self.assertEqual(self.collection.filter(field('vpc_id') == 'vpc-2'), [new[0]])
+        for other, resources in others.items():
+            self.assertEqual(list(self.collection.shard(other)), resources)
+        self.collection.replace_shard(key, [])
+        self.assertNotIn(key, self.collection.shard_keys())
+        with self.assertRaises(ValueError):
+            self.collection.replace_shard(key, [self.role])
+        with self.assertRaises(ValueError):
+            self.collection.replace_shard(('123456789012', 'us-east-1'), [self.security_groups[0]] * 2)
+
+    def test_moves(self):
+        security_group = self.security_groups[2]
+        security_group.region = 'ap-south-1'
+        self.assertEqual(list(self.collection.shard(('123456789012', 'ap-south-1'))), [security_group])
+        self.assertNotIn(security_group, self.collection.shard(('123456789012', 'eu-west-1')))
+        security_group.account = self.accounts[1]
+        self.assertNotIn(('123456789012', 'ap-south-1'), self.collection.shard_keys())
+        self.assertIn(security_group, self.collection.shard(('210987654321', 'ap-south-1')))
+        self.assertEqual(len(self.collection), 13)
+
+    def test_add_remove(self):
+        with self.assertRaises(ValueError):
+            self.collection.add_resource(self.role)
+        with self.assertRaises(TypeError):
+            self.collection.add_resource('role')
+        self.collection.remove_resource(self.role)
+        self.assertNotIn(('123456789012', None), self.collection.shard_keys())
+        with self.assertRaises(KeyError):
+            self.collection.remove_resource(self.role)
+        with self.assertRaises(TypeError):
+            ShardedCollection(key='region')
+        with self.assertRaises(TypeError):
+            ShardedCollection([self.role], key=lambda resource: resource.account.number)
+
+
+if __name__ == "__main__":
+    unittest.main()
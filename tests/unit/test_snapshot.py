@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.snapshot import Snapshot, write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.security_groups = [
+            SecurityGroup.from_response(self.account, 'eu-west-1', {
+                'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+                'Description': 'Web servers', 'Tags': [{'Key': 'Owner', 'Value': 'team-a'}],
+                'IpPermissions': [
+                    {
+                        'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443,
+                        'IpRanges': [{'CidrIp': '0.0.0.0/0', 'Description': 'Public'}, {'CidrIp': '10.0.0.0/8'}],
+                        'Ipv6Ranges': [{'CidrIpv6': '::/0'}]
+                    },
+                    {
+                        'IpProtocol': 'tcp', 'FromPort': 20, 'ToPort': 23,
+                        'IpRanges': [{'CidrIp': '10.0.0.0/8'}],
+                        'UserIdGroupPairs': [{'GroupId': 'sg-2', 'UserId': '123456789012', 'Description': 'Admin'}]
+                    }
+                ],
+                'IpPermissionsEgress': [
+                    {
+                        'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}],
+                        'PrefixListIds': [{'PrefixListId': 'pl-1'}]
+                    }
+                ]
+            }),
+            SecurityGroup.from_response(self.account, 'us-east-1', {
+                'GroupId': 'sg-2', 'GroupName': 'admin', 'OwnerId': '123456789012', 'VpcId': 'vpc-2',
+                'IpPermissions': [{'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}]}]
+            })
+        ]
+        self.security_groups[1].in_use = True
+        self.users = [
+            User.from_response(self.account, {
+                'UserName': 'alice', 'UserId': 'AIDA1', 'Arn': 'arn:aws:iam::123456789012:user/alice',
+                'CreateDate': datetime(2023, 2, 1, tzinfo=timezone.utc),
+                'PasswordLastUsed': datetime(2024, 2, 1, 12, 30, 15, 250, tzinfo=timezone.utc),
+                'PermissionsBoundary': {
+                    'PermissionsBoundaryType': 'Policy',
+                    'PermissionsBoundaryArn': 'arn:aws:iam::123456789012:policy/Boundary'
+                },
+                'LoginProfile': {'CreateDate': datetime(2023, 2, 1), 'PasswordResetRequired': True},
+                'AccessKeys': [
+                    {
+                        'AccessKeyId': 'AKIA1', 'Status': 'Active', 'CreateDate': datetime(1960, 2, 1),
+                        'AccessKeyLastUsed': {
+                            'LastUsedDate': datetime(2024, 1, 1, tzinfo=timezone.utc), 'ServiceName': 's3',
+                            'Region': 'eu-west-1'
+                        }
+                    },
+                    {'AccessKeyId': 'AKIA2', 'Status': 'Inactive'}
+                ],
+                'Tags': [{'Key': 'Team', 'Value': 'Ünïcode'}]
+            }),
+            User.from_response(self.account, {
+                'UserName': 'bob', 'UserId': 'AIDA2', 'Arn': 'arn:aws:iam::123456789012:user/bob'
+            })
+        ]
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'models.snapshot')
+        write_snapshot(self.path, [self.security_groups[0], self.users[0], self.security_groups[1], self.users[1]])
+        self.snapshot = Snapshot(self.path)
+
+    def tearDown(self) -> None:
+        self.snapshot.close()
+        self.directory.cleanup()
+
+    def test_materialize(self):
+        self.assertEqual(self.snapshot.security_group_count, 2)
+        self.assertEqual(self.snapshot.rule_count, 4)
+        self.assertEqual(self.snapshot.user_count, 2)
+        self.assertEqual(list(self.snapshot.security_groups()), self.security_groups)
+        self.assertEqual(list(self.snapshot.users()), self.users)
+        self.assertEqual(self.snapshot.permission(2), self.security_groups[0].ip_permissions_egress[0])
+        self.assertIs(self.snapshot.security_group(0).account, self.snapshot.user(1).account)
+        self.assertEqual(self.snapshot.user(0).access_keys[0].created_date, datetime(1960, 2, 1))
+
+    def test_find(self):
+        self.assertEqual(self.snapshot.find_rules(cidr='0.0.0.0/0'), [0, 3])
+        self.assertEqual(self.snapshot.find_rules(cidr='0.0.0.0/0', egress=None), [0, 2, 3])
+        self.assertEqual(self.snapshot.find_rules(cidr='0.0.0.0/0', egress=True), [2])
+        self.assertEqual(self.snapshot.find_rules(cidr='::/0'), [0])
+        self.assertEqual(self.snapshot.find_rules(cidr='pl-1', egress=None), [])
+        self.assertEqual(self.snapshot.find_rules(cidr='192.168.0.0/16'), [])
+        self.assertEqual(self.snapshot.find_rules(port=22), [1, 3])
+        self.assertEqual(self.snapshot.find_rules(port=22, ip_protocol='tcp'), [1])
+        self.assertEqual(self.snapshot.find_rules(ip_protocol='udp'), [])
+        self.assertEqual(self.snapshot.find_security_groups(cidr='0.0.0.0/0', port=22), [1])
+        self.assertEqual(self.snapshot.find_security_groups(cidr='10.0.0.0/8'), [0])
+        self.assertEqual(self.snapshot.find_users('AKIA2'), [0])
+        self.assertEqual(self.snapshot.find_users('AKIA3'), [])
+        with self.assertRaises(TypeError):
+            self.snapshot.find_rules(port='22')
+
+    def test_empty(self):
+        path = os.path.join(self.directory.name, 'empty.snapshot')
+        write_snapshot(path, [])
+        with Snapshot(path) as snapshot:
+            self.assertEqual(snapshot.security_group_count, 0)
+            self.assertEqual(list(snapshot.users()), [])
+            self.assertEqual(snapshot.find_rules(cidr='0.0.0.0/0'), [])
+            self.assertEqual(snapshot.find_rules(port=22), [])
+
+    def test_invalid(self):
+        path = os.path.join(self.directory.name, 'invalid.snapshot')
+        with open(path, 'wb') as file:
+            file.write(b'{"SecurityGroups": []}')
+        with self.assertRaises(ValueError):
+            Snapshot(path)
+        with self.assertRaises(TypeError):
+            write_snapshot(path, ['sg-1'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.store import ModelStore
+
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.maxDiff = None
+        self.account = Account('123456789012')
+        self.security_groups = [
+            SecurityGroup.from_response(self.account, 'eu-west-1', {
+                'GroupId': 'sg-1', 'GroupName': 'web', 'OwnerId': '123456789012', 'VpcId': 'vpc-1',
+                'Description': 'Web servers', 'Tags': [{'Key': 'Owner', 'Value': 'team-a'}],
+                'IpPermissions': [
+                    {
+                        'IpProtocol': 'tcp', 'FromPort': 443, 'ToPort': 443,
+                        'IpRanges': [{'CidrIp': '0.0.0.0/0', 'Description': 'Public'}, {'CidrIp': '10.0.0.0/8'}],
+                        'Ipv6Ranges': [{'CidrIpv6': '::/0'}]
+                    },
+                    {
+                        'IpProtocol': 'tcp', 'FromPort': 22, 'ToPort': 22,
+                        'UserIdGroupPairs': [{'GroupId': 'sg-2', 'UserId': '123456789012', 'Description': 'Admin'}]
+                    }
+                ],
+                'IpPermissionsEgress': [
+                    {
+                        'IpProtocol': '-1', 'IpRanges': [{'CidrIp': '0.0.0.0/0'}],
+                        'PrefixListIds': [{'PrefixListId': 'pl-1'}]
+                    }
+                ]
+            }),
+            SecurityGroup.from_response(self.account, 'us-east-1', {
+                'GroupId': 'sg-2', 'GroupName': 'admin', 'OwnerId': '123456789012', 'VpcId': 'vpc-2'
+            })
+        ]
+        self.security_groups[1].in_use = True
+        self.role = Role.from_response(self.account, {
+            'RoleName': 'deploy', 'RoleId': 'AROA1', 'Arn': 'arn:aws:iam::123456789012:role/ci/deploy', 'Path': '/ci/',
+            'MaxSessionDuration': 7200, 'CreateDate': datetime(2023, 1, 1, tzinfo=timezone.utc),
+            'AssumeRolePolicyDocument': {
+                'Version': '2012-10-17',
+                'Statement': [{'Effect': 'Allow', 'Principal': {'AWS': '210987654321'}, 'Action': 'sts:AssumeRole'}]
+            },
+            'PermissionsBoundary': {
+                'PermissionsBoundaryType': 'Policy',
+                'PermissionsBoundaryArn': 'arn:aws:iam::123456789012:policy/Boundary'
+            },
+            'RoleLastUsed': {'LastUsedDate': datetime(2024, 3, 1, tzinfo=timezone.utc), 'Region': 'eu-west-1'},
+            'Tags': [{'Key': 'Owner', 'Value': 'team-a'}]
+        })
+        self.user = User.from_response(self.account, {
+            'UserName': 'alice', 'UserId': 'AIDA1', 'Arn': 'arn:aws:iam::123456789012:user/alice',
+            'CreateDate': datetime(2023, 2, 1, tzinfo=timezone.utc),
+            'PasswordLastUsed': datetime(2024, 2, 1, tzinfo=timezone.utc),
+            'LoginProfile': {'CreateDate': datetime(2023, 2, 1, tzinfo=timezone.utc), 'PasswordResetRequired': True},
+            'AccessKeys': [
+                {
+                    'AccessKeyId': 'AKIA1', 'Status': 'Active', 'CreateDate': datetime(2023, 2, 1, tzinfo=timezone.utc),
+                    'AccessKeyLastUsed': {
+                        'LastUsedDate': datetime(2024, 1, 1, tzinfo=timezone.utc), 'ServiceName': 's3',
+                        'Region': 'eu-west-1'
+                    }
+                },
+                {'AccessKeyId': 'AKIA2', 'Status': 'Inactive'}
+            ]
+        })
+        self.store = ModelStore()
+        self.store.save([*self.security_groups, self.role, self.user])
+
+    def tearDown(self) -> None:
+        self.store.close()
+
+    def test_round_trip(self):
+        for lazy in (True, False):
+            with self.subTest(lazy=lazy):
+                self.assertEqual(list(self.store.find(SecurityGroup, lazy=lazy)), self.security_groups)
+                self.assertEqual(list(self.store.find(Role, lazy=lazy)), [self.role])
+                self.assertEqual(list(self.store.find(User, lazy=lazy)), [self.user])
+        security_groups = list(self.store.find(SecurityGroup))
+        self.assertIs(security_groups[0].account, security_groups[1].account)
+        self.assertEqual(security_groups[0].fingerprint, self.security_groups[0].fingerprint)
+        self.assertEqual(security_groups[0].to_dict(), self.security_groups[0].to_dict())
+
+    def test_empty_values(self):
+        from pyawsopstoolkit_models.ec2.security_group import IPPermission
+        from pyawsopstoolkit_models.iam.role import LastUsed
+        from pyawsopstoolkit_models.iam.user import LoginProfile
+
+        security_group = SecurityGroup(
+            self.account, 'eu-west-1', 'sg-3', 'empty', '123456789012', 'vpc-1', ip_permissions=[],
+            ip_permissions_egress=[IPPermission(-1, -1, '-1', ip_ranges=[], user_id_group_pairs=[])], tags=[]
+        )
+        role = Role(self.account, 'empty', 'AROA2', 'arn:aws:iam::123456789012:role/empty', 3600, last_used=LastUsed(),
+                    tags=[])
+        user = User(self.account, 'empty', 'AIDA2', 'arn:aws:iam::123456789012:user/empty',
+                    login_profile=LoginProfile(password_reset_required=None), access_keys=[], tags=[])
+        self.store.save([security_group, role, user])
+        for lazy in (True, False):
+            with self.subTest(lazy=lazy):
+                self.assertEqual(next(self.store.find(SecurityGroup, lazy=lazy, id='sg-3')).to_dict(),
+                                 security_group.to_dict())
+                self.assertEqual(next(self.store.find(Role, lazy=lazy, name='empty')).to_dict(), role.to_dict())
+                self.assertEqual(next(self.store.find(User, lazy=lazy, name='empty')).to_dict(), user.to_dict())
+
+    def test_find(self):
+        self.assertEqual(list(self.store.find(SecurityGroup, region='us-east-1')), [self.security_groups[1]])
+        self.assertEqual(list(self.store.find(SecurityGroup, vpc_id=['vpc-1', 'vpc-3'])), [self.security_groups[0]])
+        self.assertEqual(list(self.store.find(SecurityGroup, cidr='0.0.0.0/0')), [self.security_groups[0]])
+        self.assertEqual(
+            list(self.store.find(SecurityGroup, cidr='::/0', account=self.account)), [self.security_groups[0]]
+        )
+        self.assertEqual(list(self.store.find(SecurityGroup, referenced_group_id='sg-2')), [self.security_groups[0]])
+        self.assertEqual(list(self.store.find(SecurityGroup, in_use=True)), [self.security_groups[1]])
+        self.assertEqual(list(self.store.find(SecurityGroup, in_use=None)), [self.security_groups[0]])
+        self.assertEqual(list(self.store.find(Role, last_used_region='eu-west-1')), [self.role])
+        self.assertEqual(list(self.store.find(User, access_key_id='AKIA2')), [self.user])
+        self.assertEqual(list(self.store.find(User, access_key_id='AKIA3')), [])
+        self.assertEqual(self.store.count(SecurityGroup), 2)
+        self.assertEqual(self.store.count(User, login_profile=True), 1)
+        with self.assertRaises(ValueError):
+            self.store.find(SecurityGroup, description='Web servers')
+        with self.assertRaises(TypeError):
+            self.store.find(dict)
+        with self.assertRaises(TypeError):
+            self.store.count(str)
+
+    def test_save(self):
+        security_group = self.security_groups[0]
+        security_group.ip_permissions = security_group.ip_permissions[:1]
+        security_group.ip_permissions[0].ip_ranges = security_group.ip_permissions[0].ip_ranges[:1]
+        self.user.access_keys = None
+        self.role.description = 'Deployments'
+        self.store.save([security_group, self.user, self.role])
+        self.assertEqual(self.store.count(SecurityGroup), 2)
+        self.assertEqual(list(self.store.find(SecurityGroup, id='sg-1')), [security_group])
+        self.assertEqual(list(self.store.find(SecurityGroup, cidr='10.0.0.0/8')), [])
+        self.assertEqual(list(self.store.find(SecurityGroup, referenced_group_id='sg-2')), [])
+        self.assertEqual(list(self.store.find(User)), [self.user])
+        self.assertEqual(list(self.store.find(Role))[0].description, 'Deployments')
+        with self.assertRaises(TypeError):
+            self.store.save(['sg-1'])
+
+    def test_delete(self):
+        self.store.delete([self.security_groups[0], self.user])
+        self.assertEqual(list(self.store.find(SecurityGroup)), [self.security_groups[1]])
+        self.assertEqual(self.store.count(User), 0)
+        self.assertEqual(self.store.count(SecurityGroup, cidr='0.0.0.0/0'), 0)
+        self.store.delete([self.user])
+        self.assertEqual(self.store.count(Role), 1)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'models.db')
+            with ModelStore(path) as store:
+                store.save([*self.security_groups, self.role])
+            with ModelStore(path) as store:
+                self.assertEqual(list(store.find(SecurityGroup)), self.security_groups)
+                self.assertEqual(list(store.find(Role, name='deploy')), [self.role])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from pyawsopstoolkit_models.ec2.security_group import SecurityGroup
+from pyawsopstoolkit_models.iam.role import Role
+from pyawsopstoolkit_models.iam.user import User
+from pyawsopstoolkit_models.tags import TagIndex, tag_map
+
+
+def tags(**values):
+    return [{'Key': key, 'Value': value} for key, value in values.items()]
+
+
+class TestTags(unittest.TestCase):
+    def setUp(self) -> None:
+        from pyawsopstoolkit.account import Account
+
+        self.account = Account('123456789012')
+        self.web = SecurityGroup(
+            account=self.account, region='eu-west-1', id='sg-1', name='web', owner_id='123456789012', vpc_id='vpc-1',
+            tags=tags(Owner='team-x', Environment='prod')
+        )
+        self.deploy = Role(
+            account=self.account, name='deploy', id='AROADEPLOY', arn='arn:aws:iam::123456789012:role/deploy',
+            max_session_duration=3600, tags=tags(Owner='team-x', Environment='dev')
+        )
+        self.alice = User(
+            account=self.account, name='alice', id='AIDAALICE', arn='arn:aws:iam::123456789012:user/alice',
+            tags=tags(Owner='team-y', Environment='prod')
+        )
+        self.bob = User(account=self.account, name='bob', id='AIDABOB', arn='arn:aws:iam::123456789012:user/bob')
+        self.index = TagIndex([self.web, self.deploy, self.alice, self.bob])
+
+    def test_tag_map(self):
+        self.assertEqual(dict(self.web.tag_map), {'Owner': 'team-x', 'Environment': 'prod'})
+        self.assertIs(self.web.tag_map, self.web.tag_map)
+        self.assertEqual(self.deploy.get_tag('Environment'), 'dev')
+        self.assertEqual(self.bob.get_tag('Owner', 'unknown'), 'unknown')
+        self.assertEqual(tag_map([{'Key': 'Owner'}, 'invalid', {'Value': 'x'}]), {'Owner': None})
+        with self.assertRaises(TypeError):
+            self.web.tag_map['Owner'] = 'team-z'
+
+        other = User(
+            account=self.account, name='carol', id='AIDACAROL', arn='arn:aws:iam::123456789012:user/carol',
+            tags=tags(Owner='team-y', Environment='prod')
+        )
+        self.assertIs(other.tag_map, self.alice.tag_map)
+
+    def test_find(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.find({'Owner': 'team-x'}), [self.web, self.deploy])
+        self.assertEqual(self.index.find({'Environment': 'prod', 'Owner': 'team-x'}), [self.web])
+        self.assertEqual(self.index.find({'Environment': None}), [self.web, self.deploy, self.alice])
+        self.assertEqual(self.index.find({'Owner': 'team-z'}), [])
+        self.assertEqual(self.index.find({'CostCenter': None, 'Owner': 'team-x'}), [])
+        self.assertEqual(self.index.find({}), [self.web, self.deploy, self.alice, self.bob])
+        self.assertEqual(self.index.find_missing('Owner'), [self.bob])
+        self.assertEqual(self.index.keys(), ['Owner', 'Environment'])
+        self.assertEqual(self.index.values('Owner'), {'team-x': 2, 'team-y': 1})
+        self.assertEqual(self.index.values('CostCenter'), {})
+        self.assertEqual(self.index.count('Owner'), 3)
+        self.assertEqual(self.index.count('Owner', 'team-x'), 2)
+        self.assertEqual(self.index.count('CostCenter'), 0)
+        with self.assertRaises(TypeError):
+            self.index.find('Owner')
+
+    def test_maintenance(self):
+        with self.assertRaises(TypeError):
+            self.index.add_resource('sg-1')
+        with self.assertRaises(ValueError):
+            self.index.add_resource(self.web)
+
+        self.bob.tags = tags(Owner='team-x')
+        self.assertEqual(self.bob.get_tag('Owner'), 'team-x')
+        self.assertEqual(self.index.find({'Owner': 'team-x'}), [self.web, self.deploy, self.bob])
+        self.deploy.tags = None
+        self.assertEqual(self.index.find({'Owner': 'team-x'}), [self.web, self.bob])
+        self.assertEqual(self.index.find_missing('Owner'), [self.deploy])
+
+        self.index.remove_resource(self.alice)
+        self.assertNotIn(self.alice, self.index)
+        self.assertEqual(self.index.values('Environment'), {'prod': 1})
+        with self.assertRaises(KeyError):
+            self.index.remove_resource(self.alice)
+
+
+if __name__ == "__main__":
+    unittest.main()